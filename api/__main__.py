@@ -0,0 +1,11 @@
+import os
+
+import uvicorn
+
+# 로컬 전용: 외부 공개가 필요하면 앞단 프록시에서 인증/TLS 를 처리한다.
+API_HOST = "127.0.0.1"
+API_PORT = int(os.getenv("API_PORT", "8502"))
+
+
+if __name__ == "__main__":
+    uvicorn.run("api.app:app", host=API_HOST, port=API_PORT, log_level="info")
@@ -0,0 +1,353 @@
+"""
+로컬 전용 JSON API (ASGI, 프레임워크 없음)
+
+    python -m api            # 127.0.0.1:8502 (API_PORT 로 변경)
+
+학부모 요청은 student_id + name 으로, 관리자 요청은 X-Admin-Password 헤더로 인증한다.
+학교가 여러 곳이면(config/tenants.py) Host 헤더, ?school= 또는 X-School 헤더로 학교를 고른다.
+학부모 인증 실패 제한은 앞단 서버가 X-Forwarded-For 에 덧붙인 클라이언트 주소별로 센다.
+
+    GET    /health
+    GET    /applications?student_id=&name=
+    POST   /applications                      {student_id, name, application_type, reason, extra_info}
+    DELETE /applications/{id}?student_id=&name=
+    GET    /applications/{id}/pdf?student_id=&name=
+    GET    /admin/pending?limit=&application_type=&grade=&class_num=&q=&after_submitted_at=&after_id=
+    POST   /admin/applications/{id}/approve   {approver_name, expected_version}
+    POST   /admin/applications/{id}/reject    {reason, expected_version}
+    POST   /admin/applications/approve        {ids, approver_name}
+    POST   /admin/applications/reject         {ids, reason}
+"""
+import asyncio
+import hmac
+import json
+import logging
+import os
+import re
+from collections.abc import Mapping
+from datetime import date, datetime
+from urllib.parse import parse_qs
+
+from config.settings import APPLICATION_TYPES
+from config.tenants import current_tenant, resolve_tenant, tenant_scope
+from database.async_db_manager import close_pool
+from services import async_application_service, async_approval_service, async_student_service
+from utils.rate_limit import KeyedRateLimiter
+
+logger = logging.getLogger(__name__)
+
+MAX_BODY_BYTES = 64 * 1024
+# 앞단 서버가 X-Forwarded-For 에 주소를 덧붙이는 신뢰하는 프록시 수 (components.auth 와 같은 설정)
+TRUSTED_PROXY_HOPS = int(os.getenv("TRUSTED_PROXY_HOPS", "1"))
+# 인증 실패만 클라이언트 별로 센다 (components.auth 의 IP 단위 제한과 같은 값).
+# 프런트 서버 하나가 모든 요청을 대신 보내므로 성공한 요청까지 세면 정상 사용이 막힌다.
+_failed_parent_auth = KeyedRateLimiter(60, 0.5)
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class Request:
+    def __init__(self, scope, body: bytes):
+        self.method = scope["method"]
+        self.path = scope["path"]
+        self.query = {k: v[-1] for k, v in parse_qs(scope.get("query_string", b"").decode("utf-8")).items()}
+        self.headers = {k.decode("latin-1").lower(): v.decode("latin-1") for k, v in scope.get("headers", [])}
+        self.client_ip = (scope.get("client") or ("unknown", 0))[0]
+        self.body = body
+
+    @property
+    def forwarded_ip(self):
+        """신뢰하는 프록시가 X-Forwarded-For 에 덧붙인 클라이언트 주소 (오른쪽에서 TRUSTED_PROXY_HOPS 번째)"""
+        forwarded = self.headers.get("x-forwarded-for")
+        if TRUSTED_PROXY_HOPS <= 0 or not forwarded:
+            return None
+        hops = [hop.strip() for hop in forwarded.split(",")]
+        if len(hops) < TRUSTED_PROXY_HOPS:
+            return None
+        return hops[-TRUSTED_PROXY_HOPS] or None
+
+    def json(self) -> dict:
+        if not self.body:
+            return {}
+        try:
+            data = json.loads(self.body)
+        except ValueError:
+            raise HTTPError(400, "요청 본문이 올바른 JSON 이 아닙니다.")
+        if not isinstance(data, dict):
+            raise HTTPError(400, "요청 본문은 JSON 객체여야 합니다.")
+        return data
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Mapping):
+        # database.records 행
+        return dict(value)
+    return str(value)
+
+
+def _parent_auth_key(request: Request, student_id) -> str:
+    """
+    인증 실패 버킷 키
+
+    client_ip 는 프런트 서버 주소라 모든 학부모가 같은 값을 가지므로, 프록시가 알려 준
+    클라이언트 주소를 쓰고 없으면 (접속 주소, 학번) 으로 나눈다.
+    """
+    forwarded_ip = request.forwarded_ip
+    if forwarded_ip:
+        return forwarded_ip
+    return f"{request.client_ip}/{student_id or ''}"
+
+
+async def _parent(request: Request, source: dict = None) -> dict:
+    source = source if source is not None else request.query
+    auth_key = _parent_auth_key(request, source.get("student_id"))
+    if not _failed_parent_auth.available(auth_key):
+        raise HTTPError(429, "로그인 시도가 너무 많습니다. 잠시 후 다시 시도해주세요.")
+    student = await async_student_service.authenticate_student(source.get("student_id"), source.get("name"))
+    if not student:
+        _failed_parent_auth.allow(auth_key)
+        raise HTTPError(401, "학번 또는 이름이 올바르지 않습니다.")
+    return student
+
+
+def _require_admin(request: Request) -> str:
+    admin_password = os.getenv(current_tenant().admin_password_env)
+    supplied = request.headers.get("x-admin-password", "")
+    if not admin_password or not hmac.compare_digest(supplied.encode("utf-8"), admin_password.encode("utf-8")):
+        raise HTTPError(401, "관리자 인증이 필요합니다.")
+    return supplied
+
+
+def _int_param(value, name: str, default=None):
+    if value in (None, ""):
+        return default
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise HTTPError(400, f"{name} 값이 올바르지 않습니다.")
+
+
+def _result(ok: bool, message: str, status_on_error: int = 409):
+    return (200 if ok else status_on_error), {"ok": ok, "message": message}
+
+
+async def health(request: Request):
+    return 200, {"ok": True}
+
+
+async def list_applications(request: Request):
+    student = await _parent(request)
+    return 200, {"applications": await async_application_service.get_student_applications(student["student_id"])}
+
+
+async def submit_application(request: Request):
+    data = request.json()
+    student = await _parent(request, data)
+    application_type = data.get("application_type")
+    if application_type not in APPLICATION_TYPES:
+        raise HTTPError(400, "application_type 은 phone/tablet/gate 중 하나여야 합니다.")
+    ok, message = await async_application_service.submit_application(
+        student["student_id"], application_type, data.get("reason") or "", data.get("extra_info")
+    )
+    return _result(ok, message)
+
+
+async def cancel_application(request: Request, app_id: str):
+    student = await _parent(request)
+    ok, message = await async_application_service.cancel_student_application(int(app_id), student["student_id"])
+    return _result(ok, message)
+
+
+async def application_pdf(request: Request, app_id: str):
+    from utils.pdf_generator import generate_gate_permit_pdf, generate_phone_permit_pdf, generate_tablet_permit_pdf
+
+    student = await _parent(request)
+    app = await async_application_service.get_application(int(app_id))
+    if not app or app["student_id"] != student["student_id"]:
+        raise HTTPError(404, "신청서를 찾을 수 없습니다.")
+    if app["status"] not in ("approved", "auto_approved"):
+        raise HTTPError(409, "승인된 신청서만 출력할 수 있습니다.")
+
+    generators = {
+        "phone": generate_phone_permit_pdf,
+        "tablet": generate_tablet_permit_pdf,
+        "gate": generate_gate_permit_pdf,
+    }
+    app_data = {
+        "grade": student["grade"],
+        "class_num": student["class_num"],
+        "name": student["name"],
+        "reason": app["reason"],
+        "extra_info": app["extra_info"],
+        "approval_number": app["approval_number"],
+    }
+    # PDF 생성은 CPU 작업이라 이벤트 루프 밖에서 돌린다.
+    pdf_bytes = await asyncio.to_thread(generators[app["application_type"]], app_data)
+    return 200, pdf_bytes
+
+
+async def pending_applications(request: Request):
+    _require_admin(request)
+    after = None
+    if request.query.get("after_submitted_at") and request.query.get("after_id"):
+        try:
+            after = (
+                datetime.fromisoformat(request.query["after_submitted_at"]),
+                _int_param(request.query["after_id"], "after_id"),
+            )
+        except ValueError:
+            raise HTTPError(400, "after_submitted_at 값이 올바르지 않습니다.")
+    rows, next_cursor = await async_application_service.get_pending_applications_page(
+        limit=max(1, min(200, _int_param(request.query.get("limit"), "limit", 20))),
+        after=after,
+        application_type=request.query.get("application_type") or None,
+        grade=_int_param(request.query.get("grade"), "grade"),
+        class_num=_int_param(request.query.get("class_num"), "class_num"),
+        name_query=request.query.get("q") or None,
+    )
+    return 200, {"applications": rows, "next_cursor": list(next_cursor) if next_cursor else None}
+
+
+async def approve_application(request: Request, app_id: str):
+    _require_admin(request)
+    data = request.json()
+    ok, message = await async_approval_service.approve_application(
+        int(app_id),
+        data.get("approver_name") or "api",
+        expected_version=_int_param(data.get("expected_version"), "expected_version"),
+    )
+    return _result(ok, message)
+
+
+async def reject_application(request: Request, app_id: str):
+    _require_admin(request)
+    data = request.json()
+    ok, message = await async_approval_service.reject_application(
+        int(app_id),
+        data.get("reason") or "",
+        expected_version=_int_param(data.get("expected_version"), "expected_version"),
+    )
+    return _result(ok, message)
+
+
+async def approve_applications(request: Request):
+    _require_admin(request)
+    data = request.json()
+    ids = data.get("ids")
+    if not isinstance(ids, list):
+        raise HTTPError(400, "ids 는 신청서 id 목록이어야 합니다.")
+    ok, message = await async_approval_service.approve_applications(
+        [_int_param(app_id, "ids") for app_id in ids], data.get("approver_name") or "api"
+    )
+    return _result(ok, message)
+
+
+async def reject_applications(request: Request):
+    _require_admin(request)
+    data = request.json()
+    ids = data.get("ids")
+    if not isinstance(ids, list):
+        raise HTTPError(400, "ids 는 신청서 id 목록이어야 합니다.")
+    ok, message = await async_approval_service.reject_applications(
+        [_int_param(app_id, "ids") for app_id in ids], data.get("reason") or ""
+    )
+    return _result(ok, message)
+
+
+ROUTES = [
+    ("GET", re.compile(r"^/health$"), health),
+    ("GET", re.compile(r"^/applications$"), list_applications),
+    ("POST", re.compile(r"^/applications$"), submit_application),
+    ("DELETE", re.compile(r"^/applications/(\d+)$"), cancel_application),
+    ("GET", re.compile(r"^/applications/(\d+)/pdf$"), application_pdf),
+    ("GET", re.compile(r"^/admin/pending$"), pending_applications),
+    ("POST", re.compile(r"^/admin/applications/approve$"), approve_applications),
+    ("POST", re.compile(r"^/admin/applications/reject$"), reject_applications),
+    ("POST", re.compile(r"^/admin/applications/(\d+)/approve$"), approve_application),
+    ("POST", re.compile(r"^/admin/applications/(\d+)/reject$"), reject_application),
+]
+
+
+def _match(method: str, path: str):
+    path_matched = False
+    for route_method, pattern, handler in ROUTES:
+        match = pattern.match(path)
+        if match:
+            path_matched = True
+            if route_method == method:
+                return handler, match.groups()
+    raise HTTPError(405 if path_matched else 404, "지원하지 않는 요청입니다.")
+
+
+async def _read_body(receive) -> bytes:
+    chunks = []
+    size = 0
+    while True:
+        message = await receive()
+        chunk = message.get("body", b"")
+        size += len(chunk)
+        if size > MAX_BODY_BYTES:
+            raise HTTPError(413, "요청 본문이 너무 큽니다.")
+        chunks.append(chunk)
+        if not message.get("more_body"):
+            return b"".join(chunks)
+
+
+async def _send(send, status: int, payload):
+    if isinstance(payload, bytes):
+        body, content_type = payload, b"application/pdf"
+    else:
+        body = json.dumps(payload, ensure_ascii=False, default=_json_default).encode("utf-8")
+        content_type = b"application/json; charset=utf-8"
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", content_type), (b"content-length", str(len(body)).encode())],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await close_pool()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        await _lifespan(receive, send)
+        return
+    if scope["type"] != "http":
+        return
+
+    try:
+        handler, args = _match(scope["method"], scope["path"])
+        request = Request(scope, await _read_body(receive))
+        tenant = resolve_tenant(
+            host=request.headers.get("host"),
+            school=request.query.get("school") or request.headers.get("x-school"),
+        )
+        if tenant is None:
+            raise HTTPError(404, "등록되지 않은 학교입니다.")
+        with tenant_scope(tenant):
+            status, payload = await handler(request, *args)
+    except HTTPError as e:
+        status, payload = e.status, {"ok": False, "message": e.message}
+    except Exception:
+        logger.exception("[api] %s %s failed", scope["method"], scope["path"])
+        status, payload = 500, {"ok": False, "message": "오류가 발생했습니다. 잠시 후 다시 시도해주세요."}
+    await _send(send, status, payload)
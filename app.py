@@ -1,8 +1,9 @@
 import streamlit as st
 
-from config.settings import SCHOOL_NAME
-from database.db_manager import init_database
+from components.tenant import use_request_tenant
+from database.request_cache import begin_request
 from utils.academic_year import get_academic_year
+from utils.tracing import begin_page_trace, end_page_trace
 from utils.ui_style import inject_nav_label_override
 
 
@@ -12,20 +13,14 @@ st.set_page_config(
     layout="wide",
     initial_sidebar_state="expanded",
 )
-
-
-@st.cache_resource
-def setup_database():
-    init_database()
-    return True
-
-
-setup_database()
+begin_request()
+begin_page_trace("page.home")
+tenant = use_request_tenant()
 inject_nav_label_override()
 
 year = get_academic_year()
 
-st.title(f"🏫 {SCHOOL_NAME} 출입·스마트기기 관리시스템")
+st.title(f"🏫 {tenant.school_name} 출입·스마트기기 관리시스템")
 st.divider()
 
 st.subheader("시스템 소개")
@@ -51,3 +46,5 @@ st.markdown(
 )
 
 st.info(f"{year}학년도 운영 중입니다.")
+
+end_page_trace()
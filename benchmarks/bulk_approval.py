@@ -0,0 +1,44 @@
+"""
+일괄 승인 vs 건별 승인 비교.
+
+    BENCH_DATABASE_URL=postgresql://postgres@localhost/phone2026_bench python -m benchmarks.bulk_approval
+
+구글시트는 로컬 스텁으로 대체한다.
+
+측정 예 (DB_BACKEND=local, 대기 500건):
+
+    approve_application: 15.18 ms/row (~7.59 s for 500)
+    approve_applications: 99.1 ms for 500 rows (구글시트 동기화 1회)
+"""
+import sys
+import time
+
+from benchmarks.common import reset_pending, seed_school, start_google_sheet_stub, use_bench_database
+
+APPROVAL_COUNT = 500
+
+
+def main() -> int:
+    use_bench_database()
+    start_google_sheet_stub()
+    from services.approval_service import approve_application, approve_applications
+
+    seed_school(student_count=1200, application_count=3000)
+
+    ids = reset_pending(APPROVAL_COUNT)
+    started = time.perf_counter()
+    for app_id in ids[:50]:
+        approve_application(app_id, "bench")
+    per_row = (time.perf_counter() - started) / 50
+    print(f"approve_application: {per_row * 1000:.2f} ms/row (~{per_row * APPROVAL_COUNT:.2f} s for {APPROVAL_COUNT})")
+
+    ids = reset_pending(APPROVAL_COUNT)
+    started = time.perf_counter()
+    ok, message = approve_applications(ids, "bench")
+    elapsed = time.perf_counter() - started
+    print(f"approve_applications: {elapsed * 1000:.1f} ms for {len(ids)} rows ({message})")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
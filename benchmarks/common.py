@@ -0,0 +1,152 @@
+import os
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+BENCH_DB_ENV = "BENCH_DATABASE_URL"
+
+
+def use_bench_database() -> str:
+    """
+    벤치마크 전용 DB로 연결 대상을 바꾼다.
+
+    운영 DB를 덮어쓰지 않도록 BENCH_DATABASE_URL 을 명시적으로 요구하고
+    Supabase 호스트는 거부한다. DB_BACKEND=local 이면 BENCH_DATABASE_URL 없이
+    로컬 내장 Postgres(database/local_backend.py)를 쓴다.
+    """
+    db_url = os.getenv(BENCH_DB_ENV)
+    if not db_url and os.getenv("DB_BACKEND", "").lower() == "local":
+        from database.local_backend import get_local_database_url
+
+        db_url = get_local_database_url()
+    if not db_url:
+        raise SystemExit(f"{BENCH_DB_ENV} is not set (e.g. postgresql://postgres@localhost:5432/phone2026_bench).")
+
+    host = urlparse(db_url).hostname or ""
+    if host.endswith("supabase.co") or host.endswith("supabase.com"):
+        raise SystemExit(f"{BENCH_DB_ENV} points at Supabase ({host}); use a local scratch database.")
+
+    os.environ["SUPABASE_DB_URL"] = db_url
+    os.environ.pop("DATABASE_URL", None)
+    return db_url
+
+
+def through_proxy(db_url: str, address: tuple) -> str:
+    """
+    db_url 의 호스트/포트를 로컬 프록시(tools/fault_proxy.py) 주소로 바꾼 URL
+
+    Unix 소켓 URL(?host=/디렉터리)이면 host 파라미터를 빼서 프록시의 TCP 포트로 연결하게 한다.
+    프록시의 drop_on 은 평문에서만 동작하므로 sslmode=disable 로 바꾼다.
+    """
+    parsed = urlparse(db_url)
+    userinfo = parsed.netloc.rpartition("@")[0]
+    netloc = f"{userinfo}@{address[0]}:{address[1]}" if userinfo else f"{address[0]}:{address[1]}"
+    params = [(key, value) for key, value in parse_qsl(parsed.query) if key not in {"host", "sslmode"}]
+    query = urlencode(params + [("sslmode", "disable")])
+    return urlunparse(parsed._replace(netloc=netloc, query=query))
+
+
+def seed_school(student_count: int, application_count: int, pending_ratio: float = 0.05, seed: float = 0.42):
+    """
+    학생/신청서 더미 데이터를 set-based SQL로 채운다.
+
+    신청서는 학생당 유형(phone/tablet/gate)별 최대 1건이므로
+    application_count 는 student_count * 3 을 넘을 수 없다.
+    """
+    from database.db_manager import get_db_connection, init_database
+
+    if application_count > student_count * 3:
+        raise ValueError("application_count must be <= student_count * 3")
+
+    init_database()
+    conn = get_db_connection()
+    with conn.cursor() as cursor:
+        cursor.execute("TRUNCATE phone2026.applications, phone2026.students RESTART IDENTITY")
+        cursor.execute("SELECT setseed(%s)", (seed,))
+        cursor.execute(
+            """
+            INSERT INTO phone2026.students (student_id, name, grade, class_num)
+            SELECT lpad(n::text, 6, '0'),
+                   '학생' || n,
+                   1 + mod(n, 6),
+                   1 + mod(n / 6, 10)
+            FROM generate_series(1, %s) AS n
+            """,
+            (student_count,),
+        )
+        cursor.execute(
+            """
+            INSERT INTO phone2026.applications (
+                student_id, application_type, reason, extra_info, status,
+                submitted_at, approved_at, approved_by
+            )
+            SELECT student_id, application_type, '벤치마크 신청', extra_info, status,
+                   submitted_at,
+                   CASE WHEN status IN ('approved', 'auto_approved') THEN submitted_at + interval '1 hour' END,
+                   CASE WHEN status IN ('approved', 'auto_approved') THEN 'bench' END
+            FROM (
+                SELECT lpad((((i - 1) / 3) + 1)::text, 6, '0') AS student_id,
+                       (ARRAY['phone', 'tablet', 'gate'])[mod(i - 1, 3) + 1] AS application_type,
+                       CASE WHEN mod(i - 1, 3) = 2
+                            THEN '{"version": 1, "morning_days": ["월", "수"], "dismissal_by_day": {"월": "1", "금": "3"}}'
+                       END AS extra_info,
+                       CASE WHEN r < %s THEN 'pending'
+                            WHEN r < %s THEN 'rejected'
+                            WHEN r < 0.6 THEN 'approved'
+                            ELSE 'auto_approved'
+                       END AS status,
+                       now() - (random() * interval '1500 days') AS submitted_at
+                FROM (SELECT i, random() AS r FROM generate_series(1, %s) AS i) AS g
+            ) AS s
+            """,
+            (pending_ratio, pending_ratio * 2, application_count),
+        )
+        cursor.execute("VACUUM ANALYZE phone2026.students")
+        cursor.execute("VACUUM ANALYZE phone2026.applications")
+
+
+def start_google_sheet_stub() -> str:
+    """
+    구글 Apps Script 웹앱 대신 로컬에서 {"ok": true, "count": n} 을 돌려주는 스텁 서버.
+
+    utils.google_sync 가 import 되기 전에 호출해야 GOOGLE_SHEET_WEBAPP_URL 이 적용된다.
+    """
+    import json
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class _Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            body = json.dumps({"ok": True, "count": len(payload.get("rows", []))}).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/exec"
+    os.environ["GOOGLE_SHEET_WEBAPP_URL"] = url
+    return url
+
+
+def reset_pending(count: int) -> list[int]:
+    """앞쪽 count 건을 승인 대기 상태로 되돌리고 id 목록을 반환"""
+    from database.db_manager import execute_update
+
+    rows = execute_update(
+        """
+        UPDATE applications
+        SET status = 'pending', approved_at = NULL, approved_by = NULL,
+            approval_number = NULL, rejection_reason = NULL
+        WHERE id IN (SELECT id FROM applications ORDER BY id LIMIT ?)
+        RETURNING id
+        """,
+        (count,),
+        returning=True,
+    )
+    return [row["id"] for row in rows]
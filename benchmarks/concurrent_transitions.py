@@ -0,0 +1,78 @@
+"""
+동시 승인 검증: 여러 프로세스가 같은 신청서들을 동시에 승인/반려할 때
+행마다 정확히 한 건만 성공하고 정문 승인번호가 중복되지 않는지 확인한다.
+
+    BENCH_DATABASE_URL=postgresql://postgres@localhost/phone2026_bench python -m benchmarks.concurrent_transitions
+"""
+import sys
+from collections import Counter
+from multiprocessing import get_context
+
+from benchmarks.common import reset_pending, seed_school, start_google_sheet_stub, use_bench_database
+
+WORKERS = 8
+ROWS = 200
+
+
+def _worker(args):
+    worker_no, ids = args
+    # 프로세스마다 별도 커넥션을 쓰도록 여기서 import 한다.
+    use_bench_database()
+    start_google_sheet_stub()
+    from services.approval_service import approve_application, reject_application
+
+    wins = []
+    for app_id in ids:
+        if worker_no % 4 == 3:
+            ok, _ = reject_application(app_id, f"worker-{worker_no}")
+        else:
+            ok, _ = approve_application(app_id, f"worker-{worker_no}")
+        if ok:
+            wins.append(app_id)
+    return wins
+
+
+def check_transitions(workers: int = WORKERS, rows: int = ROWS) -> list[str]:
+    """workers 개 프로세스로 같은 rows 건을 동시에 처리하고 위반 사항 목록을 돌려준다 (없으면 빈 목록)."""
+    from database.db_manager import execute_query
+
+    seed_school(student_count=1200, application_count=3000)
+    ids = reset_pending(rows)
+
+    # 워커마다 순서를 달리해 경합을 늘린다.
+    jobs = [(n, ids if n % 2 == 0 else list(reversed(ids))) for n in range(workers)]
+    with get_context("spawn").Pool(workers) as pool:
+        results = pool.map(_worker, jobs)
+
+    winners = Counter(app_id for wins in results for app_id in wins)
+    failures = []
+    bad_rows = [app_id for app_id in ids if winners[app_id] != 1]
+    if bad_rows:
+        failures.append(f"{len(bad_rows)} rows without exactly one winner: {bad_rows[:10]}")
+
+    numbers = execute_query(
+        """
+        SELECT approval_number, COUNT(*) AS count
+        FROM applications
+        WHERE approval_number IS NOT NULL
+        GROUP BY approval_number
+        HAVING COUNT(*) > 1
+        """
+    )
+    if numbers:
+        failures.append(f"duplicate approval numbers: {[row['approval_number'] for row in numbers[:10]]}")
+    return failures
+
+
+def main() -> int:
+    use_bench_database()
+    failures = check_transitions()
+    for failure in failures:
+        print(f"FAIL {failure}")
+    if not failures:
+        print(f"ok   {ROWS} rows, {WORKERS} workers: exactly one winner per row, no duplicate approval numbers")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+"""
+아침 등교 시간대 학부모 접속 몰림 재현 부하 테스트.
+
+    BENCH_DATABASE_URL=postgresql://postgres@localhost/phone2026_bench \
+        python -m benchmarks.load_test --sessions 500 --concurrency 50
+
+학생 1,200명/신청서 2,400건을 채운 뒤, 각 가상 세션이 학부모 페이지 한 번의 흐름
+(로그인 → 신청 내역 조회 → 신청 → 재조회 → 승인된 신청서 PDF)을 서비스 계층으로 실행한다.
+세션마다 request_scope() 로 감싸 Streamlit 한 번의 실행과 같은 캐시 범위를 쓴다.
+
+결과(처리량, 단계별 p50/p95/p99)는 benchmarks/results/load_test-<git sha>.json 에 저장하고,
+--baseline 으로 이전 결과 파일을 주면 p95 변화를 함께 출력한다. 기준이 될 결과 파일은
+커밋해 두어 다른 커밋의 결과와 비교할 수 있게 한다.
+
+    python -m benchmarks.load_test --baseline benchmarks/results/load_test-a2ec99b.json
+"""
+import argparse
+import json
+import random
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from benchmarks.common import seed_school, start_google_sheet_stub, use_bench_database
+
+STUDENT_COUNT = 1200
+APPLICATION_COUNT = 2400
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+APPLICATION_TYPES = ("phone", "tablet", "gate")
+GATE_EXTRA_INFO = '{"version": 1, "morning_days": ["화"], "dismissal_by_day": {"목": "2"}}'
+
+
+def _git_sha() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def _percentile(sorted_values: list, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, max(0, round(pct / 100.0 * len(sorted_values)) - 1))
+    return sorted_values[idx]
+
+
+def _summarize(samples: list) -> dict:
+    values = sorted(samples)
+    return {
+        "count": len(values),
+        "mean_ms": round(sum(values) / len(values), 2) if values else 0.0,
+        "p50_ms": round(_percentile(values, 50), 2),
+        "p95_ms": round(_percentile(values, 95), 2),
+        "p99_ms": round(_percentile(values, 99), 2),
+        "max_ms": round(values[-1], 2) if values else 0.0,
+    }
+
+
+def _run_session(session_no: int, seed: int) -> dict:
+    from components.auth import authenticate_parent
+    from database.request_cache import request_scope
+    from services.application_service import get_student_applications, submit_application
+    from utils.pdf_generator import generate_gate_permit_pdf, generate_phone_permit_pdf, generate_tablet_permit_pdf
+
+    pdf_generators = {
+        "phone": generate_phone_permit_pdf,
+        "tablet": generate_tablet_permit_pdf,
+        "gate": generate_gate_permit_pdf,
+    }
+    rng = random.Random(seed + session_no)
+    n = rng.randint(1, STUDENT_COUNT)
+    timings = {}
+    errors = []
+
+    def timed(step, func, *args):
+        started = time.perf_counter()
+        try:
+            return func(*args)
+        except Exception as e:
+            errors.append(f"{step}: {type(e).__name__}: {e}")
+            return None
+        finally:
+            timings[step] = (time.perf_counter() - started) * 1000
+
+    with request_scope():
+        student = timed("authenticate_parent", authenticate_parent, str(n).zfill(6), f"학생{n}")
+        if student is None:
+            errors.append("authenticate_parent: not found")
+            return {"timings": timings, "errors": errors}
+
+        applications = timed("get_student_applications", get_student_applications, student["student_id"]) or []
+        held = {app["application_type"] for app in applications}
+        free_types = [app_type for app_type in APPLICATION_TYPES if app_type not in held]
+        if free_types:
+            app_type = rng.choice(free_types)
+            extra_info = GATE_EXTRA_INFO if app_type == "gate" else None
+            timed("submit_application", submit_application, student["student_id"], app_type, "부하 테스트", extra_info)
+            applications = timed("get_student_applications_after_submit", get_student_applications, student["student_id"]) or []
+
+        approved = [app for app in applications if app["status"] in ("approved", "auto_approved")]
+        if approved:
+            app = rng.choice(approved)
+            # pages/1_학부모_페이지.py 의 _generate_pdf 와 같은 입력
+            app_data = {
+                "grade": student["grade"],
+                "class_num": student["class_num"],
+                "name": student["name"],
+                "reason": app["reason"],
+                "extra_info": app["extra_info"],
+                "approval_number": app["approval_number"],
+            }
+            timed("generate_pdf", pdf_generators[app["application_type"]], app_data)
+
+    return {"timings": timings, "errors": errors}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="학부모 페이지 동시 접속 부하 테스트")
+    parser.add_argument("--sessions", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=20260302)
+    parser.add_argument("--baseline", type=Path, help="비교할 이전 결과 JSON")
+    parser.add_argument("--no-seed", action="store_true", help="데이터를 다시 채우지 않는다")
+    args = parser.parse_args()
+
+    use_bench_database()
+    start_google_sheet_stub()
+    if not args.no_seed:
+        seed_school(student_count=STUDENT_COUNT, application_count=APPLICATION_COUNT)
+
+    # 공유 캐시/폰트 등록 등 첫 호출 비용은 측정에서 뺀다.
+    _run_session(0, args.seed)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(lambda i: _run_session(i, args.seed), range(1, args.sessions + 1)))
+    wall_seconds = time.perf_counter() - started
+
+    samples = defaultdict(list)
+    errors = []
+    for result in results:
+        session_ms = 0.0
+        for step, ms in result["timings"].items():
+            samples[step].append(ms)
+            session_ms += ms
+        samples["session"].append(session_ms)
+        errors.extend(result["errors"])
+
+    report = {
+        "git_sha": _git_sha(),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "sessions": args.sessions,
+        "concurrency": args.concurrency,
+        "wall_seconds": round(wall_seconds, 3),
+        "sessions_per_second": round(args.sessions / wall_seconds, 2),
+        "errors": len(errors),
+        "error_samples": errors[:10],
+        "steps": {step: _summarize(values) for step, values in sorted(samples.items())},
+    }
+
+    print(f"{args.sessions} sessions / concurrency {args.concurrency}: "
+          f"{report['sessions_per_second']} sessions/s, {len(errors)} errors")
+    baseline_steps = {}
+    if args.baseline:
+        baseline_steps = json.loads(args.baseline.read_text(encoding="utf-8")).get("steps", {})
+    for step, summary in report["steps"].items():
+        line = f"  {step:40s} p50 {summary['p50_ms']:8.2f}  p95 {summary['p95_ms']:8.2f}  p99 {summary['p99_ms']:8.2f} ms"
+        if step in baseline_steps and baseline_steps[step]["p95_ms"]:
+            change = (summary["p95_ms"] / baseline_steps[step]["p95_ms"] - 1) * 100
+            line += f"  (p95 {change:+.1f}% vs baseline)"
+        print(line)
+
+    RESULTS_DIR.mkdir(exist_ok=True)
+    output = RESULTS_DIR / f"load_test-{report['git_sha']}.json"
+    output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"saved {output}")
+    return 0 if not errors else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
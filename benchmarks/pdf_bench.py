@@ -0,0 +1,214 @@
+"""
+허가서 PDF 생성 마이크로벤치마크 (DB 불필요).
+
+    python -m benchmarks.pdf_bench                       # 측정만
+    python -m benchmarks.pdf_bench --save-baseline       # 기준값 저장
+    python -m benchmarks.pdf_bench --threshold 15        # 기준 대비 15% 넘게 느려지면 실패
+
+settings 조회(학년도, 교장 직인 경로)는 메모리 dict 로 대신한다. 직인은 임시 PNG 를 만들어
+쓰므로 양식의 *_af_image 칸이 있으면 실제로 그려진다.
+
+케이스별로 중앙값/p95 시간(ms), tracemalloc 기준 최대 메모리와 할당 블록 수,
+결과 PDF 크기를 출력한다. 글꼴 등록(cold)은 새 프로세스에서 따로 잰다.
+"""
+import argparse
+import io
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from PIL import Image, ImageDraw
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+DEFAULT_BASELINE = RESULTS_DIR / "pdf_bench-baseline.json"
+DEFAULT_THRESHOLD_PCT = 20.0
+
+SAMPLE_PHONE = {"grade": 2, "class_num": 3, "name": "홍길동", "reason": "", "extra_info": None, "approval_number": None}
+SAMPLE_GATE = {
+    "grade": 1,
+    "class_num": 7,
+    "name": "김하늘",
+    "reason": "학원 통학 버스 시간",
+    "extra_info": '{"version": 1, "morning_days": ["월", "수"], "dismissal_by_day": {"월": "1", "금": "3"}}',
+    "approval_number": "DS-GATE-2026-0001",
+}
+
+_COLD_FONT_SNIPPET = """
+import time
+from utils.pdf_generator import _register_korean_font
+started = time.perf_counter()
+_register_korean_font()
+print((time.perf_counter() - started) * 1000)
+"""
+
+
+def _install_settings_stub(stamp_path: Path):
+    """pdf_generator / academic_year 의 settings 조회를 메모리 값으로 바꾼다."""
+    import utils.academic_year as academic_year
+    import utils.pdf_generator as pdf_generator
+
+    settings = {
+        "academic_year": "2026",
+        "academic_year_start": "2026-03-02",
+        "principal_stamp_path": str(stamp_path),
+    }
+
+    def execute_query(query, params=None):
+        key = params[0] if params else None
+        if key in settings:
+            return [{"key": key, "value": settings[key]}]
+        return []
+
+    academic_year.execute_query = execute_query
+    pdf_generator.execute_query = execute_query
+
+
+def _make_stamp(directory: Path) -> Path:
+    image = Image.new("RGBA", (240, 240), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(image)
+    draw.ellipse((8, 8, 232, 232), outline=(200, 0, 0, 255), width=12)
+    draw.rectangle((70, 70, 170, 170), outline=(200, 0, 0, 255), width=10)
+    path = directory / "stamp.png"
+    image.save(path)
+    return path
+
+
+def _build_cases():
+    from reportlab.pdfgen import canvas
+    from PyPDF2 import PdfReader
+
+    import utils.pdf_generator as pdf_generator
+
+    def rect_map_case(kind):
+        path = pdf_generator._find_template_path(kind)
+        data = path.read_bytes()
+
+        def run():
+            # 파싱은 PdfReader 가 지연 처리하므로 페이지 로드까지 포함해 잰다.
+            return pdf_generator._extract_rect_map(PdfReader(io.BytesIO(data)).pages[0])
+
+        return run
+
+    def stamp_case():
+        rect_map = {"stamp_af_image": [420.0, 80.0, 500.0, 160.0]}
+
+        def run():
+            buffer = io.BytesIO()
+            pdf_canvas = canvas.Canvas(buffer)
+            pdf_generator._draw_principal_stamp(pdf_canvas, rect_map)
+            pdf_canvas.save()
+            return buffer.getvalue()
+
+        return run
+
+    return {
+        "phone_template": lambda: pdf_generator.generate_phone_permit_pdf(SAMPLE_PHONE),
+        "tablet_template": lambda: pdf_generator.generate_tablet_permit_pdf(SAMPLE_PHONE),
+        "gate_template": lambda: pdf_generator.generate_gate_permit_pdf(SAMPLE_GATE),
+        "phone_fallback": lambda: pdf_generator._create_permit_with_image("phone", "School Phone Permit", SAMPLE_PHONE),
+        "tablet_fallback": lambda: pdf_generator._create_permit_with_image("tablet", "School Tablet Permit", SAMPLE_PHONE),
+        "gate_fallback": lambda: pdf_generator._create_gate_permit(SAMPLE_GATE),
+        "extract_rect_map_phone": rect_map_case("phone"),
+        "extract_rect_map_gate": rect_map_case("gate"),
+        "register_font_warm": pdf_generator._register_korean_font,
+        "draw_principal_stamp": stamp_case(),
+    }
+
+
+def _measure(func, iterations: int) -> dict:
+    result = func()  # warm-up
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    func()
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename") if stat.count_diff > 0)
+
+    timings.sort()
+    return {
+        "median_ms": round(statistics.median(timings), 3),
+        "p95_ms": round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 3),
+        "peak_kb": round(peak / 1024, 1),
+        "alloc_blocks": blocks,
+        "output_bytes": len(result) if isinstance(result, (bytes, bytearray)) else None,
+    }
+
+
+def _measure_cold_font(runs: int) -> dict:
+    timings = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", _COLD_FONT_SNIPPET],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).resolve().parent.parent,
+        )
+        timings.append(float(out.stdout.strip().splitlines()[-1]))
+    timings.sort()
+    return {"median_ms": round(statistics.median(timings), 3), "p95_ms": round(timings[-1], 3)}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="허가서 PDF 생성 마이크로벤치마크")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--cold-runs", type=int, default=3)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD_PCT, help="허용 증가율(%%)")
+    args = parser.parse_args()
+
+    results = {"register_font_cold": _measure_cold_font(args.cold_runs)}
+    with tempfile.TemporaryDirectory() as tmp:
+        _install_settings_stub(_make_stamp(Path(tmp)))
+        for name, func in _build_cases().items():
+            results[name] = _measure(func, args.iterations)
+
+    baseline = {}
+    if args.baseline.exists() and not args.save_baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8")).get("cases", {})
+
+    regressions = []
+    print(f"{'case':26s} {'median ms':>10s} {'p95 ms':>9s} {'peak KB':>9s} {'blocks':>8s} {'bytes':>8s}")
+    for name, item in results.items():
+        line = (
+            f"{name:26s} {item['median_ms']:10.2f} {item['p95_ms']:9.2f} "
+            f"{item.get('peak_kb', 0):9.1f} {item.get('alloc_blocks', 0):8d} {item.get('output_bytes') or 0:8d}"
+        )
+        base = baseline.get(name)
+        if base and base["median_ms"]:
+            change = (item["median_ms"] / base["median_ms"] - 1) * 100
+            line += f"  {change:+6.1f}%"
+            if change > args.threshold:
+                regressions.append(f"{name}: {base['median_ms']:.2f} -> {item['median_ms']:.2f} ms ({change:+.1f}%)")
+        print(line)
+
+    if args.save_baseline:
+        RESULTS_DIR.mkdir(exist_ok=True)
+        payload = {"created_at": time.strftime("%Y-%m-%dT%H:%M:%S"), "iterations": args.iterations, "cases": results}
+        args.baseline.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"saved baseline {args.baseline}")
+        return 0
+
+    if regressions:
+        print(f"\nregressions over {args.threshold:.0f}%:")
+        for item in regressions:
+            print(f"  {item}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+"""
+여러 문장을 차례로 보내던 서비스 호출 vs execute_batch(pipeline) 비교.
+
+    BENCH_DATABASE_URL=postgresql://postgres@localhost/phone2026_bench python -m benchmarks.pipeline_batch
+
+호출마다 DB 왕복 수(request_cache 집계)와 지연 시간(p50/p95)을 출력한다.
+로컬 DB 는 왕복 비용이 거의 없으므로 Supabase 처럼 멀리 있는 DB 에서는
+(줄어든 왕복 수 × 네트워크 RTT) 만큼 차이가 더 벌어진다.
+"""
+import statistics
+import sys
+import time
+
+from benchmarks.common import seed_school, start_google_sheet_stub, use_bench_database
+
+ITERATIONS = 100
+STUDENT_BATCH = 500
+
+
+def _legacy_dashboard():
+    from database.db_manager import execute_query
+    from services.application_service import (
+        STATISTICS_BY_GRADE_QUERY,
+        STATISTICS_BY_TYPE_QUERY,
+        _apply_delayed_approvals,
+    )
+
+    # 현재 경로와 같은 지연 자동승인 점검을 먼저 해서 배치 효과만 비교한다.
+    _apply_delayed_approvals()
+    execute_query("SELECT COUNT(*) as count FROM applications")
+    execute_query("SELECT COUNT(*) as count FROM applications WHERE status = 'pending'")
+    execute_query("SELECT COUNT(*) as count FROM applications WHERE status IN ('approved', 'auto_approved')")
+    execute_query("SELECT COUNT(*) as count FROM applications WHERE status = 'rejected'")
+    execute_query(STATISTICS_BY_TYPE_QUERY)
+    execute_query(STATISTICS_BY_GRADE_QUERY)
+
+
+def _current_dashboard():
+    from services.application_service import get_dashboard_statistics
+
+    get_dashboard_statistics()
+
+
+def _legacy_pending():
+    from database.db_manager import execute_query
+    from services.application_service import (
+        _apply_delayed_approvals,
+        _pending_count_statement,
+        _pending_page_statement,
+    )
+
+    _apply_delayed_approvals()
+    execute_query(*_pending_count_statement(None, None, None, None))
+    execute_query(*_pending_page_statement(20, None, None, None, None, None))
+
+
+def _current_pending():
+    from services.application_service import get_pending_overview
+
+    get_pending_overview(limit=20)
+
+
+def _legacy_delayed_check():
+    from database.db_manager import execute_query
+    from services.application_service import DELAYED_TARGETS_QUERY
+
+    for app_type in ("phone", "tablet", "gate"):
+        execute_query("SELECT value FROM settings WHERE key = ?", (f"{app_type}_approval_mode",))
+    for app_type in ("phone", "tablet", "gate"):
+        execute_query("SELECT value FROM settings WHERE key = ?", (f"{app_type}_approval_delay_minutes",))
+        execute_query(DELAYED_TARGETS_QUERY, (app_type, "1440"))
+
+
+def _current_delayed_check():
+    from services.application_service import _run_delayed_approvals
+
+    _run_delayed_approvals()
+
+
+def _student_rows(offset: int) -> list:
+    return [
+        {"student_id": str(900000 + offset + n), "name": f"배치{n}", "grade": 1, "class_num": 1}
+        for n in range(STUDENT_BATCH)
+    ]
+
+
+def _legacy_add_students(offset: int):
+    from database.db_manager import execute_insert, transaction
+
+    query = """
+    INSERT INTO students (student_id, name, grade, class_num)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT (student_id) DO NOTHING
+    """
+    with transaction():
+        for student in _student_rows(offset):
+            execute_insert(query, (student["student_id"], student["name"], student["grade"], student["class_num"]))
+
+
+def _current_add_students(offset: int):
+    from services.student_service import add_students
+
+    add_students(_student_rows(offset))
+
+
+def _set_delayed_mode():
+    from database.db_manager import execute_update
+
+    # 대상이 없도록 지연 시간을 길게 잡아 조회 비용만 비교한다.
+    for app_type in ("phone", "tablet", "gate"):
+        for key, value in (("approval_mode", "delayed_auto"), ("approval_delay_minutes", "1440")):
+            execute_update(
+                """
+                INSERT INTO settings (key, value) VALUES (?, ?)
+                ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value, updated_at = now()
+                """,
+                (f"{app_type}_{key}", value),
+            )
+
+
+def _measure(func, iterations: int, with_offset: bool = False):
+    from database.request_cache import get_round_trip_count, request_scope
+
+    elapsed_ms, trips = [], []
+    for n in range(iterations):
+        with request_scope():
+            started = time.perf_counter()
+            func(n * STUDENT_BATCH) if with_offset else func()
+            elapsed_ms.append((time.perf_counter() - started) * 1000)
+            trips.append(get_round_trip_count())
+    return elapsed_ms, trips
+
+
+def _report(label: str, elapsed_ms: list, trips: list):
+    values = sorted(elapsed_ms)
+    p95 = values[min(len(values) - 1, int(len(values) * 0.95))]
+    print(
+        f"  {label:8s} p50 {statistics.median(values):8.2f} ms  p95 {p95:8.2f} ms  "
+        f"round trips {statistics.mean(trips):6.1f}"
+    )
+
+
+def main() -> int:
+    use_bench_database()
+    start_google_sheet_stub()
+    from database.db_manager import execute_delete
+
+    seed_school(student_count=1200, application_count=2400)
+    _set_delayed_mode()
+
+    cases = (
+        ("dashboard statistics", _legacy_dashboard, _current_dashboard, ITERATIONS, False),
+        ("pending count + page", _legacy_pending, _current_pending, ITERATIONS, False),
+        ("delayed approval check", _legacy_delayed_check, _current_delayed_check, ITERATIONS, False),
+        (f"add_students x{STUDENT_BATCH}", _legacy_add_students, _current_add_students, 10, True),
+    )
+    for title, legacy, current, iterations, with_offset in cases:
+        print(title)
+        for label, func in (("before", legacy), ("after", current)):
+            execute_delete("DELETE FROM students WHERE student_id >= '900000'", ())
+            _report(label, *_measure(func, iterations, with_offset))
+    execute_delete("DELETE FROM students WHERE student_id >= '900000'", ())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""
+쿼리 계측 오버헤드 측정 (DB 불필요).
+
+    python -m benchmarks.query_stats_overhead
+
+db_manager._execute_attempts 를 그대로 부르되 풀과 커넥션은 아무 일도 하지 않는 스텁으로
+바꿔서, 쿼리 경로 자체의 비용을 측정 꺼짐/켜짐으로 비교한다.
+
+측정 꺼짐: 스텁 DB 위에서 _execute_attempts 한 번의 비용 (ENABLED 확인 분기 포함)
+측정 켜짐: 위 비용 + perf_counter 2회 + fingerprint(캐시 적중) + histogram 기록
+"""
+import sys
+import time
+from contextlib import nullcontext
+
+from database import db_manager, query_stats
+
+ITERATIONS = 100_000
+SAMPLE_QUERY = """
+SELECT * FROM applications
+WHERE student_id = ?
+ORDER BY submitted_at DESC
+"""
+_ROWS = [{"id": 1}]
+
+
+class _StubCursor:
+    rowcount = 1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None, prepare=None):
+        pass
+
+    def fetchall(self):
+        return _ROWS
+
+
+class _StubConnection:
+    def cursor(self, row_factory=None):
+        return _StubCursor()
+
+    def execute(self, query, params=None):
+        pass
+
+    def pipeline(self):
+        return nullcontext()
+
+    def transaction(self):
+        return nullcontext()
+
+
+class _StubPool:
+    def __init__(self):
+        self._conn = _StubConnection()
+
+    def connection(self, timeout=None):
+        return nullcontext(self._conn)
+
+
+def _per_call_us() -> float:
+    execute = db_manager._execute_attempts
+    started = time.perf_counter()
+    for _ in range(ITERATIONS):
+        execute(SAMPLE_QUERY, ("001234",), fetch=True)
+    return (time.perf_counter() - started) / ITERATIONS * 1_000_000
+
+
+def _best_of(runs: int = 5) -> float:
+    return min(_per_call_us() for _ in range(runs))
+
+
+def main() -> int:
+    original_get_pool = db_manager.get_pool
+    stub_pool = _StubPool()
+    db_manager.get_pool = lambda: stub_pool
+    try:
+        query_stats.set_query_stats_enabled(False)
+        disabled = _best_of()
+        query_stats.set_query_stats_enabled(True)
+        enabled = _best_of()
+    finally:
+        db_manager.get_pool = original_get_pool
+        query_stats.set_query_stats_enabled(False)
+        query_stats.reset_query_stats()
+
+    print(f"stats off: {disabled:.3f} us/query (_execute_attempts on a stub pool)")
+    print(f"stats on:  {enabled:.3f} us/query")
+    print(f"overhead:  {enabled - disabled:.3f} us/query")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+"""
+읽기 복제본 라우팅 점검: read_only 조회가 복제본으로 가는지, 쓰기 직후 세션 고정,
+지연(lag) 초과와 복제본 장애 시 primary 로 돌아가는지 확인한다.
+
+    BENCH_DATABASE_URL=postgresql://postgres@localhost:5432/phone2026_bench \
+    BENCH_REPLICA_DATABASE_URL=postgresql://postgres@localhost:5433/phone2026_bench \
+    python -m benchmarks.replica_routing
+
+로컬 Postgres 두 개(서로 복제하지 않아도 된다)에 replica_probe 테이블을 만들고
+각각 'primary' / 'replica' 를 넣어, 조회 결과로 어느 쪽이 응답했는지 구분한다.
+복제본 앞에는 tools/fault_proxy.py 를 두어 복제본 다운을 흉내 낸다.
+기대와 다르면 오류로 끝난다.
+"""
+import os
+import sys
+import time
+
+from benchmarks.common import through_proxy, use_bench_database
+
+BENCH_REPLICA_DB_ENV = "BENCH_REPLICA_DATABASE_URL"
+
+# database.replica 를 import 하기 전에 정해야 하는 값
+os.environ.setdefault("DB_REPLICA_STICKY_SECONDS", "1")
+os.environ.setdefault("DB_REPLICA_LAG_CHECK_SECONDS", "0.2")
+os.environ.setdefault("DB_REPLICA_RETRY_SECONDS", "1")
+os.environ.setdefault("DB_REPLICA_CONNECT_TIMEOUT", "1")
+
+
+def _expect(condition: bool, message: str):
+    if not condition:
+        raise RuntimeError(message)
+
+
+def _seed(db_url: str, source: str):
+    import psycopg
+
+    with psycopg.connect(db_url, autocommit=True) as conn:
+        conn.execute("CREATE TABLE IF NOT EXISTS public.replica_probe (source text)")
+        conn.execute("TRUNCATE public.replica_probe")
+        conn.execute("INSERT INTO public.replica_probe (source) VALUES (%s)", (source,))
+
+
+def _drop(db_url: str):
+    import psycopg
+
+    with psycopg.connect(db_url, autocommit=True) as conn:
+        conn.execute("DROP TABLE IF EXISTS public.replica_probe")
+
+
+def _read() -> str:
+    from database.db_manager import execute_query
+
+    return execute_query("SELECT source FROM replica_probe", read_only=True)[0]["source"]
+
+
+def _check(label: str, func, expected: str):
+    started = time.perf_counter()
+    source = func()
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    print(f"  {label:34s} {source:8s} {elapsed_ms:8.1f} ms")
+    _expect(source == expected, f"{label}: expected {expected}, got {source}")
+
+
+def main() -> int:
+    db_url = use_bench_database()
+    replica_url = os.getenv(BENCH_REPLICA_DB_ENV)
+    if not replica_url:
+        raise SystemExit(f"{BENCH_REPLICA_DB_ENV} is not set (a second local Postgres instance).")
+
+    from tools.fault_proxy import FaultProxy
+
+    proxy = FaultProxy.for_database_url(replica_url).start()
+    os.environ["SUPABASE_REPLICA_DB_URL"] = through_proxy(replica_url, proxy.address)
+    os.environ.pop("REPLICA_DATABASE_URL", None)
+
+    _seed(db_url, "primary")
+    _seed(replica_url, "replica")
+
+    from database import replica
+    from database.db_manager import (
+        close_all_connections,
+        execute_batch,
+        execute_query,
+        execute_update,
+        stream_query,
+        transaction,
+    )
+
+    replica.reset_replica_state()
+    _check("read_only read", _read, "replica")
+    _check("plain read", lambda: execute_query("SELECT source FROM replica_probe")[0]["source"], "primary")
+    _check("read_only batch", lambda: execute_batch(
+        [("SELECT source FROM replica_probe", None)], read_only=True
+    )[0][0]["source"], "replica")
+    _check("read_only stream", lambda: list(
+        stream_query("SELECT source FROM replica_probe", read_only=True)
+    )[0]["source"], "replica")
+
+    execute_update("UPDATE replica_probe SET source = ?", ("primary",))
+    _check("read right after a write (sticky)", _read, "primary")
+    time.sleep(replica.STICKY_SECONDS)
+    _check("read after the sticky window", _read, "replica")
+
+    with transaction():
+        _check("read_only inside transaction()", _read, "primary")
+    time.sleep(replica.STICKY_SECONDS)
+
+    replica.record_lag(replica.MAX_LAG_SECONDS + 60)
+    _check("replica lagging", _read, "primary")
+    time.sleep(replica.LAG_CHECK_SECONDS)
+    _check("lag re-measured", _read, "replica")
+
+    proxy.configure(refuse=True)
+    proxy.reset_connections()
+    errors_before = replica.get_replica_stats()["replica_errors"]
+    _check("replica down (fallback)", _read, "primary")
+    _expect(replica.get_replica_stats()["replica_errors"] > errors_before, "replica failure was not recorded")
+    _check("replica down (skipped)", _read, "primary")
+
+    proxy.configure()
+
+    def _wait_for_replica():
+        # 풀의 재연결 백오프가 끝날 때까지 기다린다.
+        deadline = time.monotonic() + 15
+        while True:
+            time.sleep(replica.RETRY_SECONDS)
+            source = _read()
+            if source == "replica" or time.monotonic() > deadline:
+                return source
+
+    _check("replica back", _wait_for_replica, "replica")
+
+    stats = replica.get_replica_stats()
+    print("  " + ", ".join(f"{name}={stats[name]}" for name in (
+        "replica_reads", "primary_sticky", "primary_lag", "primary_unhealthy", "replica_errors"
+    )))
+
+    close_all_connections()
+    proxy.stop()
+    _drop(db_url)
+    _drop(replica_url)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+"""
+10만 행 조회 시 행당 메모리: dict_row + dict(row) 복사(이전) vs dict_row vs database.records,
+그리고 stream_query(서버 커서)로 한 번 훑을 때의 최대 메모리.
+
+    BENCH_DATABASE_URL=postgresql://postgres@localhost/phone2026_bench python -m benchmarks.row_memory
+
+applications JOIN students 결과와 같은 모양(신청서 12열 + 학년/반/이름)의 행을
+generate_series 로 만들어 execute_query 로 받는다. tracemalloc 으로 결과 목록이
+붙잡고 있는 메모리(행당 바이트)와 조회 중 최대 메모리, 조회 시간을 출력한다.
+stream_query 는 결과를 붙잡지 않으므로 최대 메모리만 본다 (--rows 를 늘려도 일정해야 한다).
+"""
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+
+from benchmarks.common import use_bench_database
+
+ROW_QUERY = """
+SELECT n AS id,
+       lpad(n::text, 6, '0') AS student_id,
+       (ARRAY['phone', 'tablet', 'gate'])[mod(n, 3) + 1] AS application_type,
+       '벤치마크 사유 ' || n AS reason,
+       NULL::text AS extra_info,
+       'pending' AS status,
+       NULL::text AS approval_number,
+       now() AS submitted_at,
+       NULL::timestamptz AS approved_at,
+       NULL::text AS approved_by,
+       NULL::text AS rejection_reason,
+       1 AS version,
+       mod(n, 6) + 1 AS grade,
+       mod(n, 10) + 1 AS class_num,
+       '학생' || n AS name
+FROM generate_series(1, ?) AS n
+"""
+
+
+def _fetch_dict_copy(rows: int):
+    from database.db_manager import execute_query
+
+    return [dict(row) for row in execute_query(ROW_QUERY, (rows,))]
+
+
+def _fetch_dict(rows: int):
+    from database.db_manager import execute_query
+
+    return execute_query(ROW_QUERY, (rows,))
+
+
+def _fetch_records(rows: int):
+    from database.db_manager import execute_query
+    from database.records import Application
+
+    return execute_query(ROW_QUERY, (rows,), row_type=Application)
+
+
+def _measure(fetch, rows: int) -> dict:
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    result = fetch(rows)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    if len(result) != rows:
+        raise RuntimeError(f"expected {rows} rows, got {len(result)}")
+    # 결과를 실제로 쓰는 것처럼 한 번씩 읽는다.
+    sum(row["grade"] for row in result)
+    return {
+        "bytes_per_row": (current - baseline) / rows,
+        "peak_mb": (peak - baseline) / 1024 / 1024,
+        "elapsed_ms": elapsed_ms,
+    }
+
+
+def _measure_stream(rows: int) -> dict:
+    from database.db_manager import stream_query
+    from database.records import Application
+
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    count = 0
+    grades = 0
+    for row in stream_query(ROW_QUERY, (rows,), row_type=Application):
+        count += 1
+        grades += row["grade"]
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    if count != rows:
+        raise RuntimeError(f"expected {rows} rows, got {count}")
+    return {"peak_mb": (peak - baseline) / 1024 / 1024, "elapsed_ms": elapsed_ms}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    use_bench_database()
+    # 첫 연결/문장 준비 비용을 측정에서 뺀다.
+    _fetch_dict(10)
+
+    print(f"{args.rows} rows")
+    for label, fetch in (
+        ("dict_row + dict(row)", _fetch_dict_copy),
+        ("dict_row", _fetch_dict),
+        ("records.Application", _fetch_records),
+    ):
+        result = _measure(fetch, args.rows)
+        print(
+            f"  {label:22s} {result['bytes_per_row']:7.1f} B/row retained  "
+            f"peak {result['peak_mb']:7.1f} MB  {result['elapsed_ms']:8.1f} ms"
+        )
+    result = _measure_stream(args.rows)
+    print(f"  {'stream_query':22s} {'-':>7s} B/row retained  peak {result['peak_mb']:7.1f} MB  {result['elapsed_ms']:8.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
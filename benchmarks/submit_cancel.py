@@ -0,0 +1,161 @@
+"""
+신청/취소 경로 비교: 이전 방식(설정 조회 + 승인번호 발급 + INSERT, SELECT + DELETE) vs 단일 문장.
+
+    BENCH_DATABASE_URL=postgresql://postgres@localhost/phone2026_bench python -m benchmarks.submit_cancel
+
+승인 모드(manual / delayed_auto / instant_auto 정문)별로 신청→취소를 반복하며
+호출당 DB 왕복 수(request_cache 집계)와 지연 시간(p50/p95)을 출력한다.
+지연 자동승인 점검(_apply_delayed_approvals)은 두 방식에 공통이라 비교에서 뺀다.
+"""
+import statistics
+import sys
+import time
+
+from benchmarks.common import seed_school, start_google_sheet_stub, use_bench_database
+
+ITERATIONS = 200
+MODES = (("phone", "manual"), ("phone", "delayed_auto"), ("gate", "instant_auto"))
+
+
+def _legacy_submit(student_id, application_type, reason, extra_info=None):
+    from database.db_manager import execute_insert, execute_query
+    from services.application_service import _get_delay_minutes, _normalize_approval_mode
+    from utils.approval_number import generate_approval_number
+
+    result = execute_query("SELECT value FROM settings WHERE key = ?", (f"{application_type}_approval_mode",))
+    approval_mode = _normalize_approval_mode(result[0]["value"] if result else "manual")
+    if approval_mode == "instant_auto":
+        status = "auto_approved"
+        approval_number = generate_approval_number(application_type) if application_type == "gate" else None
+        approved_by = "system_auto"
+    else:
+        status, approval_number, approved_by = "pending", None, None
+    try:
+        execute_insert(
+            """
+            INSERT INTO applications (
+                student_id, application_type, reason, extra_info, status,
+                approved_at, approved_by, approval_number
+            ) VALUES (?, ?, ?, ?, ?, CASE WHEN ? = 'auto_approved' THEN now() ELSE NULL END, ?, ?)
+            """,
+            (student_id, application_type, reason, extra_info, status, status, approved_by, approval_number),
+        )
+    except Exception as e:
+        if "UNIQUE" in str(e).upper():
+            return False, "이미 같은 유형의 신청서가 있습니다."
+        raise
+    if approval_mode == "delayed_auto":
+        _get_delay_minutes(application_type)
+    return True, "ok"
+
+
+def _legacy_cancel(app_id, student_id):
+    from database.db_manager import execute_delete, execute_query
+
+    execute_query("SELECT * FROM applications WHERE id = ?", (app_id,))
+    deleted = execute_delete(
+        """
+        DELETE FROM applications
+        WHERE id = ? AND student_id = ? AND status IN ('pending', 'approved', 'auto_approved')
+        """,
+        (app_id, student_id),
+    )
+    return deleted > 0, "ok"
+
+
+def _current_submit(student_id, application_type, reason, extra_info=None):
+    from database.db_manager import execute_insert
+    from services.application_service import SUBMIT_APPLICATION_QUERY, build_submit_params
+
+    row = execute_insert(
+        SUBMIT_APPLICATION_QUERY, build_submit_params(student_id, application_type, reason, extra_info), returning=True
+    )[0]
+    return row["id"] is not None, "ok"
+
+
+def _current_cancel(app_id, student_id):
+    from database.db_manager import execute_delete
+    from services.application_service import CANCEL_APPLICATION_QUERY
+
+    return bool(execute_delete(CANCEL_APPLICATION_QUERY, (app_id, student_id), returning=True)), "ok"
+
+
+def _set_mode(application_type, mode):
+    from database.db_manager import execute_update
+
+    execute_update(
+        """
+        INSERT INTO settings (key, value) VALUES (?, ?)
+        ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value, updated_at = now()
+        """,
+        (f"{application_type}_approval_mode", mode),
+    )
+
+
+def _run(label, submit, cancel, application_type):
+    from database.db_manager import execute_query
+    from database.request_cache import get_round_trip_count, request_scope
+
+    submit_ms, cancel_ms, submit_trips, cancel_trips, duplicate_trips = [], [], [], [], []
+    for n in range(1, ITERATIONS + 1):
+        student_id = str(n).zfill(6)
+        with request_scope():
+            started = time.perf_counter()
+            ok, _ = submit(student_id, application_type, "벤치마크")
+            submit_ms.append((time.perf_counter() - started) * 1000)
+            submit_trips.append(get_round_trip_count())
+        if not ok:
+            raise RuntimeError(f"{label}: submit failed for {student_id}")
+
+        with request_scope():
+            before = get_round_trip_count()
+            ok, _ = submit(student_id, application_type, "벤치마크")
+            duplicate_trips.append(get_round_trip_count() - before)
+        if ok:
+            raise RuntimeError(f"{label}: duplicate submit was accepted for {student_id}")
+
+        app_id = execute_query(
+            "SELECT id FROM applications WHERE student_id = ? AND application_type = ?",
+            (student_id, application_type),
+        )[0]["id"]
+        with request_scope():
+            started = time.perf_counter()
+            ok, _ = cancel(app_id, student_id)
+            cancel_ms.append((time.perf_counter() - started) * 1000)
+            cancel_trips.append(get_round_trip_count())
+        if not ok:
+            raise RuntimeError(f"{label}: cancel failed for {app_id}")
+
+    def pct(values, q):
+        values = sorted(values)
+        return values[min(len(values) - 1, int(len(values) * q))]
+
+    # autocommit 문장은 BEGIN/SET LOCAL/문장/COMMIT 을 한 번에 보내므로 문장당 왕복 1이다.
+    print(
+        f"  {label:8s} submit p50 {statistics.median(submit_ms):6.2f} p95 {pct(submit_ms, 0.95):6.2f} ms "
+        f"({statistics.mean(submit_trips):.1f} stmt, duplicate {statistics.mean(duplicate_trips):.1f} stmt) | "
+        f"cancel p50 {statistics.median(cancel_ms):6.2f} p95 {pct(cancel_ms, 0.95):6.2f} ms "
+        f"({statistics.mean(cancel_trips):.1f} stmt)"
+    )
+
+
+def main() -> int:
+    use_bench_database()
+    start_google_sheet_stub()
+    from database.db_manager import execute_delete
+
+    seed_school(student_count=1200, application_count=0)
+    for application_type, mode in MODES:
+        _set_mode(application_type, mode)
+        print(f"{application_type} / {mode}")
+        for label, submit, cancel in (
+            ("before", _legacy_submit, _legacy_cancel),
+            ("after", _current_submit, _current_cancel),
+        ):
+            execute_delete("DELETE FROM applications", ())
+            _run(label, submit, cancel, application_type)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,23 +1,67 @@
 import os
 import streamlit as st
-from database.db_manager import execute_query
+from config.settings import SYSTEM_ADMIN_PASSWORD_ENV
+from config.tenants import current_tenant, is_multi_tenant
+from services.student_service import get_student_login_index, login_key
+from utils.rate_limit import KeyedRateLimiter, TokenBucket
 
-def authenticate_parent(student_id: str, name: str):
-    """학부모 인증: 학번과 이름 확인"""
-    query = """
-    SELECT id, student_id, name, grade, class_num
-    FROM students
-    WHERE student_id = ? AND name = ?
+# 세션당 연속 5회, 이후 10초에 1회 / IP당 연속 60회, 이후 초당 0.5회
+SESSION_LOGIN_BURST = 5
+SESSION_LOGIN_REFILL_PER_SECOND = 0.1
+IP_LOGIN_BURST = 60
+IP_LOGIN_REFILL_PER_SECOND = 0.5
+
+# 앱 앞에서 X-Forwarded-For 에 주소를 덧붙이는 신뢰하는 프록시 수 (0이면 헤더를 믿지 않는다)
+TRUSTED_PROXY_HOPS = int(os.getenv("TRUSTED_PROXY_HOPS", "1"))
+
+_ip_login_limiter = KeyedRateLimiter(IP_LOGIN_BURST, IP_LOGIN_REFILL_PER_SECOND)
+
+def _get_client_ip():
     """
-    result = execute_query(query, (student_id, name))
+    신뢰하는 프록시가 덧붙인 클라이언트 주소
+
+    X-Forwarded-For 의 왼쪽 값은 클라이언트가 마음대로 넣을 수 있으므로, 오른쪽에서
+    TRUSTED_PROXY_HOPS 번째 값(가장 바깥 프록시가 본 접속 주소)을 쓴다.
+    알 수 없으면 None 을 돌려주고 세션 버킷만 적용한다.
+    """
+    if TRUSTED_PROXY_HOPS <= 0:
+        return None
+    try:
+        forwarded = st.context.headers.get("X-Forwarded-For")
+    except Exception:
+        return None
+    if not forwarded:
+        return None
+    hops = [hop.strip() for hop in forwarded.split(",")]
+    if len(hops) < TRUSTED_PROXY_HOPS:
+        return None
+    return hops[-TRUSTED_PROXY_HOPS] or None
+
+def allow_parent_login_attempt() -> bool:
+    """학부모 로그인 시도 허용 여부 (세션/IP 토큰 버킷, DB 조회 전 호출)"""
+    bucket = st.session_state.get("parent_login_bucket")
+    if bucket is None:
+        bucket = TokenBucket(SESSION_LOGIN_BURST, SESSION_LOGIN_REFILL_PER_SECOND)
+        st.session_state.parent_login_bucket = bucket
+    if not bucket.consume():
+        return False
+
+    client_ip = _get_client_ip()
+    if client_ip and not _ip_login_limiter.allow(client_ip):
+        return False
+    return True
+
+def authenticate_parent(student_id: str, name: str):
+    """학부모 인증: 학번과 이름 확인 (메모리 인덱스 조회)"""
+    student = get_student_login_index().get(login_key(student_id, name))
 
-    if result:
-        return dict(result[0])
+    if student:
+        return dict(student)
     return None
 
 def authenticate_admin(password: str) -> bool:
-    """관리자 인증: 비밀번호 확인"""
-    admin_password = os.getenv("ADMIN_PASSWORD")
+    """관리자 인증: 비밀번호 확인 (학교마다 admin_password_env 의 환경변수)"""
+    admin_password = os.getenv(current_tenant().admin_password_env)
 
     if not admin_password:
         st.warning("⚠️ 관리자 비밀번호가 설정되지 않았습니다.")
@@ -25,6 +69,22 @@ def authenticate_admin(password: str) -> bool:
 
     return password == admin_password
 
+def authenticate_system_admin(password: str) -> bool:
+    """배포 관리자 인증: 모든 학교가 함께 쓰는 서버 전체 상태를 볼 수 있다 (SYSTEM_ADMIN_PASSWORD)"""
+    system_password = os.getenv(SYSTEM_ADMIN_PASSWORD_ENV)
+
+    if not system_password:
+        st.warning("⚠️ 배포 관리자 비밀번호가 설정되지 않았습니다.")
+        return False
+
+    return password == system_password
+
+def can_view_system_status() -> bool:
+    """학교가 하나면 학교 관리자가 곧 배포 관리자다. 여러 학교면 배포 관리자 인증이 필요하다."""
+    if not st.session_state.get("admin_authenticated", False):
+        return False
+    return not is_multi_tenant() or st.session_state.get("system_admin_authenticated", False)
+
 def is_user_authenticated(user_type: str) -> bool:
     """현재 사용자 인증 상태 확인"""
     if user_type == "parent":
@@ -46,3 +106,4 @@ def logout_admin():
     """관리자 로그아웃"""
     st.session_state.admin_authenticated = False
     st.session_state.admin_name = None
+    st.session_state.system_admin_authenticated = False
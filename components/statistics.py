@@ -1,9 +1,7 @@
 import streamlit as st
 import pandas as pd
 from services.application_service import (
-    get_statistics,
-    get_statistics_by_type,
-    get_statistics_by_grade,
+    get_dashboard_statistics,
     get_application_type_name,
     get_status_name
 )
@@ -12,8 +10,9 @@ def render_statistics_dashboard():
     """통계 대시보드 렌더링"""
     st.subheader("📊 통계 대시보드")
 
-    # KPI 카드
-    stats = get_statistics()
+    # KPI 카드 (요약/유형별/학년별 통계는 한 번에 조회)
+    dashboard = get_dashboard_statistics()
+    stats = dashboard['summary']
 
     col1, col2, col3, col4 = st.columns(4)
     with col1:
@@ -30,7 +29,7 @@ def render_statistics_dashboard():
     # 타입별 통계
     st.subheader("📝 신청 타입별 현황")
 
-    type_data = get_statistics_by_type()
+    type_data = dashboard['by_type']
     if type_data:
         type_df = pd.DataFrame(type_data)
 
@@ -55,7 +54,7 @@ def render_statistics_dashboard():
     # 학년별 통계
     st.subheader("👥 학년별 신청 현황")
 
-    grade_data = get_statistics_by_grade()
+    grade_data = dashboard['by_grade']
     if grade_data:
         grade_df = pd.DataFrame(grade_data)
 
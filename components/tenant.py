@@ -0,0 +1,47 @@
+import streamlit as st
+
+from components.auth import logout_admin, logout_parent
+from config.tenants import activate_tenant, get_tenant, resolve_tenant
+from database.db_manager import init_database
+
+_SESSION_KEY = "tenant_slug"
+
+
+@st.cache_resource(show_spinner=False)
+def _ensure_schema(schema: str) -> bool:
+    """학교 스키마 마이그레이션 (프로세스에서 학교마다 한 번)"""
+    init_database()
+    return True
+
+
+def _request_host():
+    try:
+        return st.context.headers.get("Host")
+    except Exception:
+        return None
+
+
+def use_request_tenant():
+    """
+    이번 스크립트 실행의 학교를 정한다. 페이지 맨 앞(begin_request 직후)에서 호출.
+
+    ?school= 로 고른 학교는 세션에 남겨 두어 사이드바로 페이지를 옮겨도 유지된다.
+    """
+    school = st.query_params.get("school")
+    if school:
+        tenant = resolve_tenant(school=school)
+        if tenant is None:
+            st.error("등록되지 않은 학교입니다. 주소를 확인해주세요.")
+            st.stop()
+    else:
+        tenant = get_tenant(st.session_state.get(_SESSION_KEY) or "") or resolve_tenant(host=_request_host())
+
+    previous = st.session_state.get(_SESSION_KEY)
+    if previous is not None and previous != tenant.slug:
+        # 다른 학교로 바뀌면 이전 학교의 로그인을 이어 쓰지 않는다.
+        logout_parent()
+        logout_admin()
+    st.session_state[_SESSION_KEY] = tenant.slug
+    activate_tenant(tenant)
+    _ensure_schema(tenant.schema)
+    return tenant
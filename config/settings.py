@@ -41,3 +41,5 @@ DOCUMENT_TYPES = {
 
 # 보안
 ADMIN_PASSWORD_ENV = "ADMIN_PASSWORD"
+# 여러 학교를 운영할 때 서버 전체 상태(관리 페이지 시스템 상태 탭)를 보는 배포 관리자 비밀번호
+SYSTEM_ADMIN_PASSWORD_ENV = "SYSTEM_ADMIN_PASSWORD"
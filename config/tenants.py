@@ -0,0 +1,168 @@
+"""
+학교(테넌트) 설정과 요청 → 학교 매핑
+
+한 배포에서 여러 학교를 운영할 때 학교마다 Postgres 스키마를 따로 쓴다.
+학교 목록은 TENANTS 환경변수(JSON) 또는 Streamlit secrets 의 [tenants.<slug>] 표에 둔다.
+
+    TENANTS='{
+      "dongsung": {"schema": "phone2026", "school_name": "동성초등학교", "approval_prefix": "DS"},
+      "hanbit": {"schema": "school_hanbit", "school_name": "한빛초등학교", "approval_prefix": "HB",
+                 "school_year": 2026, "hosts": ["hanbit.example.com"], "admin_password_env": "ADMIN_PASSWORD_HANBIT",
+                 "google_sheet_webapp_url": "https://script.google.com/macros/s/.../exec"}
+    }'
+
+요청의 학교는 아래 순서로 정한다 (resolve_tenant).
+1. ?school=<slug> (Streamlit 은 페이지 경로를 직접 쓰므로 URL 경로 대신 쿼리 파라미터를 쓴다)
+2. 호스트 이름: hosts 에 적힌 이름이거나 첫 라벨(서브도메인)이 slug 와 같을 때
+3. 기본 학교: DEFAULT_TENANT 로 지정한 slug, 없으면 목록의 첫 학교
+
+school_year 는 새 스키마의 settings 에 처음 넣는 학년도이고 (migrations/0002),
+없으면 config.settings 의 SCHOOL_YEAR 를 쓴다.
+관리 페이지의 시스템 상태 탭(캐시, 쿼리 통계, 느린 요청)은 모든 학교가 함께 쓰는 서버 전체 값이라
+학교가 여럿이면 SYSTEM_ADMIN_PASSWORD 로 인증한 배포 관리자만 볼 수 있다.
+TENANTS 가 없으면 config.settings 의 학교 하나(phone2026 스키마)로 지금처럼 동작한다.
+DB 풀은 모든 학교가 같이 쓰고 문장마다 자기 트랜잭션 안에서 SET LOCAL search_path 로
+스키마를 정하므로, 학교를 추가해도 커넥션 수나 다른 학교의 응답 속도는 달라지지 않는다.
+학교 목록은 프로세스 시작 시 한 번 읽으므로 학교를 추가하면 재시작 후
+`python -m database.migrator` 로 스키마를 만든다 (처음 접속할 때도 만들어진다).
+"""
+import json
+import os
+import re
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+from config.settings import ADMIN_PASSWORD_ENV, SCHOOL_NAME, SCHOOL_YEAR
+
+DEFAULT_SCHEMA = "phone2026"
+DEFAULT_APPROVAL_PREFIX = "DS"
+
+# 스키마 이름은 SQL 에 그대로 들어가므로 따옴표가 필요 없는 소문자 식별자만 허용한다.
+_SCHEMA_RE = re.compile(r"^[a-z_][a-z0-9_]{0,62}$")
+_SLUG_RE = re.compile(r"^[a-z0-9][a-z0-9-]{0,62}$")
+
+
+@dataclass(frozen=True)
+class Tenant:
+    slug: str
+    schema: str
+    school_name: str
+    approval_prefix: str = DEFAULT_APPROVAL_PREFIX
+    hosts: tuple = ()
+    admin_password_env: str = ADMIN_PASSWORD_ENV
+    google_sheet_webapp_url: Optional[str] = None
+    gate_sheet_url: Optional[str] = None
+    school_year: int = SCHOOL_YEAR
+
+    @property
+    def search_path(self) -> str:
+        return f"{self.schema},public"
+
+
+_current = ContextVar("phone2026_tenant", default=None)
+
+
+def _tenant_from_config(slug: str, data) -> Tenant:
+    if not _SLUG_RE.match(slug):
+        raise RuntimeError(f"TENANTS: 학교 slug 는 소문자/숫자/하이픈만 쓸 수 있습니다: {slug!r}")
+    schema = data.get("schema") or slug.replace("-", "_")
+    if not _SCHEMA_RE.match(schema):
+        raise RuntimeError(f"TENANTS: {slug} 의 schema 이름이 올바르지 않습니다: {schema!r}")
+    if not data.get("school_name"):
+        raise RuntimeError(f"TENANTS: {slug} 에 school_name 이 없습니다.")
+    return Tenant(
+        slug=slug,
+        schema=schema,
+        school_name=data["school_name"],
+        approval_prefix=data.get("approval_prefix") or DEFAULT_APPROVAL_PREFIX,
+        hosts=tuple(host.lower() for host in data.get("hosts") or ()),
+        admin_password_env=data.get("admin_password_env") or ADMIN_PASSWORD_ENV,
+        google_sheet_webapp_url=data.get("google_sheet_webapp_url"),
+        gate_sheet_url=data.get("gate_sheet_url"),
+        school_year=int(data.get("school_year") or SCHOOL_YEAR),
+    )
+
+
+def _read_tenant_config():
+    raw = os.getenv("TENANTS")
+    if raw:
+        return json.loads(raw), os.getenv("DEFAULT_TENANT")
+    try:
+        import streamlit as st
+
+        tenants = st.secrets.get("tenants")
+        if tenants:
+            return {slug: dict(data) for slug, data in tenants.items()}, st.secrets.get("DEFAULT_TENANT")
+    except Exception:
+        pass
+    return None, None
+
+
+@lru_cache(maxsize=1)
+def _load_tenants() -> tuple:
+    config, default_slug = _read_tenant_config()
+    if not config:
+        default = Tenant(slug="default", schema=DEFAULT_SCHEMA, school_name=SCHOOL_NAME)
+        return {default.slug: default}, default
+
+    tenants = {slug: _tenant_from_config(slug, data) for slug, data in config.items()}
+    schemas = [tenant.schema for tenant in tenants.values()]
+    if len(set(schemas)) != len(schemas):
+        raise RuntimeError("TENANTS: 두 학교가 같은 schema 를 쓸 수 없습니다.")
+    if default_slug and default_slug not in tenants:
+        raise RuntimeError(f"DEFAULT_TENANT={default_slug!r} 가 TENANTS 에 없습니다.")
+    return tenants, tenants[default_slug or next(iter(tenants))]
+
+
+def get_tenants() -> list[Tenant]:
+    return list(_load_tenants()[0].values())
+
+
+def get_tenant(slug: str) -> Optional[Tenant]:
+    return _load_tenants()[0].get(slug)
+
+
+def get_default_tenant() -> Tenant:
+    return _load_tenants()[1]
+
+
+def is_multi_tenant() -> bool:
+    return len(_load_tenants()[0]) > 1
+
+
+def resolve_tenant(host: str = None, school: str = None) -> Optional[Tenant]:
+    """요청의 호스트/school 파라미터로 학교를 찾는다. school 이 목록에 없으면 None."""
+    tenants, default = _load_tenants()
+    if school:
+        return tenants.get(school.strip().lower())
+    if host:
+        hostname = host.split(":", 1)[0].lower()
+        for tenant in tenants.values():
+            if hostname in tenant.hosts:
+                return tenant
+        subdomain = hostname.split(".", 1)[0]
+        if subdomain in tenants and "." in hostname:
+            return tenants[subdomain]
+    return default
+
+
+def current_tenant() -> Tenant:
+    """지금 요청(스크립트 실행, API 요청, worker 작업)의 학교. 정해지지 않았으면 기본 학교."""
+    return _current.get() or get_default_tenant()
+
+
+def activate_tenant(tenant: Tenant):
+    """현재 컨텍스트의 학교를 바꾼다 (Streamlit 스크립트 실행 시작 시 호출)."""
+    _current.set(tenant)
+
+
+@contextmanager
+def tenant_scope(tenant: Tenant):
+    token = _current.set(tenant)
+    try:
+        yield tenant
+    finally:
+        _current.reset(token)
@@ -0,0 +1,102 @@
+"""
+Async counterpart of db_manager for non-Streamlit callers (api/).
+
+Connections come from a psycopg_pool.AsyncConnectionPool opened on first use,
+so many concurrent requests share a bounded set of connections instead of
+each holding a Streamlit script thread. Queries keep the same conventions as
+the sync helpers: `?` placeholders, dict rows, search_path set LOCAL to each
+statement's transaction (safe behind the Supabase transaction pooler), the
+shared statement cache, and writes return rowcount unless returning=True.
+"""
+import asyncio
+import os
+import time
+
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool
+
+from database import query_stats, statement_cache
+from database.records import record_row
+from database.db_manager import (
+    _get_database_url,
+    _search_path,
+    _session_options,
+    _statement_scope,
+    _validate_database_url,
+)
+from utils import tracing
+
+_POOL_MIN_SIZE = int(os.getenv("ASYNC_DB_POOL_MIN", "1"))
+_POOL_MAX_SIZE = int(os.getenv("ASYNC_DB_POOL_MAX", "10"))
+_POOL_TIMEOUT_SECONDS = float(os.getenv("ASYNC_DB_POOL_TIMEOUT", "10"))
+
+_pool = None
+_pool_lock = asyncio.Lock()
+
+
+async def get_pool() -> AsyncConnectionPool:
+    global _pool
+    if _pool is not None:
+        return _pool
+    async with _pool_lock:
+        if _pool is None:
+            db_url = _get_database_url()
+            _validate_database_url(db_url)
+            pool = AsyncConnectionPool(
+                db_url,
+                min_size=_POOL_MIN_SIZE,
+                max_size=_POOL_MAX_SIZE,
+                timeout=_POOL_TIMEOUT_SECONDS,
+                kwargs={
+                    "row_factory": dict_row,
+                    "autocommit": True,
+                    "connect_timeout": 10,
+                    "options": _session_options(),
+                    **statement_cache.configure(db_url),
+                },
+                open=False,
+            )
+            await pool.open()
+            _pool = pool
+    return _pool
+
+
+async def close_pool():
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
+
+
+async def _execute(query, params=None, fetch=False, row_type=None):
+    pool = await get_pool()
+    row_factory = record_row(row_type) if row_type is not None else None
+    with tracing.child_span("db.query", statement=query_stats.fingerprint(query)):
+        async with pool.connection() as conn:
+            async with conn.cursor(row_factory=row_factory) as cursor:
+                started = time.perf_counter() if query_stats.ENABLED else None
+                normalized_query, prepare = statement_cache.lookup(query, _statement_scope())
+                # Same as db_manager._execute_scoped: BEGIN, SET LOCAL, statement, COMMIT in one flush.
+                async with conn.pipeline(), conn.transaction():
+                    await conn.execute(f"SET LOCAL search_path TO {_search_path()}")
+                    await cursor.execute(normalized_query, params if params is not None else (), prepare=prepare)
+                result = await cursor.fetchall() if fetch else cursor.rowcount
+                if started is not None:
+                    query_stats.record(query, time.perf_counter() - started, len(result) if fetch else result)
+                return result
+
+
+async def execute_query(query, params=None, row_type=None):
+    return await _execute(query, params=params, fetch=True, row_type=row_type)
+
+
+async def execute_insert(query, params, returning=False, row_type=None):
+    return await _execute(query, params=params, fetch=returning, row_type=row_type)
+
+
+async def execute_update(query, params, returning=False, row_type=None):
+    return await _execute(query, params=params, fetch=returning, row_type=row_type)
+
+
+async def execute_delete(query, params, returning=False, row_type=None):
+    return await _execute(query, params=params, fetch=returning, row_type=row_type)
@@ -1,12 +1,21 @@
+import contextvars
+import itertools
 import os
 import logging
+import threading
+import time
+from contextlib import ExitStack, contextmanager
 from urllib.parse import parse_qs, urlparse
 
 import psycopg
-from psycopg import InterfaceError, OperationalError
+from psycopg import OperationalError, errors
 from psycopg.rows import dict_row
+from psycopg_pool import ConnectionPool, PoolTimeout
 
-from config.settings import SCHOOL_YEAR
+from config.tenants import current_tenant, get_default_tenant, is_multi_tenant
+from database import query_stats, replica, request_cache, retry_policy, shared_cache, statement_cache
+from database.records import record_row
+from utils import tracing
 
 try:
     import streamlit as st
@@ -15,9 +24,23 @@ except Exception:  # pragma: no cover - non-Streamlit runtime fallback
 
 logger = logging.getLogger(__name__)
 _DB_DEBUG = os.getenv("DB_DEBUG", "").lower() in {"1", "true", "yes", "on"}
+_DB_BACKEND = os.getenv("DB_BACKEND", "postgres").lower()
 _connect_count = 0
 _reconnect_count = 0
 _cached_conn_ref = None
+_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN", "0"))
+_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX", "5"))
+_pool = None
+_pool_lock = threading.Lock()
+_REPLICA_POOL_MAX_SIZE = int(os.getenv("DB_REPLICA_POOL_MAX", str(_POOL_MAX_SIZE)))
+_REPLICA_CONNECT_TIMEOUT = float(os.getenv("DB_REPLICA_CONNECT_TIMEOUT", "3"))
+_replica_pool = None
+_replica_prepare = False
+_tx_conn = contextvars.ContextVar("phone2026_transaction_connection", default=None)
+_tx_retry_count = 0
+_ISOLATION_LEVELS = {"READ COMMITTED", "REPEATABLE READ", "SERIALIZABLE"}
+_STREAM_FETCH_SIZE = int(os.getenv("DB_STREAM_FETCH_SIZE", "2000"))
+_stream_counter = itertools.count(1)
 
 
 def _debug_log(message: str):
@@ -26,6 +49,14 @@ def _debug_log(message: str):
 
 
 def _get_database_url() -> str:
+    if _DB_BACKEND == "local":
+        # Embedded Postgres for development/CI/benchmarks (database/local_backend.py).
+        from database.local_backend import get_local_database_url
+
+        return get_local_database_url()
+    if _DB_BACKEND != "postgres":
+        raise RuntimeError(f"Unknown DB_BACKEND={_DB_BACKEND!r}; use 'postgres' (default) or 'local'.")
+
     db_url = os.getenv("SUPABASE_DB_URL") or os.getenv("DATABASE_URL")
     if db_url:
         return db_url
@@ -52,15 +83,16 @@ def _validate_database_url(db_url: str):
     if parsed.scheme not in ("postgresql", "postgres"):
         raise RuntimeError("SUPABASE_DB_URL must start with postgresql://")
 
-    if not parsed.hostname:
+    query = parse_qs(parsed.query)
+    # ?host=/socket/dir is a Unix-socket URL (DB_BACKEND=local).
+    if not parsed.hostname and not query.get("host"):
         raise RuntimeError("SUPABASE_DB_URL is missing host.")
     if not parsed.username:
         raise RuntimeError("SUPABASE_DB_URL is missing username.")
     if not parsed.path or parsed.path == "/":
         raise RuntimeError("SUPABASE_DB_URL is missing database name (usually /postgres).")
 
-    query = parse_qs(parsed.query)
-    if parsed.hostname.endswith("supabase.co") and query.get("sslmode", [None])[0] != "require":
+    if (parsed.hostname or "").endswith("supabase.co") and query.get("sslmode", [None])[0] != "require":
         raise RuntimeError("SUPABASE_DB_URL must include sslmode=require for Supabase.")
 
     # Supabase transaction pooler commonly uses port 6543 and user like postgres.<project_ref>.
@@ -70,9 +102,45 @@ def _validate_database_url(db_url: str):
         )
 
 
-def _normalize_query(query: str) -> str:
-    # Keep existing sqlite-style placeholders working with psycopg.
-    return query.replace("?", "%s")
+def _search_path() -> str:
+    # The current school's schema (config/tenants.py). Every statement sets it with
+    # SET LOCAL on a connection this thread has checked out, so all schools share
+    # the same connections without one school's statement seeing another's schema.
+    return current_tenant().search_path
+
+
+def _statement_scope():
+    # Statement-cache scope: with several schools, each schema gets its own
+    # prepared statements instead of re-planning one whenever search_path changes.
+    return current_tenant().schema if is_multi_tenant() else None
+
+
+def _session_options() -> str:
+    return f"-c search_path={get_default_tenant().search_path} -c statement_timeout={retry_policy.STATEMENT_TIMEOUT_MS}"
+
+
+def _connection_kwargs(db_url: str) -> dict:
+    return {
+        "row_factory": dict_row,
+        "connect_timeout": 10,
+        "autocommit": True,
+        "options": _session_options(),
+        **statement_cache.configure(db_url),
+    }
+
+
+def _replica_connection_kwargs(db_url: str) -> dict:
+    global _replica_prepare
+    # The replica may sit behind a different pooler than the primary, so decide
+    # preparing for it separately instead of through statement_cache.configure().
+    _replica_prepare = statement_cache.prepare_enabled(db_url)
+    return {
+        "row_factory": dict_row,
+        "connect_timeout": max(1, int(_REPLICA_CONNECT_TIMEOUT)),
+        "autocommit": True,
+        "options": f"{_session_options()} -c default_transaction_read_only=on",
+        "prepare_threshold": statement_cache.PREPARE_THRESHOLD if _replica_prepare else None,
+    }
 
 
 def _create_db_connection():
@@ -81,13 +149,7 @@ def _create_db_connection():
     _validate_database_url(db_url)
 
     try:
-        conn = psycopg.connect(
-            db_url,
-            row_factory=dict_row,
-            connect_timeout=10,
-            autocommit=True,
-            options="-c search_path=phone2026,public",
-        )
+        conn = psycopg.connect(db_url, **_connection_kwargs(db_url))
         _connect_count += 1
         _debug_log(f"created new connection #{_connect_count} (closed={conn.closed})")
         return conn
@@ -141,116 +203,354 @@ def get_db_connection():
 
 
 def init_database():
-    """Initialize phone2026 schema/tables/settings in Postgres."""
-    create_sql = """
-    CREATE SCHEMA IF NOT EXISTS phone2026;
-
-    CREATE TABLE IF NOT EXISTS phone2026.students (
-        id BIGSERIAL PRIMARY KEY,
-        student_id TEXT UNIQUE NOT NULL,
-        name TEXT NOT NULL,
-        grade INTEGER NOT NULL,
-        class_num INTEGER NOT NULL,
-        created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
-        updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
-    );
-
-    CREATE TABLE IF NOT EXISTS phone2026.applications (
-        id BIGSERIAL PRIMARY KEY,
-        student_id TEXT NOT NULL,
-        application_type TEXT NOT NULL,
-        reason TEXT NOT NULL,
-        extra_info TEXT,
-        status TEXT NOT NULL DEFAULT 'pending',
-        approval_number TEXT,
-        submitted_at TIMESTAMPTZ NOT NULL DEFAULT now(),
-        approved_at TIMESTAMPTZ,
-        approved_by TEXT,
-        rejection_reason TEXT,
-        CONSTRAINT applications_student_fk
-            FOREIGN KEY (student_id) REFERENCES phone2026.students(student_id),
-        CONSTRAINT applications_unique_student_type UNIQUE (student_id, application_type)
-    );
-
-    CREATE TABLE IF NOT EXISTS phone2026.settings (
-        key TEXT PRIMARY KEY,
-        value TEXT NOT NULL,
-        updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
-    );
-
-    CREATE TABLE IF NOT EXISTS phone2026.documents (
-        id BIGSERIAL PRIMARY KEY,
-        title TEXT NOT NULL,
-        file_name TEXT NOT NULL,
-        file_path TEXT NOT NULL,
-        file_type TEXT NOT NULL,
-        uploaded_at TIMESTAMPTZ NOT NULL DEFAULT now()
-    );
-
-    CREATE TABLE IF NOT EXISTS phone2026.activity_logs (
-        id BIGSERIAL PRIMARY KEY,
-        user_type TEXT NOT NULL,
-        user_id TEXT,
-        action TEXT NOT NULL,
-        target_type TEXT,
-        target_id BIGINT,
-        details TEXT,
-        ip_address TEXT,
-        timestamp TIMESTAMPTZ NOT NULL DEFAULT now()
-    );
-
-    CREATE INDEX IF NOT EXISTS idx_student_id ON phone2026.applications(student_id);
-    CREATE INDEX IF NOT EXISTS idx_status ON phone2026.applications(status);
-    CREATE INDEX IF NOT EXISTS idx_application_type ON phone2026.applications(application_type);
-    CREATE INDEX IF NOT EXISTS idx_activity_timestamp ON phone2026.activity_logs(timestamp);
-    """
-
-    conn = get_db_connection()
-    with conn.cursor() as cursor:
-        cursor.execute(create_sql)
-        cursor.execute(
-            """
-            INSERT INTO phone2026.settings (key, value) VALUES
-                ('phone_approval_mode', 'manual'),
-                ('tablet_approval_mode', 'manual'),
-                ('gate_approval_mode', 'manual'),
-                ('phone_approval_delay_minutes', '10'),
-                ('tablet_approval_delay_minutes', '10'),
-                ('gate_approval_delay_minutes', '10'),
-                ('principal_stamp_path', ''),
-                ('academic_year', %s),
-                ('academic_year_start', %s)
-            ON CONFLICT (key) DO NOTHING
-            """,
-            (str(SCHOOL_YEAR), f"{SCHOOL_YEAR}-03-01"),
-        )
+    """Bring the current school's schema up to date (see database/migrator.py)."""
+    from database.migrator import run_migrations
+
+    return run_migrations()
+
+
+def get_pool() -> ConnectionPool:
+    """Process-wide connection pool used by the execute_* helpers, transaction() and execute_batch()."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                db_url = _get_database_url()
+                _validate_database_url(db_url)
+                _pool = ConnectionPool(
+                    db_url,
+                    min_size=_POOL_MIN_SIZE,
+                    max_size=_POOL_MAX_SIZE,
+                    kwargs=_connection_kwargs(db_url),
+                    # Fail fast during an outage instead of psycopg_pool's 30s default;
+                    # execute_* calls shorten this further to their remaining deadline.
+                    timeout=retry_policy.POOL_TIMEOUT_SECONDS,
+                    # Replace connections the server dropped while idle before handing them out.
+                    check=ConnectionPool.check_connection,
+                    name="phone2026",
+                    open=True,
+                )
+    return _pool
+
+
+def get_replica_pool():
+    """Pool for read_only reads, or None when no replica URL is configured (see database/replica.py)."""
+    global _replica_pool
+    if _replica_pool is None:
+        db_url = replica.get_replica_url()
+        if not db_url:
+            return None
+        with _pool_lock:
+            if _replica_pool is None:
+                _validate_database_url(db_url)
+                _replica_pool = ConnectionPool(
+                    db_url,
+                    min_size=0,
+                    max_size=_REPLICA_POOL_MAX_SIZE,
+                    kwargs=_replica_connection_kwargs(db_url),
+                    # Fail over to the primary quickly instead of waiting for a dead replica.
+                    timeout=_REPLICA_CONNECT_TIMEOUT,
+                    name="phone2026-replica",
+                    open=True,
+                )
+    return _replica_pool
 
 
 def close_all_connections():
+    global _pool, _replica_pool
     _invalidate_cached_connection()
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+        if _replica_pool is not None:
+            _replica_pool.close()
+            _replica_pool = None
+
+
+def in_transaction() -> bool:
+    return _tx_conn.get() is not None
+
+
+@contextmanager
+def transaction(isolation_level: str = None):
+    """
+    Run the execute_* calls made inside the block (same thread/context) in one
+    transaction on a pooled connection, committed when the block exits cleanly.
+
+    Nested blocks become savepoints: an exception inside a nested block rolls
+    back only that block. isolation_level applies to the outermost block only.
+    """
+    conn = _tx_conn.get()
+    if conn is not None:
+        with conn.transaction():
+            yield conn
+        return
+
+    if isolation_level is not None and isolation_level.upper() not in _ISOLATION_LEVELS:
+        raise ValueError(f"Unsupported isolation level: {isolation_level}")
+
+    with shared_cache.defer_generation_bumps(), get_pool().connection() as conn:
+        token = _tx_conn.set(conn)
+        try:
+            with conn.transaction():
+                if isolation_level is not None:
+                    conn.execute(f"SET TRANSACTION ISOLATION LEVEL {isolation_level.upper()}")
+                conn.execute(f"SET LOCAL search_path TO {_search_path()}")
+                request_cache.record_round_trip(2)
+                yield conn
+        finally:
+            _tx_conn.reset(token)
+            request_cache.invalidate()
+            replica.mark_write()
+
+
+_RETRYABLE_TX_ERRORS = (errors.SerializationFailure, errors.DeadlockDetected)
+
+
+def run_in_transaction(func, *args, retries: int = 3, isolation_level: str = None, **kwargs):
+    """
+    Call func(*args, **kwargs) inside transaction(), retrying the whole unit when
+    Postgres aborts it with a serialization failure or deadlock. func must be
+    safe to re-run (no side effects outside the database before it returns).
+    """
+    global _tx_retry_count
+    if in_transaction():
+        return func(*args, **kwargs)
+
+    attempt = 0
+    while True:
+        try:
+            with transaction(isolation_level=isolation_level):
+                return func(*args, **kwargs)
+        except _RETRYABLE_TX_ERRORS:
+            if attempt >= retries:
+                raise
+            attempt += 1
+            _tx_retry_count += 1
+            _debug_log(f"transaction retry #{attempt} after serialization failure")
+            time.sleep(retry_policy.backoff_seconds(attempt))
+
+
+def _execute_with_reconnect(query, params=None, fetch=False, row_type=None, timeout=None, write=False):
+    if tracing.has_active_trace():
+        with tracing.span("db.query", statement=query_stats.fingerprint(query)):
+            return _execute_attempts(query, params, fetch, row_type, timeout, write)
+    return _execute_attempts(query, params, fetch, row_type, timeout, write)
 
 
-def _execute_with_reconnect(query, params=None, fetch=False):
+def _execute_attempts(query, params=None, fetch=False, row_type=None, timeout=None, write=False):
     global _reconnect_count
-    normalized_query = _normalize_query(query)
+    normalized_query, prepare = statement_cache.lookup(query, _statement_scope())
     effective_params = params if params is not None else ()
+    # None keeps the connection's dict_row.
+    row_factory = record_row(row_type) if row_type is not None else None
+
+    tx_conn = _tx_conn.get()
+    if tx_conn is not None:
+        # search_path is already set for the transaction; no retry mid-transaction
+        # (run_in_transaction retries the whole unit instead).
+        with tx_conn.cursor(row_factory=row_factory) as cursor:
+            started = time.perf_counter() if query_stats.ENABLED else None
+            with retry_policy.deadline(tx_conn, timeout):
+                cursor.execute(normalized_query, effective_params, prepare=prepare)
+                result = cursor.fetchall() if fetch else cursor.rowcount
+            request_cache.record_round_trip(1)
+            if started is not None:
+                query_stats.record(query, time.perf_counter() - started, len(result) if fetch else result)
+            return result
+
+    # One deadline for the whole call: pool waits, retries and the statement.
+    expires = retry_policy.call_expiry(timeout)
+    attempt = 0
+    while True:
+        statement_sent = False
+        try:
+            with get_pool().connection(timeout=retry_policy.pool_wait_seconds(expires)) as conn:
+                started = time.perf_counter() if query_stats.ENABLED else None
+                statement_sent = True
+                result = _execute_scoped(
+                    conn,
+                    normalized_query,
+                    effective_params,
+                    prepare,
+                    fetch,
+                    row_factory,
+                    retry_policy.remaining_seconds(expires),
+                )
+            request_cache.record_round_trip(1)
+            if started is not None:
+                query_stats.record(query, time.perf_counter() - started, len(result) if fetch else result)
+            retry_policy.record_success(attempt)
+            return result
+        except Exception as e:
+            kind = retry_policy.classify(e)
+            if not retry_policy.should_retry(kind, attempt, write_sent=write and statement_sent, expires=expires):
+                raise
+            attempt += 1
+            if kind == retry_policy.CONNECTION:
+                _reconnect_count += 1
+            _debug_log(f"{kind} error ({e.__class__.__name__}), retry #{attempt}")
+            time.sleep(retry_policy.backoff_seconds(attempt, expires))
+
+
+def _execute_scoped(conn, normalized_query, params, prepare, fetch, row_factory, timeout=None):
+    """
+    Run one statement in its own transaction with the school's search_path set
+    LOCAL to it: BEGIN, SET LOCAL, the statement and COMMIT go out in one
+    pipeline flush. conn must be checked out by this thread (pooled), which
+    also keeps the deadline's cancel from reaching another caller's statement.
+    """
+    with conn.cursor(row_factory=row_factory) as cursor:
+        with retry_policy.deadline(conn, timeout), conn.pipeline(), conn.transaction():
+            conn.execute(f"SET LOCAL search_path TO {_search_path()}")
+            cursor.execute(normalized_query, params, prepare=prepare)
+        return cursor.fetchall() if fetch else cursor.rowcount
+
+
+def _replica_for_read():
+    """The replica pool when a read_only read may use it right now, else None (read the primary)."""
+    if _tx_conn.get() is not None:
+        return None
+    pool = get_replica_pool()
+    if pool is None:
+        return None
+    if replica.lag_check_due():
+        _check_replica_lag(pool)
+    return pool if replica.choose_replica() else None
+
+
+def _check_replica_lag(pool):
+    try:
+        with pool.connection() as conn, retry_policy.deadline(conn, _REPLICA_CONNECT_TIMEOUT):
+            row = conn.execute(replica.LAG_QUERY).fetchone()
+        request_cache.record_round_trip(1)
+        replica.record_lag(row["lag_seconds"])
+    except Exception as e:
+        _debug_log(f"replica lag check failed ({e.__class__.__name__}); reading from primary")
+        replica.mark_unhealthy()
+
+
+def _replica_failed(e: Exception) -> bool:
+    """True when a replica read failed for connection reasons and should fall back to the primary."""
+    if retry_policy.classify(e) != retry_policy.CONNECTION and not isinstance(e, PoolTimeout):
+        return False
+    _debug_log(f"replica read failed ({e.__class__.__name__}); falling back to primary")
+    replica.mark_unhealthy()
+    return True
+
+
+def _execute_on_replica(pool, query, params, row_type, timeout):
+    normalized_query, prepare = statement_cache.lookup(query, _statement_scope())
+    row_factory = record_row(row_type) if row_type is not None else None
+    with pool.connection() as conn:
+        started = time.perf_counter() if query_stats.ENABLED else None
+        result = _execute_scoped(
+            conn,
+            normalized_query,
+            params if params is not None else (),
+            prepare and _replica_prepare,
+            True,
+            row_factory,
+            timeout,
+        )
+    request_cache.record_round_trip(1)
+    if started is not None:
+        query_stats.record(query, time.perf_counter() - started, len(result))
+    return result
+
+
+def execute_batch(statements, read_only=False):
+    """
+    Run independent statements in one pipeline flush (one network round trip)
+    and return their results in order: rows for statements that return rows,
+    rowcount for the rest. statements is a list of (query, params) or
+    (query, params, row_type).
+
+    Inside transaction() the batch joins the transaction; otherwise it runs in
+    a transaction of its own on a pooled connection (with the school's
+    search_path set LOCAL to it), committed in the same flush. The first
+    failing statement is raised and the whole batch is rolled back.
+    read_only=True lets an all-SELECT batch run on the read replica.
+    """
+    if not statements:
+        return []
+    if tracing.has_active_trace():
+        with tracing.span("db.batch", statements=len(statements)):
+            return _execute_batch(statements, read_only)
+    return _execute_batch(statements, read_only)
+
 
-    for attempt in range(2):
-        conn = get_db_connection()
-        with conn.cursor() as cursor:
+def _execute_batch(statements, read_only=False):
+    global _reconnect_count
+    has_writes = not all(statement[0].lstrip().upper().startswith("SELECT") for statement in statements)
+    try:
+        replica_pool = _replica_for_read() if read_only and not has_writes else None
+        if replica_pool is not None:
             try:
-                cursor.execute("SET search_path TO phone2026,public")
-                cursor.execute(normalized_query, effective_params)
-                if fetch:
-                    return cursor.fetchall()
-                return cursor.rowcount
-            except (OperationalError, InterfaceError):
-                if attempt == 0:
+                with replica_pool.connection() as conn:
+                    return _run_pipeline(conn, statements, own_transaction=True)
+            except Exception as e:
+                if not _replica_failed(e):
+                    raise
+
+        tx_conn = _tx_conn.get()
+        if tx_conn is not None:
+            return _run_pipeline(tx_conn, statements, own_transaction=False)
+
+        expires = retry_policy.call_expiry()
+        attempt = 0
+        while True:
+            try:
+                with get_pool().connection(timeout=retry_policy.pool_wait_seconds(expires)) as conn:
+                    result = _run_pipeline(
+                        conn, statements, own_transaction=True, timeout=retry_policy.remaining_seconds(expires)
+                    )
+                retry_policy.record_success(attempt)
+                return result
+            except Exception as e:
+                # The whole batch goes out in one flush, so any write in it may have been sent.
+                kind = retry_policy.classify(e)
+                if not retry_policy.should_retry(kind, attempt, write_sent=has_writes, expires=expires):
+                    raise
+                attempt += 1
+                if kind == retry_policy.CONNECTION:
                     _reconnect_count += 1
-                    _debug_log(f"query failed, reconnect attempt #{_reconnect_count}")
-                    _invalidate_cached_connection()
-                    continue
-                raise
+                _debug_log(f"batch {kind} error ({e.__class__.__name__}), retry #{attempt}")
+                time.sleep(retry_policy.backoff_seconds(attempt, expires))
+    finally:
+        if has_writes:
+            request_cache.invalidate()
+            replica.mark_write()
+
+
+def _run_pipeline(conn, statements, own_transaction, timeout=None):
+    started = time.perf_counter()
+    cursors = []
+    scope = _statement_scope()
+    with retry_policy.deadline(conn, timeout), conn.pipeline(), ExitStack() as stack:
+        if own_transaction:
+            # Outside transaction(): BEGIN/SET LOCAL/COMMIT ride in the same flush.
+            stack.enter_context(conn.transaction())
+            conn.execute(f"SET LOCAL search_path TO {_search_path()}")
+        for query, params, *row_type in statements:
+            normalized_query, prepare = statement_cache.lookup(query, scope)
+            cursor = conn.cursor(row_factory=record_row(row_type[0]) if row_type else None)
+            cursor.execute(normalized_query, params if params is not None else (), prepare=prepare)
+            cursors.append(cursor)
+    request_cache.record_round_trip(1)
+
+    results = []
+    for cursor in cursors:
+        with cursor:
+            results.append(cursor.fetchall() if cursor.description is not None else cursor.rowcount)
+
+    if query_stats.ENABLED:
+        # Statements share one flush; attribute the elapsed time evenly.
+        share = (time.perf_counter() - started) / len(statements)
+        for statement, result in zip(statements, results):
+            query_stats.record(statement[0], share, len(result) if isinstance(result, list) else result)
+    return results
 
 
 def get_db_debug_snapshot():
@@ -258,20 +558,117 @@ def get_db_debug_snapshot():
         "db_debug": _DB_DEBUG,
         "connect_count": _connect_count,
         "reconnect_count": _reconnect_count,
+        "transaction_retries": _tx_retry_count,
+        "pool": _pool.get_stats() if _pool is not None else None,
+        "request_round_trips": request_cache.get_round_trip_count(),
+        "query_stats": query_stats.ENABLED,
+        "slow_query_ms": query_stats.SLOW_QUERY_MS,
+        "statement_cache": statement_cache.get_statement_cache_stats(),
+        "retry": retry_policy.get_retry_stats(),
+        "replica": (
+            {**replica.get_replica_stats(), "pool": _replica_pool.get_stats()} if _replica_pool is not None else None
+        ),
     }
 
 
-def execute_query(query, params=None):
-    return _execute_with_reconnect(query, params=params, fetch=True)
+def stream_query(query, params=None, row_type=None, fetch_size: int = None, read_only=False):
+    """
+    Iterate over the rows of a large read through a named server-side cursor,
+    fetching fetch_size rows (DB_STREAM_FETCH_SIZE, default 2000) per round
+    trip, so memory stays flat however many rows the query returns.
+
+    Server-side cursors live inside a transaction: outside transaction() the
+    iterator holds a pooled connection in a read-only transaction until it is
+    exhausted or closed. Consume it fully, or wrap it in contextlib.closing()
+    when stopping early. read_only=True lets it run on the read replica.
+    """
+    fetch_size = fetch_size or _STREAM_FETCH_SIZE
+    tx_conn = _tx_conn.get()
+    if tx_conn is not None:
+        yield from _stream_rows(tx_conn, query, params, row_type, fetch_size)
+        return
+
+    with ExitStack() as stack:
+        conn = _stream_connection(stack, read_only)
+        with conn.transaction():
+            conn.execute("SET TRANSACTION READ ONLY")
+            conn.execute(f"SET LOCAL search_path TO {_search_path()}")
+            request_cache.record_round_trip(2)
+            yield from _stream_rows(conn, query, params, row_type, fetch_size)
+
+
+def _stream_connection(stack, read_only):
+    pool = _replica_for_read() if read_only else None
+    if pool is not None:
+        try:
+            return stack.enter_context(pool.connection())
+        except Exception as e:
+            if not _replica_failed(e):
+                raise
+    return stack.enter_context(get_pool().connection())
+
+
+def _stream_rows(conn, query, params, row_type, fetch_size):
+    name = f"phone2026_stream_{next(_stream_counter)}"
+    row_factory = record_row(row_type) if row_type is not None else None
+    normalized_query, _ = statement_cache.lookup(query, _statement_scope())
+    db_seconds = 0.0
+    row_count = 0
+    with conn.cursor(name=name, row_factory=row_factory) as cursor:
+        started = time.perf_counter()
+        cursor.execute(normalized_query, params if params is not None else ())
+        db_seconds += time.perf_counter() - started
+        while True:
+            started = time.perf_counter()
+            rows = cursor.fetchmany(fetch_size)
+            db_seconds += time.perf_counter() - started
+            request_cache.record_round_trip(1)
+            if not rows:
+                break
+            row_count += len(rows)
+            yield from rows
+    if query_stats.ENABLED:
+        # Only time spent waiting on the server; the caller's per-row work is excluded.
+        query_stats.record(query, db_seconds, row_count)
+
+
+def execute_query(query, params=None, row_type=None, timeout=None, read_only=False):
+    # row_type: a database.records type (Student, Application, Row) instead of dict rows.
+    # timeout: client-side deadline in seconds (default DB_QUERY_TIMEOUT_SECONDS).
+    # read_only: may be served by the read replica (lag/stickiness rules in database/replica.py).
+    if read_only:
+        pool = _replica_for_read()
+        if pool is not None:
+            try:
+                if tracing.has_active_trace():
+                    with tracing.span("db.query", statement=query_stats.fingerprint(query), replica=True):
+                        return _execute_on_replica(pool, query, params, row_type, timeout)
+                return _execute_on_replica(pool, query, params, row_type, timeout)
+            except Exception as e:
+                if not _replica_failed(e):
+                    raise
+    return _execute_with_reconnect(query, params=params, fetch=True, row_type=row_type, timeout=timeout)
+
+
+def _execute_write(query, params, returning, row_type=None, timeout=None):
+    try:
+        return _execute_with_reconnect(
+            query, params=params, fetch=returning, row_type=row_type, timeout=timeout, write=True
+        )
+    finally:
+        # Read-your-writes within the current request (and on the replica, see database/replica.py).
+        request_cache.invalidate()
+        replica.mark_write()
 
 
-def execute_insert(query, params):
-    return _execute_with_reconnect(query, params=params, fetch=False)
+def execute_insert(query, params, returning=False, row_type=None, timeout=None):
+    # returning=True: fetch rows from an INSERT ... RETURNING instead of the rowcount.
+    return _execute_write(query, params, returning, row_type, timeout)
 
 
-def execute_update(query, params):
-    return _execute_with_reconnect(query, params=params, fetch=False)
+def execute_update(query, params, returning=False, row_type=None, timeout=None):
+    return _execute_write(query, params, returning, row_type, timeout)
 
 
-def execute_delete(query, params):
-    return _execute_with_reconnect(query, params=params, fetch=False)
+def execute_delete(query, params, returning=False, row_type=None, timeout=None):
+    return _execute_write(query, params, returning, row_type, timeout)
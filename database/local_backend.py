@@ -0,0 +1,147 @@
+"""
+Embedded local Postgres for development, CI and offline benchmarks.
+
+With DB_BACKEND=local, db_manager (and async_db_manager) connect to a
+Postgres server running from a data directory on this machine
+(DB_LOCAL_DIR, default .local_pg) over a Unix socket instead of
+SUPABASE_DB_URL. The execute_* API, migrations and services are unchanged:
+the server is created on first use and init_database() migrates it as usual, so
+
+    DB_BACKEND=local python -m benchmarks.pipeline_batch
+
+runs with no network. The server comes from the optional pgserver package
+(pip install -r requirements-dev.txt), or from initdb/pg_ctl on PATH when
+pgserver is not installed. It is stopped when the process exits unless
+DB_LOCAL_KEEP_RUNNING=1, which skips the ~1s startup on the next run.
+The initdb/pg_ctl server runs with fsync and synchronous_commit off: the data
+is scratch.
+
+A SQLite backend is deliberately not offered. The queries rely on Postgres
+behaviour that SQLite does not have or spells differently: schemas and
+search_path per school, FILTER aggregates, = ANY(array) parameters,
+timestamptz/interval arithmetic, advisory locks, pipeline mode, named
+server-side cursors, statement_timeout and cancellation. Supporting it would
+mean a second SQL dialect for every query, and tests would pass on SQL that
+production never runs.
+
+    python -m database.local_backend          # start (if needed) and print the URL
+    python -m database.local_backend --stop   # stop a server left running
+"""
+import atexit
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import threading
+from pathlib import Path
+from urllib.parse import quote
+
+logger = logging.getLogger(__name__)
+
+LOCAL_DB_DIR = os.getenv("DB_LOCAL_DIR", ".local_pg")
+# Set once the server is up, so child processes (multiprocessing spawn) connect
+# to it instead of each starting pgserver on the same data directory.
+_URL_ENV = "DB_LOCAL_URL"
+KEEP_RUNNING = os.getenv("DB_LOCAL_KEEP_RUNNING", "").lower() in {"1", "true", "yes", "on"}
+_SERVER_OPTIONS = "-c fsync=off -c synchronous_commit=off -c full_page_writes=off"
+
+_lock = threading.Lock()
+_url = None
+_server = None
+
+
+def get_local_database_url() -> str:
+    """Start the local server once per process and return its connection URL."""
+    global _url
+    with _lock:
+        if _url is None:
+            _url = os.getenv(_URL_ENV)
+        if _url is None:
+            _url = _start(Path(LOCAL_DB_DIR).resolve())
+            os.environ[_URL_ENV] = _url
+            logger.info("[local-db] using %s", _url)
+    return _url
+
+
+def _start(data_dir: Path) -> str:
+    global _server
+    try:
+        import pgserver
+    except ImportError:
+        pgserver = None
+
+    if pgserver is not None:
+        _server = pgserver.get_server(data_dir, cleanup_mode=None if KEEP_RUNNING else "stop")
+        return _server.get_uri()
+    if shutil.which("initdb") and shutil.which("pg_ctl"):
+        return _start_with_pg_ctl(data_dir)
+    raise RuntimeError(
+        "DB_BACKEND=local needs the pgserver package (pip install -r requirements-dev.txt) "
+        "or the Postgres server binaries (initdb, pg_ctl) on PATH."
+    )
+
+
+def _start_with_pg_ctl(data_dir: Path) -> str:
+    # Unix socket paths are limited to ~100 bytes; keep DB_LOCAL_DIR short.
+    socket_dir = data_dir / "run"
+    if not (data_dir / "PG_VERSION").exists():
+        data_dir.mkdir(parents=True, exist_ok=True)
+        subprocess.run(
+            ["initdb", "-D", str(data_dir), "-U", "postgres", "--auth=trust", "--encoding=UTF8", "--no-locale"],
+            check=True,
+            capture_output=True,
+        )
+    socket_dir.mkdir(exist_ok=True)
+
+    running = subprocess.run(["pg_ctl", "-D", str(data_dir), "status"], capture_output=True).returncode == 0
+    if not running:
+        subprocess.run(
+            [
+                "pg_ctl", "-D", str(data_dir), "-w", "-l", str(data_dir / "server.log"),
+                "-o", f"-k {socket_dir} -c listen_addresses='' {_SERVER_OPTIONS}",
+                "start",
+            ],
+            check=True,
+            capture_output=True,
+        )
+        if not KEEP_RUNNING:
+            atexit.register(stop_local_database)
+    return f"postgresql://postgres@/postgres?host={quote(str(socket_dir), safe='/')}"
+
+
+def stop_local_database():
+    global _url, _server
+    data_dir = Path(LOCAL_DB_DIR).resolve()
+    with _lock:
+        if _server is None and (data_dir / "postmaster.pid").exists():
+            try:
+                import pgserver
+
+                _server = pgserver.get_server(data_dir, cleanup_mode="stop")
+            except ImportError:
+                if shutil.which("pg_ctl"):
+                    subprocess.run(["pg_ctl", "-D", str(data_dir), "-m", "fast", "stop"], capture_output=True)
+        if _server is not None:
+            _server.cleanup()
+            _server = None
+        _url = None
+        os.environ.pop(_URL_ENV, None)
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if "--stop" in argv:
+        stop_local_database()
+        print("stopped")
+        return 0
+
+    global KEEP_RUNNING
+    # Started from the command line for other processes to use: leave it running.
+    KEEP_RUNNING = True
+    print(get_local_database_url())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
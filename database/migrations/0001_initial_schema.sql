@@ -1,62 +1,60 @@
--- 학생 테이블
+-- Baseline schema (formerly the DDL block in init_database()).
+-- Objects are unqualified; the migrator sets search_path to the target schema.
+
 CREATE TABLE IF NOT EXISTS students (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    id BIGSERIAL PRIMARY KEY,
     student_id TEXT UNIQUE NOT NULL,
     name TEXT NOT NULL,
     grade INTEGER NOT NULL,
     class_num INTEGER NOT NULL,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
 );
 
--- 신청서 테이블
 CREATE TABLE IF NOT EXISTS applications (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    id BIGSERIAL PRIMARY KEY,
     student_id TEXT NOT NULL,
     application_type TEXT NOT NULL,
     reason TEXT NOT NULL,
     extra_info TEXT,
-    status TEXT DEFAULT 'pending',
+    status TEXT NOT NULL DEFAULT 'pending',
     approval_number TEXT,
-    submitted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    approved_at TIMESTAMP,
+    submitted_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    approved_at TIMESTAMPTZ,
     approved_by TEXT,
     rejection_reason TEXT,
-    FOREIGN KEY (student_id) REFERENCES students(student_id),
-    UNIQUE(student_id, application_type)
+    CONSTRAINT applications_student_fk
+        FOREIGN KEY (student_id) REFERENCES students(student_id),
+    CONSTRAINT applications_unique_student_type UNIQUE (student_id, application_type)
 );
 
--- 설정 테이블
 CREATE TABLE IF NOT EXISTS settings (
     key TEXT PRIMARY KEY,
     value TEXT NOT NULL,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
 );
 
--- 문서 테이블
 CREATE TABLE IF NOT EXISTS documents (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    id BIGSERIAL PRIMARY KEY,
     title TEXT NOT NULL,
     file_name TEXT NOT NULL,
     file_path TEXT NOT NULL,
     file_type TEXT NOT NULL,
-    uploaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    uploaded_at TIMESTAMPTZ NOT NULL DEFAULT now()
 );
 
--- 활동 로그 테이블
 CREATE TABLE IF NOT EXISTS activity_logs (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    id BIGSERIAL PRIMARY KEY,
     user_type TEXT NOT NULL,
     user_id TEXT,
     action TEXT NOT NULL,
     target_type TEXT,
-    target_id INTEGER,
+    target_id BIGINT,
     details TEXT,
     ip_address TEXT,
-    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    timestamp TIMESTAMPTZ NOT NULL DEFAULT now()
 );
 
--- 인덱스
 CREATE INDEX IF NOT EXISTS idx_student_id ON applications(student_id);
 CREATE INDEX IF NOT EXISTS idx_status ON applications(status);
 CREATE INDEX IF NOT EXISTS idx_application_type ON applications(application_type);
@@ -0,0 +1,22 @@
+from config.tenants import current_tenant
+
+
+def upgrade(cursor):
+    # run_migrations applies each schema inside its own school's tenant_scope.
+    school_year = current_tenant().school_year
+    cursor.execute(
+        """
+        INSERT INTO settings (key, value) VALUES
+            ('phone_approval_mode', 'manual'),
+            ('tablet_approval_mode', 'manual'),
+            ('gate_approval_mode', 'manual'),
+            ('phone_approval_delay_minutes', '10'),
+            ('tablet_approval_delay_minutes', '10'),
+            ('gate_approval_delay_minutes', '10'),
+            ('principal_stamp_path', ''),
+            ('academic_year', %s),
+            ('academic_year_start', %s)
+        ON CONFLICT (key) DO NOTHING
+        """,
+        (str(school_year), f"{school_year}-03-01"),
+    )
@@ -0,0 +1,16 @@
+-- Composite/partial indexes matching the hot query shapes
+-- (see docs/phone2026_index_plan.sql for the per-query mapping).
+
+CREATE INDEX IF NOT EXISTS idx_applications_pending_type_submitted
+    ON applications(application_type, submitted_at)
+    WHERE status = 'pending';
+
+CREATE INDEX IF NOT EXISTS idx_applications_student_submitted
+    ON applications(student_id, submitted_at DESC);
+
+CREATE INDEX IF NOT EXISTS idx_applications_type_approved_at
+    ON applications(application_type, approved_at)
+    WHERE status IN ('approved', 'auto_approved');
+
+CREATE INDEX IF NOT EXISTS idx_students_login
+    ON students(student_id, name);
@@ -0,0 +1,5 @@
+-- Keyset pagination order for the admin pending queue: (submitted_at, id).
+
+CREATE INDEX IF NOT EXISTS idx_applications_pending_queue
+    ON applications(submitted_at, id)
+    WHERE status = 'pending';
@@ -0,0 +1,25 @@
+-- Optimistic concurrency for application state transitions, and a per-type/year
+-- approval number counter so numbers are allocated atomically with the transition.
+
+ALTER TABLE applications ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1;
+
+CREATE TABLE IF NOT EXISTS approval_counters (
+    application_type TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    last_seq INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (application_type, year)
+);
+
+-- Continue from numbers already issued (count-based numbering could reuse
+-- numbers after deletions, so take the larger of count and max suffix).
+INSERT INTO approval_counters (application_type, year, last_seq)
+SELECT application_type,
+       EXTRACT(YEAR FROM approved_at)::int,
+       GREATEST(
+           COUNT(*),
+           COALESCE(MAX(substring(approval_number FROM '-([0-9]+)$')::int), 0)
+       )
+FROM applications
+WHERE status IN ('approved', 'auto_approved') AND approved_at IS NOT NULL
+GROUP BY 1, 2
+ON CONFLICT (application_type, year) DO NOTHING;
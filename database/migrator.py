@@ -0,0 +1,179 @@
+"""
+Versioned schema migrations for each school's schema (config/tenants.py;
+phone2026 when only one school is configured).
+
+Migration files live in database/migrations/ and are applied in version order:
+
+    0001_initial_schema.sql     plain SQL, run as-is
+    0002_default_settings.py    Python module exposing upgrade(cursor)
+
+Applied versions are recorded in <schema>.schema_migrations. Startup only
+runs the single "already current" query; the advisory lock (one per schema)
+and DDL are taken only when a migration is actually pending, so one replica
+migrates while the others wait and then see the schema as current.
+
+A run is a single transaction holding a transaction-level advisory lock with
+SET LOCAL settings, so it is safe through the transaction-mode pooler and all
+pending migrations of a run commit or roll back together. Python migrations
+run inside tenant_scope() for the schema's school (e.g. its school_year).
+
+    python -m database.migrator                    # apply pending migrations for every school
+    python -m database.migrator --tenant hanbit    # one school only
+    python -m database.migrator --status           # show applied/pending versions
+"""
+import importlib.util
+import logging
+import re
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+from psycopg import errors
+
+from config.tenants import current_tenant, get_tenant, get_tenants, tenant_scope
+from database.db_manager import _create_db_connection, get_db_connection
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent / "migrations"
+_MIGRATION_FILE_RE = re.compile(r"^(\d{4})_([a-z0-9_]+)\.(sql|py)$")
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    path: Path
+
+    def apply(self, cursor):
+        if self.path.suffix == ".sql":
+            cursor.execute(self.path.read_text(encoding="utf-8"))
+            return
+
+        spec = importlib.util.spec_from_file_location(f"_migration_{self.version:04d}", self.path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        module.upgrade(cursor)
+
+
+def discover_migrations() -> list[Migration]:
+    migrations = []
+    seen_versions = set()
+    for path in sorted(MIGRATIONS_DIR.iterdir()):
+        match = _MIGRATION_FILE_RE.match(path.name)
+        if not match:
+            continue
+        version = int(match.group(1))
+        if version in seen_versions:
+            raise RuntimeError(f"Duplicate migration version {version:04d} in {MIGRATIONS_DIR}")
+        seen_versions.add(version)
+        migrations.append(Migration(version=version, name=match.group(2), path=path))
+    return migrations
+
+
+def _tenant_for_schema(schema: str):
+    """The school that owns schema, so data migrations can read its tenant config."""
+    for tenant in get_tenants():
+        if tenant.schema == schema:
+            return tenant
+    return current_tenant()
+
+
+def _migration_lock_key(schema: str) -> str:
+    return f"{schema}.schema_migrations"
+
+
+def get_current_version(conn=None, schema: str = None) -> int:
+    conn = conn or get_db_connection()
+    schema = schema or current_tenant().schema
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(f"SELECT COALESCE(MAX(version), 0) AS version FROM {schema}.schema_migrations")
+            return cursor.fetchone()["version"]
+    except (errors.UndefinedTable, errors.InvalidSchemaName):
+        return 0
+
+
+def run_migrations(schema: str = None) -> list[str]:
+    """Apply pending migrations to schema (default: the current school's); returns the names applied."""
+    schema = schema or current_tenant().schema
+    migrations = discover_migrations()
+    if not migrations:
+        return []
+
+    # Fast path: one query on the shared connection when already current.
+    if get_current_version(schema=schema) >= migrations[-1].version:
+        return []
+
+    applied = []
+    conn = _create_db_connection()
+    try:
+        # One transaction per run: the lock, statement_timeout and search_path are all
+        # transaction-scoped, so they hold on the same backend for every statement even
+        # behind a transaction-mode pooler (Supabase :6543), and the lock is released
+        # by COMMIT/ROLLBACK instead of a separate unlock that could land elsewhere.
+        with tenant_scope(_tenant_for_schema(schema)), conn.transaction(), conn.cursor() as cursor:
+            # Lock waits and index builds may legitimately outlast DB_STATEMENT_TIMEOUT_MS.
+            cursor.execute("SET LOCAL statement_timeout = 0")
+            cursor.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", (_migration_lock_key(schema),))
+            cursor.execute(f"CREATE SCHEMA IF NOT EXISTS {schema}")
+            cursor.execute(f"SET LOCAL search_path TO {schema},public")
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS schema_migrations (
+                    version INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    applied_at TIMESTAMPTZ NOT NULL DEFAULT now()
+                )
+                """
+            )
+            # Re-read under the lock: another replica may have migrated meanwhile.
+            cursor.execute("SELECT version FROM schema_migrations")
+            done = {row["version"] for row in cursor.fetchall()}
+
+            for migration in migrations:
+                if migration.version in done:
+                    continue
+                migration.apply(cursor)
+                cursor.execute(
+                    "INSERT INTO schema_migrations (version, name) VALUES (%s, %s)",
+                    (migration.version, migration.name),
+                )
+                applied.append(f"{migration.version:04d}_{migration.name}")
+    finally:
+        conn.close()
+    for name in applied:
+        logger.info("applied migration %s to %s", name, schema)
+    return applied
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    tenants = get_tenants()
+    if "--tenant" in argv:
+        index = argv.index("--tenant") + 1
+        tenant = get_tenant(argv[index]) if index < len(argv) else None
+        if tenant is None:
+            print("unknown tenant; choose one of: " + ", ".join(t.slug for t in get_tenants()))
+            return 2
+        tenants = [tenant]
+
+    for tenant in tenants:
+        if "--status" in argv:
+            current = get_current_version(schema=tenant.schema)
+            for migration in discover_migrations():
+                state = "applied" if migration.version <= current else "pending"
+                print(f"[{tenant.schema}] {migration.version:04d}_{migration.name}: {state}")
+            continue
+
+        applied = run_migrations(tenant.schema)
+        if applied:
+            for name in applied:
+                print(f"[{tenant.schema}] applied {name}")
+        else:
+            print(f"[{tenant.schema}] schema is up to date")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""
+Per-query timing for db_manager.
+
+When enabled (DB_QUERY_STATS=1, or set_query_stats_enabled(True) from the
+admin page), every statement run through _execute_with_reconnect is timed and
+recorded under its fingerprint: the SQL with literals/placeholders replaced by
+`?` and whitespace collapsed. Each fingerprint keeps a log-bucketed latency
+histogram (p50/p95/p99), call count, total time and row count. Statements
+slower than DB_SLOW_QUERY_MS (default 500) also go to a bounded slow-query log.
+
+When disabled, the only cost in the query path is reading ENABLED.
+"""
+import logging
+import os
+import re
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
+ENABLED = os.getenv("DB_QUERY_STATS", "").lower() in {"1", "true", "yes", "on"}
+SLOW_QUERY_MS = float(os.getenv("DB_SLOW_QUERY_MS", "500"))
+SLOW_LOG_SIZE = 100
+
+# Bucket upper bounds: 0.05ms growing by 25% per bucket (~0.05ms .. ~100s).
+_BUCKET_BOUNDS_MS = [0.05 * (1.25 ** i) for i in range(66)]
+
+_STRING_LITERAL_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"(?<![\w.])\d+(?:\.\d+)?\b")
+_PLACEHOLDER_RE = re.compile(r"%s|\?")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+_lock = threading.Lock()
+_stats = {}
+_slow_log = deque(maxlen=SLOW_LOG_SIZE)
+
+
+def set_query_stats_enabled(enabled: bool):
+    global ENABLED
+    ENABLED = bool(enabled)
+
+
+@lru_cache(maxsize=1024)
+def fingerprint(query: str) -> str:
+    text = _STRING_LITERAL_RE.sub("?", query)
+    text = _NUMBER_RE.sub("?", text)
+    text = _PLACEHOLDER_RE.sub("?", text)
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+
+class _QueryHistogram:
+    __slots__ = ("calls", "total_ms", "max_ms", "rows", "buckets")
+
+    def __init__(self):
+        self.calls = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows = 0
+        self.buckets = [0] * (len(_BUCKET_BOUNDS_MS) + 1)
+
+    def add(self, elapsed_ms: float, rows: int):
+        self.calls += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.rows += max(rows, 0)
+        self.buckets[_bucket_index(elapsed_ms)] += 1
+
+    def percentile(self, pct: float) -> float:
+        target = self.calls * pct / 100.0
+        seen = 0
+        for idx, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= target:
+                if idx < len(_BUCKET_BOUNDS_MS):
+                    return min(_BUCKET_BOUNDS_MS[idx], self.max_ms)
+                return self.max_ms
+        return self.max_ms
+
+
+def _bucket_index(elapsed_ms: float) -> int:
+    lo, hi = 0, len(_BUCKET_BOUNDS_MS)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if _BUCKET_BOUNDS_MS[mid] < elapsed_ms:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def record(query: str, elapsed_seconds: float, rows: int):
+    elapsed_ms = elapsed_seconds * 1000.0
+    key = fingerprint(query)
+    with _lock:
+        hist = _stats.get(key)
+        if hist is None:
+            hist = _stats[key] = _QueryHistogram()
+        hist.add(elapsed_ms, rows)
+        if elapsed_ms >= SLOW_QUERY_MS:
+            _slow_log.append(
+                {"fingerprint": key, "ms": round(elapsed_ms, 2), "rows": rows, "at": time.time()}
+            )
+    if elapsed_ms >= SLOW_QUERY_MS:
+        logger.warning("[slow-query] %.1fms rows=%s %s", elapsed_ms, rows, key)
+
+
+def get_query_stats(top: int = 20, order_by: str = "total_ms") -> list[dict]:
+    with _lock:
+        items = [
+            {
+                "fingerprint": key,
+                "calls": hist.calls,
+                "total_ms": round(hist.total_ms, 2),
+                "avg_ms": round(hist.total_ms / hist.calls, 3) if hist.calls else 0.0,
+                "p50_ms": round(hist.percentile(50), 3),
+                "p95_ms": round(hist.percentile(95), 3),
+                "p99_ms": round(hist.percentile(99), 3),
+                "max_ms": round(hist.max_ms, 3),
+                "rows": hist.rows,
+            }
+            for key, hist in _stats.items()
+        ]
+    items.sort(key=lambda item: item[order_by], reverse=True)
+    return items[:top]
+
+
+def get_slow_queries() -> list[dict]:
+    with _lock:
+        return list(reversed(_slow_log))
+
+
+def reset_query_stats():
+    with _lock:
+        _stats.clear()
+        _slow_log.clear()
@@ -0,0 +1,170 @@
+"""
+Compact read-only row records.
+
+psycopg's dict_row builds a full dict per row, and the services used to copy
+each of those again with dict(row). A Record stores the values in __slots__
+(no per-row dict, no per-row key storage) and still behaves as a read-only
+Mapping, so row["name"], row.get(...), dict(row), "key" in row and
+pd.DataFrame(rows) keep working. Attribute access (row.name) works too.
+
+    execute_query("SELECT * FROM students", row_type=Student)
+
+The row factory derives (and caches) a subclass per distinct column list, so
+joined queries such as `SELECT a.*, s.grade, ...` get an Application subclass
+with the extra slots. Column lists that cannot be slots (duplicates, names
+that are not identifiers or clash with Mapping methods) fall back to dicts.
+"""
+import keyword
+import threading
+from collections.abc import Mapping
+
+# Column order of `SELECT *` on each table (see database/migrations).
+STUDENT_COLUMNS = ("id", "student_id", "name", "grade", "class_num", "created_at", "updated_at")
+APPLICATION_COLUMNS = (
+    "id",
+    "student_id",
+    "application_type",
+    "reason",
+    "extra_info",
+    "status",
+    "approval_number",
+    "submitted_at",
+    "approved_at",
+    "approved_by",
+    "rejection_reason",
+    "version",
+)
+
+
+class Record(Mapping):
+    __slots__ = ()
+    _fields = ()
+    _field_set = frozenset()
+    _variants = None
+    _variants_lock = threading.Lock()
+
+    def __init__(self, *values):
+        for name, value in zip(self._fields, values):
+            object.__setattr__(self, name, value)
+
+    @classmethod
+    def _make(cls, values):
+        record = cls.__new__(cls)
+        for name, value in zip(cls._fields, values):
+            object.__setattr__(record, name, value)
+        return record
+
+    @classmethod
+    def for_columns(cls, names: tuple):
+        """Record class for this column list, or None when the names cannot be slots."""
+        if names == cls._fields:
+            return cls
+        variants = cls.__dict__.get("_variants")
+        if variants is None:
+            with cls._variants_lock:
+                variants = cls.__dict__.get("_variants")
+                if variants is None:
+                    variants = {}
+                    cls._variants = variants
+        if names not in variants:
+            variants[names] = _derive(cls, names)
+        return variants[names]
+
+    def __getitem__(self, key):
+        if key in self._field_set:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self._fields)
+
+    def __len__(self):
+        return len(self._fields)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __reduce__(self):
+        return _rebuild, (_base_of(type(self)), self._fields, tuple(getattr(self, name) for name in self._fields))
+
+    def __repr__(self):
+        body = ", ".join(f"{name}={getattr(self, name)!r}" for name in self._fields)
+        return f"{type(self).__name__}({body})"
+
+
+def _valid_field(name: str) -> bool:
+    return name.isidentifier() and not keyword.iskeyword(name) and not name.startswith("_") and not hasattr(Record, name)
+
+
+def _derive(base, names: tuple):
+    if len(set(names)) != len(names) or not all(_valid_field(name) for name in names):
+        return None
+    existing = set()
+    for klass in base.__mro__:
+        existing.update(klass.__dict__.get("__slots__", ()))
+    return type(
+        base.__name__,
+        (base,),
+        {
+            "__slots__": tuple(name for name in names if name not in existing),
+            "_fields": names,
+            "_field_set": frozenset(names),
+            "_variants": None,
+            "__module__": base.__module__,
+            "__qualname__": base.__qualname__,
+        },
+    )
+
+
+def _base_of(cls):
+    # Derived variants share their declared base's name; pickle the base instead.
+    for klass in cls.__mro__:
+        if klass.__dict__.get("_declared"):
+            return klass
+    return Row
+
+
+def _rebuild(base, names, values):
+    cls = base.for_columns(names)
+    return cls._make(values) if cls is not None else dict(zip(names, values))
+
+
+def record_type(name: str, fields: tuple = ()):
+    """Declare a Record subclass with fixed slots for its usual columns."""
+    return type(
+        name,
+        (Record,),
+        {
+            "__slots__": fields,
+            "_fields": fields,
+            "_field_set": frozenset(fields),
+            "_variants": None,
+            "_declared": True,
+            "__module__": __name__,
+        },
+    )
+
+
+Row = record_type("Row")
+Student = record_type("Student", STUDENT_COLUMNS)
+Application = record_type("Application", APPLICATION_COLUMNS)
+
+
+def record_row(record_cls=Row):
+    """psycopg row factory building record_cls rows (dicts when the columns cannot be slots)."""
+
+    def factory(cursor):
+        description = cursor.description
+        if description is None:
+            return _no_result
+        names = tuple(column.name for column in description)
+        cls = record_cls.for_columns(names)
+        if cls is None:
+            return lambda values: dict(zip(names, values))
+        return cls._make
+
+    return factory
+
+
+def _no_result(values):
+    raise TypeError("the statement returned no result to fetch")
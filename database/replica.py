@@ -0,0 +1,154 @@
+"""
+Read-replica routing policy for db_manager.
+
+When SUPABASE_REPLICA_DB_URL (or REPLICA_DATABASE_URL) is set, callers can
+mark reads with read_only=True and db_manager sends them to a replica pool
+unless one of these says the primary is safer:
+
+- stickiness: the current session (Streamlit session_state, or the thread
+  outside Streamlit) wrote within DB_REPLICA_STICKY_SECONDS (default 5), so
+  it must read its own writes. Any write in this process within the same
+  window also pins reads to the primary, because process-wide caches
+  (shared_cache) filled from a stale replica would serve other sessions.
+- lag: the replica's replay lag, checked at most every
+  DB_REPLICA_LAG_CHECK_SECONDS (default 5), exceeds DB_REPLICA_MAX_LAG_SECONDS
+  (default 5).
+- health: the replica failed recently; it is skipped for
+  DB_REPLICA_RETRY_SECONDS (default 30).
+
+Only the routing decision and counters live here; db_manager owns the pool.
+"""
+import os
+import threading
+import time
+
+try:
+    import streamlit as st
+except Exception:  # pragma: no cover - non-Streamlit runtime fallback
+    st = None
+
+STICKY_SECONDS = float(os.getenv("DB_REPLICA_STICKY_SECONDS", "5"))
+MAX_LAG_SECONDS = float(os.getenv("DB_REPLICA_MAX_LAG_SECONDS", "5"))
+LAG_CHECK_SECONDS = float(os.getenv("DB_REPLICA_LAG_CHECK_SECONDS", "5"))
+RETRY_SECONDS = float(os.getenv("DB_REPLICA_RETRY_SECONDS", "30"))
+
+# Caught up with everything received means no lag even if the primary has been idle
+# (pg_last_xact_replay_timestamp() alone would then look old).
+LAG_QUERY = """
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() THEN 0
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+END AS lag_seconds
+"""
+
+_SESSION_KEY = "_db_last_write_at"
+
+_lock = threading.Lock()
+_local = threading.local()
+_last_process_write = 0.0
+_last_lag = None
+_lag_checked_at = 0.0
+_unhealthy_until = 0.0
+_counters = {
+    "replica_reads": 0,
+    "primary_sticky": 0,
+    "primary_lag": 0,
+    "primary_unhealthy": 0,
+    "replica_errors": 0,
+}
+
+
+def get_replica_url():
+    db_url = os.getenv("SUPABASE_REPLICA_DB_URL") or os.getenv("REPLICA_DATABASE_URL")
+    if db_url:
+        return db_url
+    if st is not None:
+        try:
+            return st.secrets.get("SUPABASE_REPLICA_DB_URL") or st.secrets.get("REPLICA_DATABASE_URL")
+        except Exception:
+            pass
+    return None
+
+
+def _session_store():
+    if st is not None:
+        try:
+            from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+            if get_script_run_ctx() is not None:
+                return st.session_state
+        except Exception:
+            pass
+    return _local.__dict__
+
+
+def mark_write():
+    """Record a write by the current session (and process) for read-your-writes."""
+    global _last_process_write
+    now = time.monotonic()
+    _session_store()[_SESSION_KEY] = now
+    with _lock:
+        _last_process_write = now
+
+
+def record_lag(lag_seconds: float):
+    global _last_lag, _lag_checked_at
+    with _lock:
+        _last_lag = float(lag_seconds)
+        _lag_checked_at = time.monotonic()
+
+
+def mark_unhealthy():
+    global _unhealthy_until
+    with _lock:
+        _unhealthy_until = time.monotonic() + RETRY_SECONDS
+        _counters["replica_errors"] += 1
+
+
+def lag_check_due() -> bool:
+    now = time.monotonic()
+    with _lock:
+        # No probing while the replica is marked unhealthy; reads skip it anyway.
+        return now >= _unhealthy_until and now - _lag_checked_at >= LAG_CHECK_SECONDS
+
+
+def choose_replica() -> bool:
+    """True when a read_only read may go to the replica right now."""
+    now = time.monotonic()
+    session_write = _session_store().get(_SESSION_KEY, 0.0)
+    with _lock:
+        if now - max(session_write, _last_process_write) < STICKY_SECONDS:
+            reason = "primary_sticky"
+        elif now < _unhealthy_until:
+            reason = "primary_unhealthy"
+        elif _last_lag is not None and _last_lag > MAX_LAG_SECONDS:
+            reason = "primary_lag"
+        else:
+            reason = "replica_reads"
+        _counters[reason] += 1
+    return reason == "replica_reads"
+
+
+def get_replica_stats() -> dict:
+    with _lock:
+        stats = dict(_counters)
+        stats.update(
+            last_lag_seconds=_last_lag,
+            healthy=time.monotonic() >= _unhealthy_until,
+            max_lag_seconds=MAX_LAG_SECONDS,
+            sticky_seconds=STICKY_SECONDS,
+        )
+    return stats
+
+
+def reset_replica_state():
+    global _last_process_write, _last_lag, _lag_checked_at, _unhealthy_until
+    with _lock:
+        _last_process_write = 0.0
+        _last_lag = None
+        _lag_checked_at = 0.0
+        _unhealthy_until = 0.0
+        for name in _counters:
+            _counters[name] = 0
+    _session_store().pop(_SESSION_KEY, None)
@@ -0,0 +1,84 @@
+"""
+Request-scoped memoization for service reads.
+
+A "request" is one Streamlit script run (pages call begin_request() right
+after st.set_page_config) or an explicit `with request_scope():` block in
+non-Streamlit callers. Outside a request nothing is cached, so background
+threads and scripts always see fresh data.
+
+Within a request, functions decorated with @request_cached return the first
+result for the same arguments. Any write through execute_insert/update/delete
+clears the cache, so reads after a write in the same run see that write.
+db_manager also counts DB round trips per request (get_round_trip_count()).
+"""
+import functools
+import threading
+from contextlib import contextmanager
+
+from config.tenants import current_tenant
+
+_state = threading.local()
+
+
+def begin_request():
+    _state.active = True
+    _state.cache = {}
+    _state.round_trips = 0
+
+
+def end_request():
+    _state.active = False
+    _state.cache = {}
+
+
+@contextmanager
+def request_scope():
+    begin_request()
+    try:
+        yield
+    finally:
+        end_request()
+
+
+def is_request_active() -> bool:
+    return getattr(_state, "active", False)
+
+
+def record_round_trip(count: int = 1):
+    if is_request_active():
+        _state.round_trips += count
+
+
+def get_round_trip_count() -> int:
+    return getattr(_state, "round_trips", 0) if is_request_active() else 0
+
+
+def invalidate():
+    if is_request_active():
+        _state.cache = {}
+
+
+def request_cached(func):
+    key_prefix = (func.__module__, func.__qualname__)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not is_request_active():
+            return func(*args, **kwargs)
+        try:
+            # The school is part of the key in case a request switches tenant_scope().
+            key = (key_prefix, current_tenant().schema, args, tuple(sorted(kwargs.items())))
+            hash(key)
+        except TypeError:
+            return func(*args, **kwargs)
+
+        cache = _state.cache
+        if key in cache:
+            return cache[key]
+        result = func(*args, **kwargs)
+        # A write inside func clears the cache; only keep results computed on current data.
+        if _state.cache is cache:
+            cache[key] = result
+        return result
+
+    return wrapper
@@ -0,0 +1,276 @@
+"""
+Deadlines, error classification and retry policy for db_manager.
+
+- Deadlines: every autocommit statement runs under the server-side
+  statement_timeout (DB_STATEMENT_TIMEOUT_MS, default 15000, set as a
+  connection option) and a client-side deadline (DB_QUERY_TIMEOUT_SECONDS,
+  default statement timeout + 5s, or the caller's timeout=). A single
+  watchdog thread sends a cancel request for statements past their deadline,
+  so a stalled server cannot hang a Streamlit script thread indefinitely. A
+  per-call timeout can shorten, but not extend, the server-side limit.
+  The client-side deadline covers the whole call: waiting for a pooled
+  connection (at most DB_POOL_TIMEOUT_SECONDS, default 3, per attempt),
+  retries and the statement itself.
+- Classification: connection losses (SQLSTATE class 08, admin shutdown,
+  too many connections, client-side connection errors) and serialization
+  failures/deadlocks are retryable; cancellations/timeouts and everything
+  else are not. A pool timeout is a timeout: the pool has already been
+  reconnecting in the background for the whole wait, so waiting again in
+  the same call only holds the script thread longer. A connection lost after a write was sent is ambiguous (it
+  may have committed) and is not retried.
+- Backoff: full-jitter exponential (DB_RETRY_BASE_MS, DB_RETRY_MAX_MS),
+  at most DB_MAX_RETRIES retries per call, and a process-wide retry budget
+  (token bucket, DB_RETRY_BUDGET retries refilled at DB_RETRY_BUDGET_PER_SECOND)
+  so an outage does not turn every request into a retry storm.
+"""
+import heapq
+import itertools
+import logging
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+from psycopg import InterfaceError, OperationalError, errors
+from psycopg_pool import PoolTimeout
+
+from utils.rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "15000"))
+QUERY_TIMEOUT_SECONDS = float(
+    os.getenv("DB_QUERY_TIMEOUT_SECONDS", str(STATEMENT_TIMEOUT_MS / 1000 + 5 if STATEMENT_TIMEOUT_MS else 0))
+)
+POOL_TIMEOUT_SECONDS = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "3"))
+MAX_RETRIES = int(os.getenv("DB_MAX_RETRIES", "3"))
+RETRY_BASE_SECONDS = float(os.getenv("DB_RETRY_BASE_MS", "50")) / 1000
+RETRY_MAX_SECONDS = float(os.getenv("DB_RETRY_MAX_MS", "2000")) / 1000
+RETRY_BUDGET = float(os.getenv("DB_RETRY_BUDGET", "20"))
+RETRY_BUDGET_PER_SECOND = float(os.getenv("DB_RETRY_BUDGET_PER_SECOND", "1"))
+
+CONNECTION = "connection"
+TRANSIENT = "transient"
+TIMEOUT = "timeout"
+FATAL = "fatal"
+
+_CONNECTION_SQLSTATES = {
+    "57P01",  # admin_shutdown
+    "57P02",  # crash_shutdown
+    "57P03",  # cannot_connect_now
+    "53300",  # too_many_connections
+}
+_TRANSIENT_SQLSTATES = {
+    "40001",  # serialization_failure
+    "40P01",  # deadlock_detected
+}
+
+_lock = threading.Lock()
+_budget = TokenBucket(RETRY_BUDGET, RETRY_BUDGET_PER_SECOND)
+_counters = {
+    "ok": 0,
+    "recovered": 0,
+    "retries": 0,
+    "timeouts": 0,
+    "cancels_sent": 0,
+    "non_retryable_errors": 0,
+    "ambiguous_writes": 0,
+    "retries_exhausted": 0,
+    "deadline_exceeded": 0,
+    "budget_exhausted": 0,
+}
+
+
+def _count(name: str, amount: int = 1):
+    with _lock:
+        _counters[name] += amount
+
+
+def classify(error: BaseException) -> str:
+    """Return CONNECTION, TRANSIENT, TIMEOUT or FATAL for an exception raised by a statement."""
+    if isinstance(error, RuntimeError) and isinstance(error.__cause__, OperationalError):
+        # _create_db_connection wraps connect failures with a friendlier message.
+        return CONNECTION
+    if isinstance(error, (errors.QueryCanceled, PoolTimeout)):
+        return TIMEOUT
+    sqlstate = getattr(error, "sqlstate", None)
+    if sqlstate in _TRANSIENT_SQLSTATES:
+        return TRANSIENT
+    if sqlstate in _CONNECTION_SQLSTATES or (sqlstate or "").startswith("08"):
+        return CONNECTION
+    if isinstance(error, (OperationalError, InterfaceError)) and sqlstate is None:
+        # Client-side: connection closed, server went away, SSL error, ...
+        return CONNECTION
+    return FATAL
+
+
+def should_retry(kind: str, attempt: int, write_sent: bool = False, expires: float = None) -> bool:
+    """
+    Decide whether to retry after a failure of the given kind. attempt is the
+    number of retries already made; write_sent means a write statement reached
+    the wire before the failure; expires is the call's call_expiry().
+    """
+    if kind == TIMEOUT:
+        _count("timeouts")
+        return False
+    if kind == FATAL:
+        _count("non_retryable_errors")
+        return False
+    if kind == CONNECTION and write_sent:
+        _count("ambiguous_writes")
+        return False
+    if attempt >= MAX_RETRIES:
+        _count("retries_exhausted")
+        return False
+    if expires is not None and time.monotonic() >= expires:
+        _count("deadline_exceeded")
+        return False
+    with _lock:
+        allowed = _budget.consume()
+    if not allowed:
+        _count("budget_exhausted")
+        return False
+    _count("retries")
+    return True
+
+
+def record_success(attempt: int):
+    with _lock:
+        _counters["ok"] += 1
+        if attempt:
+            _counters["recovered"] += 1
+
+
+def call_expiry(seconds: float = None):
+    """Monotonic time by which a whole call (pool wait, retries, statement) must finish, or None for no deadline."""
+    seconds = QUERY_TIMEOUT_SECONDS if seconds is None else seconds
+    return time.monotonic() + seconds if seconds and seconds > 0 else None
+
+
+def remaining_seconds(expires) -> float:
+    """Time left until expires for deadline(); 0 (no deadline) when expires is None."""
+    if expires is None:
+        return 0
+    return max(expires - time.monotonic(), 0.001)
+
+
+def pool_wait_seconds(expires) -> float:
+    """How long to wait for a pooled connection: DB_POOL_TIMEOUT_SECONDS, cut short by the call deadline."""
+    if expires is None:
+        return POOL_TIMEOUT_SECONDS
+    return min(POOL_TIMEOUT_SECONDS, remaining_seconds(expires))
+
+
+def backoff_seconds(attempt: int, expires: float = None) -> float:
+    """Full-jitter exponential backoff before retry number `attempt` (1-based), never past expires."""
+    delay = random.uniform(0, min(RETRY_MAX_SECONDS, RETRY_BASE_SECONDS * (2 ** (attempt - 1))))
+    if expires is not None:
+        delay = min(delay, max(expires - time.monotonic(), 0))
+    return delay
+
+
+def get_retry_stats() -> dict:
+    with _lock:
+        stats = dict(_counters)
+        stats["budget_tokens"] = round(_budget.tokens, 2)
+    stats.update(
+        statement_timeout_ms=STATEMENT_TIMEOUT_MS,
+        query_timeout_seconds=QUERY_TIMEOUT_SECONDS,
+        pool_timeout_seconds=POOL_TIMEOUT_SECONDS,
+        max_retries=MAX_RETRIES,
+    )
+    return stats
+
+
+def reset_retry_stats():
+    """Zero the counters and refill the retry budget."""
+    global _budget
+    with _lock:
+        for name in _counters:
+            _counters[name] = 0
+        _budget = TokenBucket(RETRY_BUDGET, RETRY_BUDGET_PER_SECOND)
+
+
+class _CancelWatchdog:
+    """One daemon thread that cancels statements still running past their deadline."""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._heap = []
+        self._armed = {}
+        self._cancelling = None
+        self._tokens = itertools.count()
+        self._thread = None
+
+    def arm(self, conn, seconds: float) -> int:
+        token = next(self._tokens)
+        with self._cond:
+            self._armed[token] = conn
+            heapq.heappush(self._heap, (time.monotonic() + seconds, token))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="db-cancel-watchdog", daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+        return token
+
+    def disarm(self, token: int):
+        with self._cond:
+            self._armed.pop(token, None)
+            # A cancel for this statement may still be in flight; wait for it so it
+            # cannot hit the next statement the connection runs.
+            while self._cancelling == token:
+                self._cond.wait()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._heap and self._heap[0][1] not in self._armed:
+                    heapq.heappop(self._heap)
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+                deadline, token = self._heap[0]
+                remaining = deadline - time.monotonic()
+                if remaining > 0:
+                    self._cond.wait(remaining)
+                    continue
+                heapq.heappop(self._heap)
+                conn = self._armed.pop(token)
+                self._cancelling = token
+
+            # Outside the lock: cancel_safe() may take seconds against a stalled
+            # server, and other threads must keep arming/disarming meanwhile.
+            try:
+                conn.cancel_safe(timeout=5)
+                _count("cancels_sent")
+            except Exception as e:
+                logger.warning("[db-retry] cancel request failed: %s", e)
+            finally:
+                with self._cond:
+                    self._cancelling = None
+                    self._cond.notify_all()
+
+
+_watchdog = _CancelWatchdog()
+
+
+@contextmanager
+def deadline(conn, seconds: float = None):
+    """
+    Cancel the statement running on conn if the block takes longer than seconds.
+
+    conn must be checked out by the calling thread (a pooled connection or the
+    transaction() connection): a cancel request hits whatever statement the
+    connection is running, so on a shared connection it could cancel another
+    caller's statement.
+    """
+    seconds = QUERY_TIMEOUT_SECONDS if seconds is None else seconds
+    if not seconds or seconds <= 0:
+        yield
+        return
+    token = _watchdog.arm(conn, seconds)
+    try:
+        yield
+    finally:
+        _watchdog.disarm(token)
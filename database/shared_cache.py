@@ -0,0 +1,180 @@
+"""
+Process-wide cache for read-mostly reference data (student roster, gate roster).
+
+Every Streamlit session and service in the process shares one bounded LRU.
+Cached functions declare which tables they read; the current generation of
+each of those tables is part of the cache key, so bump_generation("students")
+after a write makes every older entry unreachable; those entries are dropped
+right away so the memory figure only counts live data.
+
+Generations are per process. Entries also expire after a TTL so that a write
+made by another replica becomes visible within that window.
+
+Keys and generations are per school schema (config/tenants.py): a write in one
+school never evicts or bumps another school's entries. The schools share the
+one LRU bound.
+
+Inside db_manager.transaction() bumps are deferred until the outermost block
+ends, so no other thread can re-cache pre-commit data under the new generation.
+"""
+import contextvars
+import functools
+import sys
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from contextlib import contextmanager
+
+from config.tenants import current_tenant
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_TTL_SECONDS = 300
+
+
+class SharedCache:
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._generations = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def generation(self, table: tuple) -> int:
+        return self._generations.get(table, 0)
+
+    def bump_generation(self, *tables: tuple):
+        with self._lock:
+            for table in tables:
+                self._generations[table] = self._generations.get(table, 0) + 1
+            stale = [key for key, entry in self._entries.items() if set(entry[3]) & set(tables)]
+            for key in stale:
+                del self._entries[key]
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, entry[0]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def set(self, key, value, ttl: float, tables: tuple = ()):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl, _estimate_size(value), tables)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+                "approx_bytes": sum(entry[2] for entry in self._entries.values()),
+                "generations": {".".join(table): generation for table, generation in self._generations.items()},
+            }
+
+
+def _estimate_size(value, _depth=0) -> int:
+    # Rough deep size of the usual payloads (lists/dicts of rows or records); good enough for a dashboard.
+    size = sys.getsizeof(value)
+    if _depth > 3:
+        return size
+    if isinstance(value, Mapping):
+        # dict rows and database.records rows
+        size += sum(_estimate_size(k, _depth + 1) + _estimate_size(v, _depth + 1) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set)):
+        size += sum(_estimate_size(item, _depth + 1) for item in value)
+    return size
+
+
+_cache = SharedCache()
+
+
+def get_shared_cache() -> SharedCache:
+    return _cache
+
+
+_deferred_tables = contextvars.ContextVar("phone2026_deferred_generation_bumps", default=None)
+
+
+def _scoped(tables) -> tuple:
+    # (schema, table): each school has its own generations.
+    schema = current_tenant().schema
+    return tuple((schema, table) for table in tables)
+
+
+def bump_generation(*tables: str):
+    scoped = _scoped(tables)
+    deferred = _deferred_tables.get()
+    if deferred is not None:
+        deferred.update(scoped)
+        return
+    _cache.bump_generation(*scoped)
+
+
+@contextmanager
+def defer_generation_bumps():
+    """Collect bump_generation() calls and apply them once when the block exits (commit or rollback)."""
+    if _deferred_tables.get() is not None:
+        yield
+        return
+    tables = set()
+    token = _deferred_tables.set(tables)
+    try:
+        yield
+    finally:
+        _deferred_tables.reset(token)
+        if tables:
+            _cache.bump_generation(*tables)
+
+
+def get_shared_cache_stats() -> dict:
+    return _cache.stats()
+
+
+def shared_cached(*tables: str, ttl: float = DEFAULT_TTL_SECONDS):
+    """Cache a read that depends only on `tables` and its (hashable) arguments."""
+
+    def decorator(func):
+        key_prefix = (func.__module__, func.__qualname__)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            scoped = _scoped(tables)
+            generations = tuple(_cache.generation(table) for table in scoped)
+            try:
+                key = (key_prefix, scoped, generations, args, tuple(sorted(kwargs.items())))
+                hash(key)
+            except TypeError:
+                return func(*args, **kwargs)
+
+            found, value = _cache.get(key)
+            if found:
+                return value
+            value = func(*args, **kwargs)
+            # Skip storing if a write bumped the generation while we were reading.
+            if generations == tuple(_cache.generation(table) for table in scoped):
+                _cache.set(key, value, ttl, scoped)
+            return value
+
+        return wrapper
+
+    return decorator
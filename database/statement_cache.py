@@ -0,0 +1,106 @@
+"""
+Statement cache for db_manager / async_db_manager.
+
+Keyed by the source SQL (with `?` placeholders) and the school's schema when
+several schools share the connections, each entry keeps the normalized `%s`
+text and a use count. Per-schema entries carry a /* schema */ prefix, so psycopg
+prepares a separate statement for each school instead of one statement that
+Postgres re-plans whenever search_path changes. Once a statement has been used
+DB_PREPARE_THRESHOLD times (default 5) it is executed with prepare=True, so
+psycopg keeps a server-side prepared handle for it on each connection.
+
+Server-side prepared statements do not survive transaction-mode pooling
+(Supabase pooler on port 6543, PgBouncer in transaction mode): the next
+statement may land on a different backend. prepare_enabled() therefore
+switches preparing off for those URLs and every statement runs unprepared;
+the normalized-text cache still applies. DB_PREPARE=on/off overrides the
+detection (e.g. for a PgBouncer on a non-standard port).
+"""
+import os
+import threading
+from collections import OrderedDict
+from urllib.parse import urlparse
+
+MAX_ENTRIES = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "512"))
+PREPARE_THRESHOLD = max(1, int(os.getenv("DB_PREPARE_THRESHOLD", "5")))
+TRANSACTION_POOLER_PORT = 6543
+
+_lock = threading.Lock()
+_entries = OrderedDict()
+_hits = 0
+_misses = 0
+_prepared_executions = 0
+_prepare_enabled = None
+
+
+class _Entry:
+    __slots__ = ("normalized", "uses")
+
+    def __init__(self, normalized: str):
+        self.normalized = normalized
+        self.uses = 0
+
+
+def prepare_enabled(db_url: str) -> bool:
+    """False when db_url goes through a transaction-mode pooler (or DB_PREPARE=off)."""
+    override = os.getenv("DB_PREPARE", "auto").lower()
+    if override in {"1", "true", "yes", "on"}:
+        return True
+    if override in {"0", "false", "no", "off"}:
+        return False
+    return urlparse(db_url).port != TRANSACTION_POOLER_PORT
+
+
+def configure(db_url: str) -> dict:
+    """Record whether preparing is allowed for db_url and return the psycopg connection kwargs for it."""
+    global _prepare_enabled
+    _prepare_enabled = prepare_enabled(db_url)
+    # prepare_threshold=None turns off psycopg's own automatic preparing as well.
+    return {"prepare_threshold": PREPARE_THRESHOLD if _prepare_enabled else None}
+
+
+def lookup(query: str, scope: str = None) -> tuple[str, bool]:
+    """Return (normalized SQL, prepare flag for cursor.execute). scope is the schema, if per-school."""
+    global _hits, _misses, _prepared_executions
+    key = (scope, query)
+    with _lock:
+        entry = _entries.get(key)
+        if entry is None:
+            _misses += 1
+            # Keep existing sqlite-style placeholders working with psycopg.
+            normalized = query.replace("?", "%s")
+            entry = _Entry(f"/* {scope} */ {normalized}" if scope else normalized)
+            _entries[key] = entry
+            if len(_entries) > MAX_ENTRIES:
+                _entries.popitem(last=False)
+        else:
+            _hits += 1
+            _entries.move_to_end(key)
+        entry.uses += 1
+        prepare = bool(_prepare_enabled) and entry.uses >= PREPARE_THRESHOLD
+        if prepare:
+            _prepared_executions += 1
+        return entry.normalized, prepare
+
+
+def get_statement_cache_stats() -> dict:
+    with _lock:
+        lookups = _hits + _misses
+        return {
+            "prepare_enabled": _prepare_enabled,
+            "prepare_threshold": PREPARE_THRESHOLD,
+            "hits": _hits,
+            "misses": _misses,
+            "hit_ratio": _hits / lookups if lookups else 0.0,
+            "prepared_executions": _prepared_executions,
+            "prepared_ratio": _prepared_executions / lookups if lookups else 0.0,
+            "entries": len(_entries),
+            "max_entries": MAX_ENTRIES,
+        }
+
+
+def reset_statement_cache():
+    global _hits, _misses, _prepared_executions
+    with _lock:
+        _entries.clear()
+        _hits = _misses = _prepared_executions = 0
@@ -0,0 +1,29 @@
+-- Index plan for the hot query shapes in phone2026.
+-- Safe to run on a live database: every statement is idempotent and
+-- CONCURRENTLY avoids blocking writes while the index builds.
+-- Run each statement separately (CONCURRENTLY cannot run inside a transaction block).
+
+-- services/application_service._apply_delayed_approvals, get_pending_applications
+-- (status = 'pending', application_type = ?, submitted_at <= ...)
+create index concurrently if not exists idx_applications_pending_type_submitted
+  on phone2026.applications(application_type, submitted_at)
+  where status = 'pending';
+
+-- services/application_service.get_student_applications
+-- (student_id = ? order by submitted_at desc)
+create index concurrently if not exists idx_applications_student_submitted
+  on phone2026.applications(student_id, submitted_at desc);
+
+-- utils/approval_number.get_next_sequence
+-- (application_type = ?, status in approved, approved_at in [year start, next year start))
+create index concurrently if not exists idx_applications_type_approved_at
+  on phone2026.applications(application_type, approved_at)
+  where status in ('approved', 'auto_approved');
+
+-- components/auth.authenticate_parent
+-- (student_id = ? and name = ?)
+create index concurrently if not exists idx_students_login
+  on phone2026.students(student_id, name);
+
+analyze phone2026.applications;
+analyze phone2026.students;
@@ -6,6 +6,7 @@ begin;
 
 create schema if not exists phone2026;
 
+drop table if exists phone2026.schema_migrations;
 drop table if exists phone2026.applications;
 drop table if exists phone2026.activity_logs;
 drop table if exists phone2026.documents;
@@ -68,6 +69,10 @@ create index idx_phone2026_app_student on phone2026.applications(student_id);
 create index idx_phone2026_app_status on phone2026.applications(status);
 create index idx_phone2026_app_type on phone2026.applications(application_type);
 create index idx_phone2026_activity_ts on phone2026.activity_logs(timestamp);
+create index idx_applications_pending_type_submitted on phone2026.applications(application_type, submitted_at) where status = 'pending';
+create index idx_applications_student_submitted on phone2026.applications(student_id, submitted_at desc);
+create index idx_applications_type_approved_at on phone2026.applications(application_type, approved_at) where status in ('approved', 'auto_approved');
+create index idx_students_login on phone2026.students(student_id, name);
 
 insert into phone2026.settings (key, value) values
   ('phone_approval_mode', 'manual'),
@@ -2,13 +2,23 @@ import streamlit as st
 from utils.ui_style import inject_nav_label_override
 
 from components.auth import authenticate_admin, logout_admin
-from services.approval_service import approve_application, reject_application
+from components.tenant import use_request_tenant
+from database.request_cache import begin_request
+from services.approval_service import (
+    approve_application,
+    approve_applications,
+    reject_application,
+    reject_applications,
+)
 from services.application_service import (
     get_application_type_name,
-    get_pending_applications,
+    get_pending_overview,
     get_statistics,
 )
 from utils.gate_schedule import format_gate_schedule
+from utils.tracing import page_trace
+
+PENDING_PAGE_SIZE = 20
 
 
 st.set_page_config(
@@ -16,141 +26,268 @@ st.set_page_config(
     page_icon="✅",
     layout="wide",
 )
-inject_nav_label_override()
+begin_request()
 
 
-st.title("✅ 관리자 승인 페이지")
-st.divider()
+def main():
+    use_request_tenant()
+    inject_nav_label_override()
 
-if "admin_authenticated" not in st.session_state:
-    st.session_state.admin_authenticated = False
-    st.session_state.admin_name = None
+    st.title("✅ 관리자 승인 페이지")
+    st.divider()
 
+    if "admin_authenticated" not in st.session_state:
+        st.session_state.admin_authenticated = False
+        st.session_state.admin_name = None
 
-if not st.session_state.admin_authenticated:
-    st.subheader("🔐 관리자 인증")
+    if not st.session_state.admin_authenticated:
+        st.subheader("🔐 관리자 인증")
 
-    with st.form("admin_auth_form"):
-        password = st.text_input(
-            "비밀번호",
-            type="password",
-            placeholder="관리자 비밀번호",
-        )
+        with st.form("admin_auth_form"):
+            password = st.text_input(
+                "비밀번호",
+                type="password",
+                placeholder="관리자 비밀번호",
+            )
 
-        submitted = st.form_submit_button(
-            "로그인",
-            use_container_width=True,
-            type="primary",
-        )
+            submitted = st.form_submit_button(
+                "로그인",
+                use_container_width=True,
+                type="primary",
+            )
 
-        if submitted:
-            if authenticate_admin(password):
-                st.session_state.admin_authenticated = True
-                st.session_state.admin_name = "관리자"
-                st.success("관리자 인증이 완료되었습니다.")
-                st.rerun()
-            else:
-                st.error("비밀번호가 올바르지 않습니다.")
+            if submitted:
+                if authenticate_admin(password):
+                    st.session_state.admin_authenticated = True
+                    st.session_state.admin_name = "관리자"
+                    st.success("관리자 인증이 완료되었습니다.")
+                    st.rerun()
+                else:
+                    st.error("비밀번호가 올바르지 않습니다.")
 
-    st.info("관리자 비밀번호를 입력하면 승인/반려 업무를 처리할 수 있습니다.")
+        st.info("관리자 비밀번호를 입력하면 승인/반려 업무를 처리할 수 있습니다.")
 
-else:
-    col1, col2 = st.columns([4, 1])
+    else:
+        col1, col2 = st.columns([4, 1])
 
-    with col1:
-        st.markdown(f"**{st.session_state.admin_name} 로그인 상태**")
+        with col1:
+            st.markdown(f"**{st.session_state.admin_name} 로그인 상태**")
 
-    with col2:
-        if st.button("로그아웃", use_container_width=True):
-            logout_admin()
-            st.rerun()
+        with col2:
+            if st.button("로그아웃", use_container_width=True):
+                logout_admin()
+                st.rerun()
 
-    st.divider()
-    st.subheader("📊 현황 요약")
-
-    stats = get_statistics()
-    s1, s2, s3, s4 = st.columns(4)
-    with s1:
-        st.metric("전체 신청", stats["total"])
-    with s2:
-        st.metric("승인 대기", stats["pending"])
-    with s3:
-        st.metric("승인 완료", stats["approved"])
-    with s4:
-        st.metric("반려", stats["rejected"])
+        st.divider()
+        st.subheader("📊 현황 요약")
 
-    st.divider()
-    st.subheader("📋 승인 대기 목록")
+        stats = get_statistics()
+        s1, s2, s3, s4 = st.columns(4)
+        with s1:
+            st.metric("전체 신청", stats["total"])
+        with s2:
+            st.metric("승인 대기", stats["pending"])
+        with s3:
+            st.metric("승인 완료", stats["approved"])
+        with s4:
+            st.metric("반려", stats["rejected"])
 
-    pending_apps = get_pending_applications()
+        st.divider()
+        st.subheader("📋 승인 대기 목록")
 
-    if not pending_apps:
-        st.success("현재 승인 대기 중인 신청이 없습니다.")
-    else:
-        st.info(f"총 {len(pending_apps)}건의 승인 대기 신청이 있습니다.")
+        f1, f2, f3, f4 = st.columns([1, 1, 1, 2])
+        with f1:
+            filter_type = st.selectbox(
+                "유형",
+                [None, "phone", "tablet", "gate"],
+                format_func=lambda x: "전체" if x is None else get_application_type_name(x),
+                key="pending_filter_type",
+            )
+        with f2:
+            filter_grade = st.selectbox(
+                "학년",
+                [None, 1, 2, 3, 4, 5, 6],
+                format_func=lambda x: "전체" if x is None else f"{x}학년",
+                key="pending_filter_grade",
+            )
+        with f3:
+            filter_class = st.selectbox(
+                "반",
+                [None] + list(range(1, 11)),
+                format_func=lambda x: "전체" if x is None else f"{x}반",
+                key="pending_filter_class",
+            )
+        with f4:
+            filter_name = st.text_input("이름/학번 검색", key="pending_filter_name")
+
+        pending_filters = {
+            "application_type": filter_type,
+            "grade": filter_grade,
+            "class_num": filter_class,
+            "name_query": filter_name,
+        }
+        # 필터가 바뀌면 첫 페이지부터 다시 조회
+        if st.session_state.get("pending_filters") != pending_filters:
+            st.session_state.pending_filters = pending_filters
+            st.session_state.pending_cursors = [None]
+
+        cursors = st.session_state.pending_cursors
+        page_index = len(cursors) - 1
+        pending_total, pending_apps, next_cursor = get_pending_overview(
+            limit=PENDING_PAGE_SIZE, after=cursors[-1], **pending_filters
+        )
+
+        if not pending_apps and page_index > 0:
+            # 현재 페이지를 모두 처리했으면 이전 페이지로 이동
+            cursors.pop()
+            st.rerun()
 
-        for idx, app in enumerate(pending_apps, start=1):
-            with st.container(border=True):
-                left, right = st.columns([3, 1])
+        if not pending_apps:
+            st.success("현재 승인 대기 중인 신청이 없습니다.")
+        else:
+            page_start = page_index * PENDING_PAGE_SIZE + 1
+            page_end = page_index * PENDING_PAGE_SIZE + len(pending_apps)
+            st.info(f"총 {pending_total}건의 승인 대기 신청이 있습니다. ({page_start}~{page_end}번째)")
 
-                with left:
-                    st.markdown(
-                        f"**{idx}. {get_application_type_name(app['application_type'])} - "
-                        f"{app['grade']}학년 {app['class_num']}반 {app['name']}**"
+            # 일괄 처리는 화면에 표시한 목록의 id/버전만 대상으로 한다 (그 사이 바뀐 건은 건너뜀).
+            rendered_versions = {app["id"]: app["version"] for app in pending_apps}
+            selected_ids = [app["id"] for app in pending_apps if st.session_state.get(f"select_{app['id']}")]
+            b1, b2, b3 = st.columns(3)
+            with b1:
+                if st.button(
+                    f"선택 승인 ({len(selected_ids)}건)",
+                    disabled=not selected_ids,
+                    use_container_width=True,
+                    type="primary",
+                ):
+                    success, message = approve_applications(selected_ids, "관리자", expected_versions=rendered_versions)
+                    if success:
+                        st.success(message)
+                        st.rerun()
+                    else:
+                        st.error(message)
+            with b2:
+                if st.button(f"선택 반려 ({len(selected_ids)}건)", disabled=not selected_ids, use_container_width=True):
+                    st.session_state.bulk_reject_form = True
+            with b3:
+                confirm_all = st.checkbox(f"현재 목록 {len(pending_apps)}건 전체 승인", key="confirm_approve_all")
+                if st.button("전체 승인 실행", disabled=not confirm_all, use_container_width=True):
+                    success, message = approve_applications(
+                        list(rendered_versions), "관리자", expected_versions=rendered_versions
                     )
-                    st.markdown("---")
-
-                    i1, i2 = st.columns(2)
-                    with i1:
-                        st.markdown(f"**신청 사유:** {app['reason']}")
-                    with i2:
-                        if app["extra_info"]:
-                            extra_text = app["extra_info"]
-                            if app["application_type"] == "gate":
-                                extra_text = format_gate_schedule(app["extra_info"])
-                            st.markdown(f"**추가 정보:** {extra_text}")
-                    st.caption(f"신청일: {app['submitted_at']}")
-
-                with right:
-                    st.markdown("#### 처리")
-
-                    if st.button("승인", key=f"approve_{app['id']}", use_container_width=True):
-                        success, message = approve_application(app["id"], "관리자")
-                        if success:
-                            st.success(message)
-                            st.rerun()
+                    if success:
+                        st.success(message)
+                        st.session_state.pop("confirm_approve_all", None)
+                        st.rerun()
+                    else:
+                        st.error(message)
+
+            if st.session_state.get("bulk_reject_form") and selected_ids:
+                bulk_reason = st.text_input("일괄 반려 사유", key="bulk_reject_reason")
+                r1, r2 = st.columns(2)
+                with r1:
+                    if st.button("일괄 반려 확인", use_container_width=True):
+                        if not bulk_reason.strip():
+                            st.error("반려 사유를 입력해주세요.")
                         else:
-                            st.error(message)
-
-                    if st.button("반려", key=f"reject_{app['id']}", use_container_width=True):
-                        st.session_state[f"reject_form_{app['id']}"] = True
-
-                    if st.session_state.get(f"reject_form_{app['id']}", False):
-                        reason = st.text_input("반려 사유", key=f"reason_{app['id']}")
-                        r1, r2 = st.columns(2)
-
-                        with r1:
-                            if st.button(
-                                "반려 확인",
-                                key=f"reject_confirm_{app['id']}",
-                                use_container_width=True,
-                            ):
-                                if not reason.strip():
-                                    st.error("반려 사유를 입력해주세요.")
-                                else:
-                                    success, message = reject_application(app["id"], reason.strip())
-                                    if success:
-                                        st.success(message)
-                                        st.session_state[f"reject_form_{app['id']}"] = False
-                                        st.rerun()
-                                    else:
-                                        st.error(message)
-
-                        with r2:
-                            if st.button(
-                                "취소",
-                                key=f"reject_cancel_{app['id']}",
-                                use_container_width=True,
-                            ):
-                                st.session_state[f"reject_form_{app['id']}"] = False
+                            success, message = reject_applications(
+                                selected_ids, bulk_reason.strip(), expected_versions=rendered_versions
+                            )
+                            if success:
+                                st.success(message)
+                                st.session_state.bulk_reject_form = False
+                                st.rerun()
+                            else:
+                                st.error(message)
+                with r2:
+                    if st.button("일괄 반려 취소", use_container_width=True):
+                        st.session_state.bulk_reject_form = False
+                        st.rerun()
+
+            for idx, app in enumerate(pending_apps, start=page_start):
+                with st.container(border=True):
+                    left, right = st.columns([3, 1])
+
+                    with left:
+                        st.checkbox("선택", key=f"select_{app['id']}")
+                        st.markdown(
+                            f"**{idx}. {get_application_type_name(app['application_type'])} - "
+                            f"{app['grade']}학년 {app['class_num']}반 {app['name']}**"
+                        )
+                        st.markdown("---")
+
+                        i1, i2 = st.columns(2)
+                        with i1:
+                            st.markdown(f"**신청 사유:** {app['reason']}")
+                        with i2:
+                            if app["extra_info"]:
+                                extra_text = app["extra_info"]
+                                if app["application_type"] == "gate":
+                                    extra_text = format_gate_schedule(app["extra_info"])
+                                st.markdown(f"**추가 정보:** {extra_text}")
+                        st.caption(f"신청일: {app['submitted_at']}")
+
+                    with right:
+                        st.markdown("#### 처리")
+
+                        if st.button("승인", key=f"approve_{app['id']}", use_container_width=True):
+                            success, message = approve_application(
+                                app["id"], "관리자", expected_version=app.get("version")
+                            )
+                            if success:
+                                st.success(message)
                                 st.rerun()
+                            else:
+                                st.error(message)
+
+                        if st.button("반려", key=f"reject_{app['id']}", use_container_width=True):
+                            st.session_state[f"reject_form_{app['id']}"] = True
+
+                        if st.session_state.get(f"reject_form_{app['id']}", False):
+                            reason = st.text_input("반려 사유", key=f"reason_{app['id']}")
+                            r1, r2 = st.columns(2)
+
+                            with r1:
+                                if st.button(
+                                    "반려 확인",
+                                    key=f"reject_confirm_{app['id']}",
+                                    use_container_width=True,
+                                ):
+                                    if not reason.strip():
+                                        st.error("반려 사유를 입력해주세요.")
+                                    else:
+                                        success, message = reject_application(
+                                            app["id"], reason.strip(), expected_version=app.get("version")
+                                        )
+                                        if success:
+                                            st.success(message)
+                                            st.session_state[f"reject_form_{app['id']}"] = False
+                                            st.rerun()
+                                        else:
+                                            st.error(message)
+
+                            with r2:
+                                if st.button(
+                                    "취소",
+                                    key=f"reject_cancel_{app['id']}",
+                                    use_container_width=True,
+                                ):
+                                    st.session_state[f"reject_form_{app['id']}"] = False
+                                    st.rerun()
+
+            p1, p2, p3 = st.columns([1, 2, 1])
+            with p1:
+                if page_index > 0 and st.button("◀ 이전", use_container_width=True):
+                    cursors.pop()
+                    st.rerun()
+            with p2:
+                st.caption(f"{page_index + 1} / {max(1, -(-pending_total // PENDING_PAGE_SIZE))} 페이지")
+            with p3:
+                if next_cursor and st.button("다음 ▶", use_container_width=True):
+                    cursors.append(next_cursor)
+                    st.rerun()
+
+
+# st.rerun()/st.stop() 로 중간에 끝나도 trace 를 닫는다.
+with page_trace("page.approval"):
+    main()
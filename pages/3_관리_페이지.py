@@ -5,9 +5,27 @@ import pandas as pd
 import requests
 import streamlit as st
 
-from components.auth import authenticate_admin, logout_admin
+from components.auth import (
+    authenticate_admin,
+    authenticate_system_admin,
+    can_view_system_status,
+    logout_admin,
+)
 from components.statistics import render_statistics_dashboard
 from database.db_manager import execute_query, execute_update
+from database import query_stats
+from components.tenant import use_request_tenant
+from config.tenants import current_tenant
+from database.request_cache import begin_request
+from database.shared_cache import get_shared_cache_stats
+from database.statement_cache import get_statement_cache_stats
+from services.application_service import export_applications_csv
+from services.gate_duty_service import (
+    gate_duty_to_csv,
+    get_gate_duty_sheet_pdf,
+    get_gate_duty_table,
+    get_gate_roster_rows,
+)
 from services.student_service import (
     add_student,
     add_students,
@@ -16,11 +34,11 @@ from services.student_service import (
     clear_all_students_and_applications,
 )
 from utils.csv_handler import parse_student_csv, validate_csv_format
-from utils.gate_schedule import WEEKDAYS, gate_schedule_to_grid
+from utils.gate_schedule import GATE_DUTY_SLOTS, WEEKDAYS, get_gate_duty_slot_label, weekday_of
+from utils.google_sync import get_gate_sheet_url, get_google_sheet_webapp_url
+from utils.tracing import page_trace, get_slow_traces
 from utils.ui_style import inject_nav_label_override
 
-GOOGLE_SHEET_WEBAPP_URL = "https://script.google.com/macros/s/AKfycbxdylk68Qe1G-3_Jo5HBaPBiOIrSuGcT_C3DKkgfXZudQ-8mpCX5bcDPVBNW-OsnTcI/exec"
-GATE_SHEET_URL = "https://docs.google.com/spreadsheets/d/16QWXBF_HSl0T55JmEJLp46ulJsGuPt7zVp3LAGBZHZM/edit?gid=0#gid=0"
 
 
 def _student_csv_template_bytes() -> bytes:
@@ -56,8 +74,13 @@ def _parse_date(value: str, fallback: date) -> date:
     return fallback
 
 
+def _stamp_dir() -> Path:
+    # 학교마다 도장 파일을 따로 둔다.
+    return Path("data/uploads") / current_tenant().schema
+
+
 def _save_principal_stamp(uploaded_file) -> str:
-    upload_dir = Path("data/uploads")
+    upload_dir = _stamp_dir()
     upload_dir.mkdir(parents=True, exist_ok=True)
     ext = Path(uploaded_file.name).suffix.lower()
     if ext not in [".png", ".jpg", ".jpeg"]:
@@ -75,7 +98,7 @@ def _delete_principal_stamp():
         if file_path.exists():
             file_path.unlink()
     for ext in [".png", ".jpg", ".jpeg"]:
-        candidate = Path("data/uploads") / f"principal_stamp{ext}"
+        candidate = _stamp_dir() / f"principal_stamp{ext}"
         if candidate.exists():
             candidate.unlink()
 
@@ -92,30 +115,6 @@ def _to_google_check(value: str):
     return True if value == "✓" else ""
 
 
-def _get_gate_roster_rows():
-    query = """
-    SELECT a.student_id, s.name, a.reason, a.extra_info
-    FROM applications a
-    JOIN students s ON a.student_id = s.student_id
-    WHERE a.application_type = 'gate'
-      AND a.status IN ('approved', 'auto_approved')
-    ORDER BY s.grade, s.class_num, s.name
-    """
-    rows = execute_query(query)
-    result = []
-    for row in rows:
-        row = dict(row)
-        morning_map, dismissal_map = gate_schedule_to_grid(row.get("extra_info"))
-        item = {"학번": row["student_id"], "성명": row["name"]}
-        for day in WEEKDAYS:
-            item[f"등교-{day}"] = morning_map[day]
-        for day in WEEKDAYS:
-            item[f"하교-{day}"] = dismissal_map[day]
-        item["사유"] = row.get("reason", "")
-        result.append(item)
-    return result
-
-
 def _to_google_rows(roster_rows):
     rows = []
     for r in roster_rows:
@@ -145,7 +144,10 @@ def _sync_google_sheet(roster_rows):
         "startCol": 1,
         "rows": _to_google_rows(roster_rows),
     }
-    res = requests.post(GOOGLE_SHEET_WEBAPP_URL, json=payload, timeout=20)
+    webapp_url = get_google_sheet_webapp_url()
+    if not webapp_url:
+        raise RuntimeError("이 학교의 구글시트 주소가 설정되지 않았습니다.")
+    res = requests.post(webapp_url, json=payload, timeout=20)
     res.raise_for_status()
     data = res.json()
     if not data.get("ok"):
@@ -154,244 +156,402 @@ def _sync_google_sheet(roster_rows):
 
 
 st.set_page_config(page_title="관리 페이지", page_icon="⚙️", layout="wide")
-inject_nav_label_override()
-
-st.title("⚙️ 관리 페이지")
-st.divider()
-
-if "admin_authenticated" not in st.session_state:
-    st.session_state.admin_authenticated = False
-    st.session_state.admin_name = None
-
-if not st.session_state.admin_authenticated:
-    st.subheader("🔐 관리자 인증")
-    with st.form("admin_auth_form"):
-        password = st.text_input("비밀번호", type="password", placeholder="관리자 비밀번호")
-        submitted = st.form_submit_button("로그인", use_container_width=True, type="primary")
-        if submitted:
-            if authenticate_admin(password):
-                st.session_state.admin_authenticated = True
-                st.session_state.admin_name = "관리자"
-                st.success("관리자 인증이 완료되었습니다.")
-                st.rerun()
-            else:
-                st.error("비밀번호가 올바르지 않습니다.")
-    st.info("관리자 비밀번호를 입력해주세요.")
-
-else:
-    c1, c2 = st.columns([4, 1])
-    with c1:
-        st.markdown(f"**{st.session_state.admin_name} 로그인 상태**")
-    with c2:
-        if st.button("로그아웃", use_container_width=True):
-            logout_admin()
-            st.rerun()
+begin_request()
+
+
+def main():
+    use_request_tenant()
+    inject_nav_label_override()
 
+    st.title("⚙️ 관리 페이지")
     st.divider()
-    tab1, tab2, tab3, tab4, tab5 = st.tabs(
-        ["👥 학생 명단 관리", "⚙️ 승인 모드/학년도 설정", "📊 통계", "📄 문서 관리", "🚪 정문 출입 명단"]
-    )
-
-    with tab1:
-        st.subheader("👥 학생 명단 관리")
-        sub_tab1, sub_tab2 = st.tabs(["📤 CSV 업로드", "📝 개별 관리"])
-
-        with sub_tab1:
-            st.markdown(
-                """
-                **CSV 파일 형식**
-                ```csv
-                학번,이름,학년,반
-                20250101,홍길동,1,1
-                20250102,김영희,1,1
-                ```
-                """
-            )
-            st.download_button(
-                label="서식파일 다운로드",
-                data=_student_csv_template_bytes(),
-                file_name="학생명단_업로드_서식.csv",
-                mime="text/csv",
-                use_container_width=True,
-            )
-            uploaded_file = st.file_uploader("CSV 파일 선택", type=["csv"], label_visibility="collapsed")
-            if uploaded_file is not None:
-                file_content = uploaded_file.read()
-                is_valid, message = validate_csv_format(file_content)
-                if is_valid:
-                    st.success(message)
-                    students, _ = parse_student_csv(file_content)
-                    if st.button("학생 데이터 등록"):
-                        count = add_students(students)
-                        st.success(f"{count}명의 학생이 등록되었습니다.")
-                        st.rerun()
+
+    if "admin_authenticated" not in st.session_state:
+        st.session_state.admin_authenticated = False
+        st.session_state.admin_name = None
+
+    if not st.session_state.admin_authenticated:
+        st.subheader("🔐 관리자 인증")
+        with st.form("admin_auth_form"):
+            password = st.text_input("비밀번호", type="password", placeholder="관리자 비밀번호")
+            submitted = st.form_submit_button("로그인", use_container_width=True, type="primary")
+            if submitted:
+                if authenticate_admin(password):
+                    st.session_state.admin_authenticated = True
+                    st.session_state.admin_name = "관리자"
+                    st.success("관리자 인증이 완료되었습니다.")
+                    st.rerun()
                 else:
-                    st.error(message)
-
-        with sub_tab2:
-            left, right = st.columns(2)
-            with left:
-                st.markdown("**학생 추가**")
-                with st.form("add_student_form"):
-                    student_id = st.text_input("학번")
-                    name = st.text_input("이름")
-                    grade = st.number_input("학년", min_value=1, max_value=6)
-                    class_num = st.number_input("반", min_value=1, max_value=10)
-                    if st.form_submit_button("추가"):
-                        try:
-                            add_student(student_id, name, int(grade), int(class_num))
-                            st.success("학생이 추가되었습니다.")
-                            st.rerun()
-                        except Exception as e:
-                            st.error(f"오류: {e}")
+                    st.error("비밀번호가 올바르지 않습니다.")
+        st.info("관리자 비밀번호를 입력해주세요.")
+
+    else:
+        c1, c2 = st.columns([4, 1])
+        with c1:
+            st.markdown(f"**{st.session_state.admin_name} 로그인 상태**")
+        with c2:
+            if st.button("로그아웃", use_container_width=True):
+                logout_admin()
+                st.rerun()
 
-                st.divider()
-                st.markdown("**전체 삭제**")
-                st.caption("학생 명단과 해당 신청서가 모두 삭제됩니다.")
-                confirm_clear = st.checkbox("전체 삭제를 진행합니다.", key="confirm_clear_all")
-                if st.button("학생 명단 전체 삭제", use_container_width=True, type="secondary"):
-                    if not confirm_clear:
-                        st.warning("체크 후 다시 눌러주세요.")
+        st.divider()
+        tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs(
+            [
+                "👥 학생 명단 관리",
+                "⚙️ 승인 모드/학년도 설정",
+                "📊 통계",
+                "📄 문서 관리",
+                "🚪 정문 출입 명단",
+                "🛠 시스템 상태",
+            ]
+        )
+
+        with tab1:
+            st.subheader("👥 학생 명단 관리")
+            sub_tab1, sub_tab2 = st.tabs(["📤 CSV 업로드", "📝 개별 관리"])
+
+            with sub_tab1:
+                st.markdown(
+                    """
+                    **CSV 파일 형식**
+                    ```csv
+                    학번,이름,학년,반
+                    20250101,홍길동,1,1
+                    20250102,김영희,1,1
+                    ```
+                    """
+                )
+                st.download_button(
+                    label="서식파일 다운로드",
+                    data=_student_csv_template_bytes(),
+                    file_name="학생명단_업로드_서식.csv",
+                    mime="text/csv",
+                    use_container_width=True,
+                )
+                uploaded_file = st.file_uploader("CSV 파일 선택", type=["csv"], label_visibility="collapsed")
+                if uploaded_file is not None:
+                    file_content = uploaded_file.read()
+                    is_valid, message = validate_csv_format(file_content)
+                    if is_valid:
+                        st.success(message)
+                        students, _ = parse_student_csv(file_content)
+                        if st.button("학생 데이터 등록"):
+                            count = add_students(students)
+                            st.success(f"{count}명의 학생이 등록되었습니다.")
+                            st.rerun()
                     else:
-                        deleted_students, deleted_apps = clear_all_students_and_applications()
-                        st.success(f"삭제 완료: 학생 {deleted_students}명, 신청서 {deleted_apps}건")
+                        st.error(message)
+
+            with sub_tab2:
+                left, right = st.columns(2)
+                with left:
+                    st.markdown("**학생 추가**")
+                    with st.form("add_student_form"):
+                        student_id = st.text_input("학번")
+                        name = st.text_input("이름")
+                        grade = st.number_input("학년", min_value=1, max_value=6)
+                        class_num = st.number_input("반", min_value=1, max_value=10)
+                        if st.form_submit_button("추가"):
+                            try:
+                                add_student(student_id, name, int(grade), int(class_num))
+                                st.success("학생이 추가되었습니다.")
+                                st.rerun()
+                            except Exception as e:
+                                st.error(f"오류: {e}")
+
+                    st.divider()
+                    st.markdown("**전체 삭제**")
+                    st.caption("학생 명단과 해당 신청서가 모두 삭제됩니다.")
+                    confirm_clear = st.checkbox("전체 삭제를 진행합니다.", key="confirm_clear_all")
+                    if st.button("학생 명단 전체 삭제", use_container_width=True, type="secondary"):
+                        if not confirm_clear:
+                            st.warning("체크 후 다시 눌러주세요.")
+                        else:
+                            deleted_students, deleted_apps = clear_all_students_and_applications()
+                            st.success(f"삭제 완료: 학생 {deleted_students}명, 신청서 {deleted_apps}건")
+                            st.rerun()
+                with right:
+                    st.markdown("**현재 학생 목록**")
+                    students = get_all_students()
+                    if students:
+                        # 행마다 dict 로 바꾸지 않고 열 단위로 만든다.
+                        df = pd.DataFrame(
+                            {
+                                "학번": [s["student_id"] for s in students],
+                                "이름": [s["name"] for s in students],
+                                "학년": [s["grade"] for s in students],
+                                "반": [s["class_num"] for s in students],
+                            }
+                        )
+                        st.dataframe(df, use_container_width=True, hide_index=True)
+                        selected = st.selectbox("삭제할 학생", [f"{s['name']} ({s['student_id']})" for s in students])
+                        if selected and st.button("선택 학생 삭제", use_container_width=True):
+                            target_id = selected.split("(")[1].rstrip(")")
+                            delete_student(target_id)
+                            st.success("학생이 삭제되었습니다.")
+                            st.rerun()
+                    else:
+                        st.info("등록된 학생이 없습니다.")
+
+        with tab2:
+            st.subheader("⚙️ 승인 모드 설정")
+            st.info("- 즉시자동승인: 신청 즉시 자동승인\n- 자동승인(N분 후): 설정한 시간 뒤 자동승인\n- 수동승인: 관리자 승인 후 처리")
+            modes = ["instant_auto", "delayed_auto", "manual"]
+            mode_names = {
+                "instant_auto": "즉시자동승인",
+                "delayed_auto": "자동승인(N분 후)",
+                "manual": "수동승인",
+            }
+            cols = st.columns(3)
+            items = [
+                ("phone_approval_mode", "📱 휴대전화"),
+                ("tablet_approval_mode", "💻 태블릿PC"),
+                ("gate_approval_mode", "🚪 정문 출입"),
+            ]
+            for col, (key, title) in zip(cols, items):
+                with col:
+                    st.markdown(f"**{title}**")
+                    current = _get_setting(key, "manual")
+                    if current == "auto":
+                        current = "instant_auto"
+                    elif current == "auto_issue":
+                        current = "instant_auto"
+                    elif current == "instant_approve":
+                        current = "instant_auto"
+                    elif current == "delayed_approve":
+                        current = "delayed_auto"
+                    if current not in modes:
+                        current = "manual"
+
+                    delay_key = key.replace("_approval_mode", "_approval_delay_minutes")
+                    current_delay = int(_get_setting(delay_key, "10"))
+                    selected = st.selectbox(
+                        "모드",
+                        options=modes,
+                        format_func=lambda x: mode_names[x],
+                        index=modes.index(current),
+                        key=f"mode_{key}",
+                        label_visibility="collapsed",
+                    )
+                    delay_minutes = int(
+                        st.number_input(
+                            "N(분)",
+                            min_value=1,
+                            max_value=1440,
+                            value=current_delay,
+                            step=1,
+                            key=f"delay_{key}",
+                        )
+                    )
+                    if (selected != current or delay_minutes != current_delay) and st.button("저장", key=f"save_{key}"):
+                        _update_setting(key, selected)
+                        _update_setting(delay_key, str(delay_minutes))
+                        st.success("설정이 저장되었습니다.")
                         st.rerun()
-            with right:
-                st.markdown("**현재 학생 목록**")
-                students = get_all_students()
-                if students:
-                    df = pd.DataFrame(students)[["student_id", "name", "grade", "class_num"]].copy()
-                    df.columns = ["학번", "이름", "학년", "반"]
-                    st.dataframe(df, use_container_width=True, hide_index=True)
-                    selected = st.selectbox("삭제할 학생", [f"{s['name']} ({s['student_id']})" for s in students])
-                    if selected and st.button("선택 학생 삭제", use_container_width=True):
-                        target_id = selected.split("(")[1].rstrip(")")
-                        delete_student(target_id)
-                        st.success("학생이 삭제되었습니다.")
+
+            st.divider()
+            st.subheader("📅 학년도 설정")
+            default_year = int(_get_setting("academic_year", "2025"))
+            default_start = _parse_date(_get_setting("academic_year_start", f"{default_year}-03-01"), date(default_year, 3, 1))
+            ycol, scol = st.columns(2)
+            with ycol:
+                selected_year = int(st.number_input("학년도", min_value=2020, max_value=2100, value=default_year, step=1))
+            with scol:
+                selected_start = st.date_input("학년도 시작일", value=default_start)
+            computed_end = date(selected_year + 1, 2, 28)
+            st.info(f"학년도 마지막 날(자동): **{computed_end.year}-{computed_end.month:02d}-{computed_end.day:02d}**")
+            if st.button("학년도 설정 저장", type="primary"):
+                _update_setting("academic_year", str(selected_year))
+                _update_setting("academic_year_start", selected_start.isoformat())
+                st.success("학년도 설정이 저장되었습니다.")
+                st.rerun()
+
+        with tab3:
+            render_statistics_dashboard()
+
+            st.divider()
+            st.markdown("**전체 신청서 내보내기**")
+            if st.button("CSV 만들기", key="applications_export_build"):
+                st.session_state.applications_export = export_applications_csv()
+            if st.session_state.get("applications_export"):
+                st.download_button(
+                    "전체 신청서 CSV 다운로드",
+                    data=st.session_state.applications_export,
+                    file_name=f"신청서_전체_{date.today():%Y%m%d}.csv",
+                    mime="text/csv",
+                )
+
+        with tab4:
+            st.subheader("📄 문서 관리")
+            st.markdown("**학교장 확인 도장 이미지**")
+            current_stamp_path = _get_setting("principal_stamp_path", "")
+            if current_stamp_path and Path(current_stamp_path).exists():
+                st.caption(f"현재 파일: `{current_stamp_path}`")
+                st.image(str(Path(current_stamp_path)), width=220)
+            else:
+                st.info("현재 등록된 도장 이미지가 없습니다.")
+            stamp_file = st.file_uploader("도장 이미지 업로드", type=["png", "jpg", "jpeg"], help="투명 배경 PNG 권장")
+            d1, d2 = st.columns(2)
+            with d1:
+                if st.button("도장 저장", use_container_width=True, type="primary"):
+                    if stamp_file is None:
+                        st.warning("업로드할 이미지를 먼저 선택해주세요.")
+                    else:
+                        saved_path = _save_principal_stamp(stamp_file)
+                        _update_setting("principal_stamp_path", saved_path)
+                        st.success("도장 이미지가 저장되었습니다.")
                         st.rerun()
-                else:
-                    st.info("등록된 학생이 없습니다.")
-
-    with tab2:
-        st.subheader("⚙️ 승인 모드 설정")
-        st.info("- 즉시자동승인: 신청 즉시 자동승인\n- 자동승인(N분 후): 설정한 시간 뒤 자동승인\n- 수동승인: 관리자 승인 후 처리")
-        modes = ["instant_auto", "delayed_auto", "manual"]
-        mode_names = {
-            "instant_auto": "즉시자동승인",
-            "delayed_auto": "자동승인(N분 후)",
-            "manual": "수동승인",
-        }
-        cols = st.columns(3)
-        items = [
-            ("phone_approval_mode", "📱 휴대전화"),
-            ("tablet_approval_mode", "💻 태블릿PC"),
-            ("gate_approval_mode", "🚪 정문 출입"),
-        ]
-        for col, (key, title) in zip(cols, items):
-            with col:
-                st.markdown(f"**{title}**")
-                current = _get_setting(key, "manual")
-                if current == "auto":
-                    current = "instant_auto"
-                elif current == "auto_issue":
-                    current = "instant_auto"
-                elif current == "instant_approve":
-                    current = "instant_auto"
-                elif current == "delayed_approve":
-                    current = "delayed_auto"
-                if current not in modes:
-                    current = "manual"
-
-                delay_key = key.replace("_approval_mode", "_approval_delay_minutes")
-                current_delay = int(_get_setting(delay_key, "10"))
-                selected = st.selectbox(
-                    "모드",
-                    options=modes,
-                    format_func=lambda x: mode_names[x],
-                    index=modes.index(current),
-                    key=f"mode_{key}",
-                    label_visibility="collapsed",
+            with d2:
+                if st.button("도장 삭제", use_container_width=True):
+                    _delete_principal_stamp()
+                    _update_setting("principal_stamp_path", "")
+                    st.success("도장 이미지가 삭제되었습니다.")
+                    st.rerun()
+
+        with tab5:
+            h1, h2 = st.columns([10, 1])
+            with h1:
+                st.subheader("🚪 정문 출입 명단")
+            with h2:
+                gate_sheet_url = get_gate_sheet_url()
+                if gate_sheet_url:
+                    st.link_button("🔗", gate_sheet_url, help="구글시트 바로가기", use_container_width=True)
+            st.caption("승인 완료된 정문 출입 신청만 표시합니다.")
+
+            st.markdown("**📋 요일별 당번 명단**")
+            duty_table = get_gate_duty_table()
+            today_weekday = weekday_of(date.today()) or WEEKDAYS[0]
+            w1, w2 = st.columns([1, 3])
+            with w1:
+                duty_day = st.selectbox("요일", WEEKDAYS, index=WEEKDAYS.index(today_weekday), key="gate_duty_day")
+            with w2:
+                duty_slot = st.radio(
+                    "구분",
+                    GATE_DUTY_SLOTS,
+                    format_func=lambda x: f"{get_gate_duty_slot_label(x)} {len(duty_table[duty_day][x])}명",
+                    horizontal=True,
+                    key="gate_duty_slot",
                 )
-                delay_minutes = int(
-                    st.number_input(
-                        "N(분)",
-                        min_value=1,
-                        max_value=1440,
-                        value=current_delay,
-                        step=1,
-                        key=f"delay_{key}",
+            duty_rows = duty_table[duty_day][duty_slot]
+            if not duty_rows:
+                st.info(f"{duty_day}요일 {get_gate_duty_slot_label(duty_slot)} 명단이 없습니다.")
+            else:
+                duty_df = pd.DataFrame(duty_rows)[["grade", "class_num", "student_id", "name", "reason"]]
+                duty_df.columns = ["학년", "반", "학번", "성명", "사유"]
+                st.dataframe(duty_df, use_container_width=True, hide_index=True)
+                duty_file = f"gate_duty_{duty_day}_{duty_slot}"
+                e1, e2 = st.columns(2)
+                with e1:
+                    st.download_button(
+                        "CSV 다운로드",
+                        data=gate_duty_to_csv(duty_rows),
+                        file_name=f"{duty_file}.csv",
+                        mime="text/csv",
+                        use_container_width=True,
+                    )
+                with e2:
+                    st.download_button(
+                        "인쇄용 PDF",
+                        data=get_gate_duty_sheet_pdf(duty_day, duty_slot),
+                        file_name=f"{duty_file}.pdf",
+                        mime="application/pdf",
+                        use_container_width=True,
                     )
-                )
-                if (selected != current or delay_minutes != current_delay) and st.button("저장", key=f"save_{key}"):
-                    _update_setting(key, selected)
-                    _update_setting(delay_key, str(delay_minutes))
-                    st.success("설정이 저장되었습니다.")
-                    st.rerun()
 
-        st.divider()
-        st.subheader("📅 학년도 설정")
-        default_year = int(_get_setting("academic_year", "2025"))
-        default_start = _parse_date(_get_setting("academic_year_start", f"{default_year}-03-01"), date(default_year, 3, 1))
-        ycol, scol = st.columns(2)
-        with ycol:
-            selected_year = int(st.number_input("학년도", min_value=2020, max_value=2100, value=default_year, step=1))
-        with scol:
-            selected_start = st.date_input("학년도 시작일", value=default_start)
-        computed_end = date(selected_year + 1, 2, 28)
-        st.info(f"학년도 마지막 날(자동): **{computed_end.year}-{computed_end.month:02d}-{computed_end.day:02d}**")
-        if st.button("학년도 설정 저장", type="primary"):
-            _update_setting("academic_year", str(selected_year))
-            _update_setting("academic_year_start", selected_start.isoformat())
-            st.success("학년도 설정이 저장되었습니다.")
-            st.rerun()
-
-    with tab3:
-        render_statistics_dashboard()
-
-    with tab4:
-        st.subheader("📄 문서 관리")
-        st.markdown("**학교장 확인 도장 이미지**")
-        current_stamp_path = _get_setting("principal_stamp_path", "")
-        if current_stamp_path and Path(current_stamp_path).exists():
-            st.caption(f"현재 파일: `{current_stamp_path}`")
-            st.image(str(Path(current_stamp_path)), width=220)
-        else:
-            st.info("현재 등록된 도장 이미지가 없습니다.")
-        stamp_file = st.file_uploader("도장 이미지 업로드", type=["png", "jpg", "jpeg"], help="투명 배경 PNG 권장")
-        d1, d2 = st.columns(2)
-        with d1:
-            if st.button("도장 저장", use_container_width=True, type="primary"):
-                if stamp_file is None:
-                    st.warning("업로드할 이미지를 먼저 선택해주세요.")
+            st.divider()
+            st.markdown("**전체 명단**")
+            roster_rows = get_gate_roster_rows()
+            if not roster_rows:
+                st.info("표시할 정문 출입 명단이 없습니다.")
+            else:
+                df = pd.DataFrame(roster_rows)
+                st.dataframe(df, use_container_width=True, hide_index=True, height=620)
+
+                if st.button("구글시트 업로드 (A4:M)"):
+                    try:
+                        count = _sync_google_sheet(roster_rows)
+                        st.success(f"구글시트 업로드 완료: {count}행")
+                    except Exception as e:
+                        st.error(f"업로드 실패: {e}")
+
+        with tab6:
+            st.subheader("🛠 시스템 상태")
+            if not can_view_system_status():
+                # 캐시/쿼리 통계/느린 요청은 모든 학교가 함께 쓰는 프로세스 전체 값이라 학교별로 나눌 수 없다.
+                st.info("여러 학교가 함께 쓰는 서버 전체 상태라 배포 관리자만 볼 수 있습니다.")
+                with st.form("system_admin_auth_form"):
+                    system_password = st.text_input("배포 관리자 비밀번호", type="password")
+                    if st.form_submit_button("확인", use_container_width=True):
+                        if authenticate_system_admin(system_password):
+                            st.session_state.system_admin_authenticated = True
+                            st.rerun()
+                        else:
+                            st.error("비밀번호가 올바르지 않습니다.")
+            else:
+                st.markdown("**공유 캐시 (학생 명단/정문 출입 명단)**")
+                cache_stats = get_shared_cache_stats()
+                m1, m2, m3, m4 = st.columns(4)
+                with m1:
+                    st.metric("적중률", f"{cache_stats['hit_ratio'] * 100:.1f}%")
+                with m2:
+                    st.metric("적중/미스", f"{cache_stats['hits']} / {cache_stats['misses']}")
+                with m3:
+                    st.metric("항목 수", f"{cache_stats['entries']} / {cache_stats['max_entries']}")
+                with m4:
+                    st.metric("메모리(추정)", f"{cache_stats['approx_bytes'] / 1024:.1f} KB")
+                st.caption(f"테이블 세대: {cache_stats['generations'] or '-'} · 제거된 항목: {cache_stats['evictions']}")
+
+                st.divider()
+                st.markdown("**문장 캐시 (SQL 정규화 / prepared statement)**")
+                stmt_stats = get_statement_cache_stats()
+                c1, c2, c3, c4 = st.columns(4)
+                with c1:
+                    st.metric("적중률", f"{stmt_stats['hit_ratio'] * 100:.1f}%")
+                with c2:
+                    st.metric("적중/미스", f"{stmt_stats['hits']} / {stmt_stats['misses']}")
+                with c3:
+                    st.metric("항목 수", f"{stmt_stats['entries']} / {stmt_stats['max_entries']}")
+                with c4:
+                    st.metric("prepared 실행 비율", f"{stmt_stats['prepared_ratio'] * 100:.1f}%")
+                if stmt_stats["prepare_enabled"] is False:
+                    st.caption("트랜잭션 풀러(6543) 연결이라 prepared statement 를 쓰지 않고 매번 일반 실행합니다.")
                 else:
-                    saved_path = _save_principal_stamp(stamp_file)
-                    _update_setting("principal_stamp_path", saved_path)
-                    st.success("도장 이미지가 저장되었습니다.")
-                    st.rerun()
-        with d2:
-            if st.button("도장 삭제", use_container_width=True):
-                _delete_principal_stamp()
-                _update_setting("principal_stamp_path", "")
-                st.success("도장 이미지가 삭제되었습니다.")
-                st.rerun()
+                    st.caption(f"같은 문장을 {stmt_stats['prepare_threshold']}번째 실행할 때부터 서버에 prepare 합니다.")
+
+                st.divider()
+                st.markdown("**쿼리 통계**")
+                q1, q2 = st.columns([3, 1])
+                with q1:
+                    stats_enabled = st.toggle("쿼리 시간 측정", value=query_stats.ENABLED, key="query_stats_toggle")
+                    if stats_enabled != query_stats.ENABLED:
+                        query_stats.set_query_stats_enabled(stats_enabled)
+                with q2:
+                    if st.button("통계 초기화", use_container_width=True):
+                        query_stats.reset_query_stats()
+                        st.rerun()
+                top_queries = query_stats.get_query_stats(top=20)
+                if top_queries:
+                    st.dataframe(pd.DataFrame(top_queries), use_container_width=True, hide_index=True)
+                else:
+                    st.info("수집된 쿼리 통계가 없습니다. 측정을 켜면 이후 쿼리부터 집계됩니다.")
+                slow_queries = query_stats.get_slow_queries()
+                if slow_queries:
+                    st.markdown("**느린 쿼리 로그**")
+                    slow_df = pd.DataFrame(slow_queries)
+                    slow_df["at"] = pd.to_datetime(slow_df["at"], unit="s")
+                    st.dataframe(slow_df, use_container_width=True, hide_index=True)
+
+                st.divider()
+                st.markdown("**느린 요청 (최근 요청 중 상위 20건)**")
+                slow_traces = get_slow_traces(limit=20)
+                if slow_traces:
+                    trace_df = pd.DataFrame(slow_traces)
+                    trace_df["started_at"] = pd.to_datetime(trace_df["started_at"], unit="s")
+                    st.dataframe(trace_df, use_container_width=True, hide_index=True)
+                else:
+                    st.info("기록된 요청이 없습니다.")
+
 
-    with tab5:
-        h1, h2 = st.columns([10, 1])
-        with h1:
-            st.subheader("🚪 정문 출입 명단")
-        with h2:
-            st.link_button("🔗", GATE_SHEET_URL, help="구글시트 바로가기", use_container_width=True)
-        st.caption("승인 완료된 정문 출입 신청만 표시합니다.")
-        roster_rows = _get_gate_roster_rows()
-        if not roster_rows:
-            st.info("표시할 정문 출입 명단이 없습니다.")
-        else:
-            df = pd.DataFrame(roster_rows)
-            st.dataframe(df, use_container_width=True, hide_index=True, height=620)
-
-            if st.button("구글시트 업로드 (A4:M)"):
-                try:
-                    count = _sync_google_sheet(roster_rows)
-                    st.success(f"구글시트 업로드 완료: {count}행")
-                except Exception as e:
-                    st.error(f"업로드 실패: {e}")
+# st.rerun()/st.stop() 로 중간에 끝나도 trace 를 닫는다.
+with page_trace("page.admin"):
+    main()
@@ -1,108 +1,214 @@
+import csv
+import io
+from datetime import datetime
 from typing import Dict, List, Optional
 
-from database.db_manager import execute_delete, execute_insert, execute_query, execute_update
-from utils.approval_number import generate_approval_number
+from database.db_manager import execute_batch, execute_delete, execute_insert, execute_query, stream_query
+from database.records import Application
+from database.request_cache import request_cached
+from database.shared_cache import bump_generation
+from services.application_state import transition_applications
+from utils.approval_number import get_approval_number_prefix
 from utils.google_sync import sync_gate_roster_to_google_sheet
+from utils.tracing import traced
+
+# Backward compatibility with old values.
+_APPROVAL_MODE_ALIASES = {
+    "auto": "instant_auto",
+    "auto_issue": "instant_auto",
+    "instant_approve": "instant_auto",
+    "delayed_approve": "delayed_auto",
+    "instant_auto": "instant_auto",
+    "delayed_auto": "delayed_auto",
+    "manual": "manual",
+}
+_APPROVAL_MODE_CASE_SQL = "CASE (SELECT value FROM settings WHERE key = %(mode_key)s) {} ELSE 'manual' END".format(
+    " ".join(f"WHEN '{raw}' THEN '{mode}'" for raw, mode in _APPROVAL_MODE_ALIASES.items())
+)
+
+# 승인 모드/지연 시간 조회, (즉시 자동승인 정문 출입이면) 승인번호 발급, INSERT 를 한 문장으로 처리한다.
+# 같은 유형 신청서가 이미 있으면 ON CONFLICT 로 건너뛰고 id 가 NULL 인 행을 돌려준다.
+SUBMIT_APPLICATION_QUERY = f"""
+WITH cfg AS (
+    SELECT {_APPROVAL_MODE_CASE_SQL} AS approval_mode,
+           (SELECT value FROM settings WHERE key = %(delay_key)s) AS delay_value
+),
+counter AS (
+    INSERT INTO approval_counters (application_type, year, last_seq)
+    SELECT %(application_type)s, %(year)s, 1
+    FROM cfg
+    WHERE cfg.approval_mode = 'instant_auto'
+      AND %(numbered)s
+      AND NOT EXISTS (
+          SELECT 1 FROM applications
+          WHERE student_id = %(student_id)s AND application_type = %(application_type)s
+      )
+    ON CONFLICT (application_type, year)
+    DO UPDATE SET last_seq = approval_counters.last_seq + 1
+    RETURNING last_seq
+),
+inserted AS (
+    INSERT INTO applications (
+        student_id, application_type, reason, extra_info, status,
+        approved_at, approved_by, approval_number
+    )
+    SELECT %(student_id)s, %(application_type)s, %(reason)s, %(extra_info)s,
+           CASE WHEN cfg.approval_mode = 'instant_auto' THEN 'auto_approved' ELSE 'pending' END,
+           CASE WHEN cfg.approval_mode = 'instant_auto' THEN now() END,
+           CASE WHEN cfg.approval_mode = 'instant_auto' THEN 'system_auto' END,
+           (SELECT %(number_prefix)s || lpad(last_seq::text, greatest(4, length(last_seq::text)), '0') FROM counter)
+    FROM cfg
+    ON CONFLICT (student_id, application_type) DO NOTHING
+    RETURNING id, status
+)
+SELECT cfg.approval_mode, cfg.delay_value, inserted.id, inserted.status
+FROM cfg
+LEFT JOIN inserted ON true
+"""
+
+CANCEL_APPLICATION_QUERY = """
+DELETE FROM applications
+WHERE id = ?
+  AND student_id = ?
+  AND status IN ('pending', 'approved', 'auto_approved')
+RETURNING application_type
+"""
+
+DELAYED_TARGETS_QUERY = """
+SELECT id
+FROM applications
+WHERE status = 'pending'
+  AND application_type = ?
+  AND submitted_at <= now() - ((? || ' minutes')::interval)
+ORDER BY submitted_at ASC
+"""
+
+
+STATISTICS_QUERY = """
+SELECT COUNT(*) AS total,
+       COUNT(*) FILTER (WHERE status = 'pending') AS pending,
+       COUNT(*) FILTER (WHERE status IN ('approved', 'auto_approved')) AS approved,
+       COUNT(*) FILTER (WHERE status = 'rejected') AS rejected
+FROM applications
+"""
+
+STATISTICS_BY_TYPE_QUERY = """
+SELECT application_type, status, COUNT(*) as count
+FROM applications
+GROUP BY application_type, status
+ORDER BY application_type, status
+"""
+
+STATISTICS_BY_GRADE_QUERY = """
+SELECT s.grade, COUNT(*) as count
+FROM applications a
+JOIN students s ON a.student_id = s.student_id
+GROUP BY s.grade
+ORDER BY s.grade
+"""
+
+
+def build_submit_params(student_id: str, application_type: str, reason: str, extra_info: str = None) -> dict:
+    year = datetime.now().year
+    return {
+        "mode_key": f"{application_type}_approval_mode",
+        "delay_key": f"{application_type}_approval_delay_minutes",
+        "student_id": student_id,
+        "application_type": application_type,
+        "reason": reason,
+        "extra_info": extra_info,
+        "year": year,
+        "numbered": application_type == "gate",
+        "number_prefix": get_approval_number_prefix(application_type, year),
+    }
+
+
+def _submit_message(row: Dict, sync_result: tuple = None) -> str:
+    if row["status"] == "auto_approved":
+        if sync_result is not None:
+            ok, sync_msg = sync_result
+            if ok:
+                return f"신청이 완료되었습니다. {sync_msg}"
+            return f"신청이 완료되었습니다. ({sync_msg})"
+        return "신청이 완료되었습니다. (즉시 자동승인)"
+
+    if row["approval_mode"] == "delayed_auto":
+        return f"신청이 완료되었습니다. ({_parse_delay_minutes(row['delay_value'])}분 후 자동승인)"
+
+    return "신청이 완료되었습니다. (수동 승인 대기)"
+
+
+def _cancel_message(sync_result: tuple = None) -> str:
+    if sync_result is not None:
+        ok, sync_msg = sync_result
+        if ok:
+            return f"신청이 취소되었습니다. {sync_msg}"
+        return f"신청이 취소되었습니다. ({sync_msg})"
+    return "신청이 취소되었습니다."
 
 
+@traced()
 def submit_application(
     student_id: str, application_type: str, reason: str, extra_info: str = None
 ) -> tuple[bool, str]:
     try:
+        # 같은 실행에서 이미 처리했다면 요청 캐시 덕분에 추가 조회가 없다.
         _apply_delayed_approvals()
-        approval_mode = _normalize_approval_mode(_get_approval_mode(application_type))
-
-        if approval_mode == "instant_auto":
-            status = "auto_approved"
-            approval_number = generate_approval_number(application_type) if application_type == "gate" else None
-            approved_by = "system_auto"
-        else:
-            status = "pending"
-            approval_number = None
-            approved_by = None
-
-        query = """
-        INSERT INTO applications (
-            student_id, application_type, reason, extra_info, status,
-            approved_at, approved_by, approval_number
-        ) VALUES (?, ?, ?, ?, ?, CASE WHEN ? = 'auto_approved' THEN now() ELSE NULL END, ?, ?)
-        """
-        execute_insert(
-            query,
-            (
-                student_id,
-                application_type,
-                reason,
-                extra_info,
-                status,
-                status,
-                approved_by,
-                approval_number,
-            ),
-        )
-
-        if status == "auto_approved":
-            if application_type == "gate":
-                ok, sync_msg = sync_gate_roster_to_google_sheet()
-                if ok:
-                    return True, f"신청이 완료되었습니다. {sync_msg}"
-                return True, f"신청이 완료되었습니다. ({sync_msg})"
-            return True, "신청이 완료되었습니다. (즉시 자동승인)"
-
-        if approval_mode == "delayed_auto":
-            delay_minutes = _get_delay_minutes(application_type)
-            return True, f"신청이 완료되었습니다. ({delay_minutes}분 후 자동승인)"
+        params = build_submit_params(student_id, application_type, reason, extra_info)
+        row = execute_insert(SUBMIT_APPLICATION_QUERY, params, returning=True)[0]
+        if row["id"] is None:
+            return False, "이미 같은 유형의 신청서가 있습니다."
+        bump_generation("applications")
 
-        return True, "신청이 완료되었습니다. (수동 승인 대기)"
+        sync_result = None
+        if row["status"] == "auto_approved" and application_type == "gate":
+            sync_result = sync_gate_roster_to_google_sheet()
+        return True, _submit_message(row, sync_result)
 
     except Exception as e:
-        if "UNIQUE" in str(e).upper():
-            return False, "이미 같은 유형의 신청서가 있습니다."
         return False, f"오류가 발생했습니다: {e}"
 
 
-def get_student_applications(student_id: str) -> List[Dict]:
+@traced()
+@request_cached
+def get_student_applications(student_id: str) -> List[Application]:
     _apply_delayed_approvals()
     query = """
     SELECT * FROM applications
     WHERE student_id = ?
     ORDER BY submitted_at DESC
     """
-    results = execute_query(query, (student_id,))
-    return [dict(row) for row in results]
+    return execute_query(query, (student_id,), row_type=Application, read_only=True)
 
 
+@traced()
 def cancel_student_application(app_id: int, student_id: str) -> tuple[bool, str]:
     try:
         _apply_delayed_approvals()
-        app = get_application(app_id)
-        query = """
-        DELETE FROM applications
-        WHERE id = ?
-          AND student_id = ?
-          AND status IN ('pending', 'approved', 'auto_approved')
-        """
-        deleted = execute_delete(query, (app_id, student_id))
-        if deleted <= 0:
+        deleted = execute_delete(CANCEL_APPLICATION_QUERY, (app_id, student_id), returning=True)
+        if not deleted:
             return False, "취소 가능한 신청서가 없습니다."
+        bump_generation("applications")
 
-        if app and app.get("application_type") == "gate":
-            ok, sync_msg = sync_gate_roster_to_google_sheet()
-            if ok:
-                return True, f"신청이 취소되었습니다. {sync_msg}"
-            return True, f"신청이 취소되었습니다. ({sync_msg})"
-        return True, "신청이 취소되었습니다."
+        sync_result = None
+        if deleted[0]["application_type"] == "gate":
+            sync_result = sync_gate_roster_to_google_sheet()
+        return True, _cancel_message(sync_result)
     except Exception as e:
         return False, f"신청 취소 중 오류가 발생했습니다: {e}"
 
 
-def get_application(app_id: int) -> Optional[Dict]:
+@traced()
+@request_cached
+def get_application(app_id: int) -> Optional[Application]:
     query = "SELECT * FROM applications WHERE id = ?"
-    result = execute_query(query, (app_id,))
-    return dict(result[0]) if result else None
+    result = execute_query(query, (app_id,), row_type=Application)
+    return result[0] if result else None
 
 
-def get_pending_applications() -> List[Dict]:
+@traced()
+@request_cached
+def get_pending_applications() -> List[Application]:
     _apply_delayed_approvals()
     query = """
     SELECT a.*, s.grade, s.class_num, s.name
@@ -111,55 +217,216 @@ def get_pending_applications() -> List[Dict]:
     WHERE a.status = 'pending'
     ORDER BY a.submitted_at ASC
     """
-    results = execute_query(query)
-    return [dict(row) for row in results]
+    return execute_query(query, row_type=Application)
+
+
+def _pending_filter_clause(
+    application_type: str = None, grade: int = None, class_num: int = None, name_query: str = None
+) -> tuple[str, list]:
+    clauses = []
+    params = []
+    if application_type:
+        clauses.append("AND a.application_type = ?")
+        params.append(application_type)
+    if grade:
+        clauses.append("AND s.grade = ?")
+        params.append(grade)
+    if class_num:
+        clauses.append("AND s.class_num = ?")
+        params.append(class_num)
+    if name_query and name_query.strip():
+        escaped = name_query.strip().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        clauses.append("AND (s.name ILIKE ? OR a.student_id LIKE ?)")
+        params.extend([f"%{escaped}%", f"{escaped}%"])
+    return "\n    ".join(clauses), params
+
+
+@traced()
+@request_cached
+def get_pending_applications_page(
+    limit: int = 20,
+    after: Optional[tuple] = None,
+    application_type: str = None,
+    grade: int = None,
+    class_num: int = None,
+    name_query: str = None,
+) -> tuple[List[Application], Optional[tuple]]:
+    """
+    승인 대기 목록을 (submitted_at, id) 키셋 기준으로 limit 건씩 조회
 
+    Returns:
+        (신청서 목록, 다음 페이지 커서 또는 None)
+    """
+    _apply_delayed_approvals()
+    query, params = _pending_page_statement(limit, after, application_type, grade, class_num, name_query)
+    return _split_pending_page(execute_query(query, params, row_type=Application), limit)
+
+
+@traced()
+@request_cached
+def count_pending_applications(
+    application_type: str = None, grade: int = None, class_num: int = None, name_query: str = None
+) -> int:
+    query, params = _pending_count_statement(application_type, grade, class_num, name_query)
+    return execute_query(query, params)[0]["count"]
+
+
+@traced()
+@request_cached
+def get_pending_overview(
+    limit: int = 20,
+    after: Optional[tuple] = None,
+    application_type: str = None,
+    grade: int = None,
+    class_num: int = None,
+    name_query: str = None,
+) -> tuple[int, List[Application], Optional[tuple]]:
+    """
+    승인 대기 건수와 현재 페이지를 한 번의 왕복(pipeline)으로 조회
 
-def get_approved_applications(student_id: str) -> List[Dict]:
+    Returns:
+        (전체 대기 건수, 신청서 목록, 다음 페이지 커서 또는 None)
+    """
+    _apply_delayed_approvals()
+    count_rows, page_rows = execute_batch(
+        [
+            _pending_count_statement(application_type, grade, class_num, name_query),
+            (*_pending_page_statement(limit, after, application_type, grade, class_num, name_query), Application),
+        ]
+    )
+    rows, next_cursor = _split_pending_page(page_rows, limit)
+    return count_rows[0]["count"], rows, next_cursor
+
+
+def _pending_page_statement(
+    limit: int, after: Optional[tuple], application_type: str, grade: int, class_num: int, name_query: str
+) -> tuple[str, tuple]:
+    filter_sql, params = _pending_filter_clause(application_type, grade, class_num, name_query)
+    keyset_sql = ""
+    if after:
+        keyset_sql = "AND (a.submitted_at, a.id) > (?, ?)"
+        params.extend(after)
+    query = f"""
+    SELECT a.*, s.grade, s.class_num, s.name
+    FROM applications a
+    JOIN students s ON a.student_id = s.student_id
+    WHERE a.status = 'pending'
+    {filter_sql}
+    {keyset_sql}
+    ORDER BY a.submitted_at ASC, a.id ASC
+    LIMIT ?
+    """
+    params.append(limit + 1)
+    return query, tuple(params)
+
+
+def _pending_count_statement(
+    application_type: str, grade: int, class_num: int, name_query: str
+) -> tuple[str, tuple]:
+    filter_sql, params = _pending_filter_clause(application_type, grade, class_num, name_query)
+    query = f"""
+    SELECT COUNT(*) as count
+    FROM applications a
+    JOIN students s ON a.student_id = s.student_id
+    WHERE a.status = 'pending'
+    {filter_sql}
+    """
+    return query, tuple(params)
+
+
+def _split_pending_page(rows: List[Application], limit: int) -> tuple[List[Application], Optional[tuple]]:
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        return rows, (last["submitted_at"], last["id"])
+    return rows, None
+
+
+@traced()
+@request_cached
+def get_approved_applications(student_id: str) -> List[Application]:
     _apply_delayed_approvals()
     query = """
     SELECT * FROM applications
     WHERE student_id = ? AND status IN ('approved', 'auto_approved')
     ORDER BY approved_at DESC
     """
-    results = execute_query(query, (student_id,))
-    return [dict(row) for row in results]
+    return execute_query(query, (student_id,), row_type=Application, read_only=True)
 
 
+@traced()
+@request_cached
 def get_statistics() -> Dict:
     _apply_delayed_approvals()
-    total = execute_query("SELECT COUNT(*) as count FROM applications")[0]["count"]
-    pending = execute_query("SELECT COUNT(*) as count FROM applications WHERE status = 'pending'")[0]["count"]
-    approved = execute_query(
-        "SELECT COUNT(*) as count FROM applications WHERE status IN ('approved', 'auto_approved')"
-    )[0]["count"]
-    rejected = execute_query("SELECT COUNT(*) as count FROM applications WHERE status = 'rejected'")[0]["count"]
-    return {"total": total, "pending": pending, "approved": approved, "rejected": rejected}
+    return execute_query(STATISTICS_QUERY, read_only=True)[0]
 
 
+@traced()
+@request_cached
 def get_statistics_by_type() -> List[Dict]:
     _apply_delayed_approvals()
-    query = """
-    SELECT application_type, status, COUNT(*) as count
-    FROM applications
-    GROUP BY application_type, status
-    ORDER BY application_type, status
-    """
-    results = execute_query(query)
-    return [dict(row) for row in results]
+    return execute_query(STATISTICS_BY_TYPE_QUERY, read_only=True)
 
 
+@traced()
+@request_cached
 def get_statistics_by_grade() -> List[Dict]:
     _apply_delayed_approvals()
+    return execute_query(STATISTICS_BY_GRADE_QUERY, read_only=True)
+
+
+@traced()
+@request_cached
+def get_dashboard_statistics() -> Dict:
+    """통계 대시보드용 요약/유형별/학년별 통계를 한 번의 왕복(pipeline)으로 조회"""
+    _apply_delayed_approvals()
+    summary, by_type, by_grade = execute_batch(
+        [(STATISTICS_QUERY, None), (STATISTICS_BY_TYPE_QUERY, None), (STATISTICS_BY_GRADE_QUERY, None)],
+        read_only=True,
+    )
+    return {"summary": summary[0], "by_type": by_type, "by_grade": by_grade}
+
+
+APPLICATIONS_CSV_HEADER = [
+    "번호", "학년", "반", "학번", "성명", "유형", "상태", "사유", "신청일시", "승인일시", "승인번호", "반려사유"
+]
+
+
+@traced()
+def export_applications_csv() -> bytes:
+    """전체 신청서 CSV (엑셀 호환 UTF-8 BOM). 행은 서버 커서로 나눠 받아 바로 쓴다."""
     query = """
-    SELECT s.grade, COUNT(*) as count
+    SELECT a.id, s.grade, s.class_num, a.student_id, s.name, a.application_type, a.status,
+           a.reason, a.submitted_at, a.approved_at, a.approval_number, a.rejection_reason
     FROM applications a
     JOIN students s ON a.student_id = s.student_id
-    GROUP BY s.grade
-    ORDER BY s.grade
+    ORDER BY s.grade, s.class_num, s.name, a.application_type
     """
-    results = execute_query(query)
-    return [dict(row) for row in results]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(APPLICATIONS_CSV_HEADER)
+    for row in stream_query(query, read_only=True):
+        writer.writerow(
+            [
+                row["id"],
+                row["grade"],
+                row["class_num"],
+                row["student_id"],
+                row["name"],
+                get_application_type_name(row["application_type"]),
+                get_status_name(row["status"]),
+                row["reason"],
+                _format_timestamp(row["submitted_at"]),
+                _format_timestamp(row["approved_at"]),
+                row["approval_number"] or "",
+                row["rejection_reason"] or "",
+            ]
+        )
+    return buffer.getvalue().encode("utf-8-sig")
+
+
+def _format_timestamp(value) -> str:
+    return value.strftime("%Y-%m-%d %H:%M") if value else ""
 
 
 def get_application_type_name(app_type: str) -> str:
@@ -177,83 +444,78 @@ def get_status_name(status: str) -> str:
     return names.get(status, status)
 
 
+@request_cached
+def _get_approval_settings() -> Dict[str, str]:
+    # 유형별 승인 모드/지연 시간 6개 키를 한 번에 읽는다.
+    keys = [
+        f"{app_type}_{suffix}"
+        for app_type in ("phone", "tablet", "gate")
+        for suffix in ("approval_mode", "approval_delay_minutes")
+    ]
+    rows = execute_query("SELECT key, value FROM settings WHERE key = ANY(?)", (keys,))
+    return {row["key"]: row["value"] for row in rows}
+
+
 def _get_approval_mode(application_type: str) -> str:
-    type_key = f"{application_type}_approval_mode"
-    result = execute_query("SELECT value FROM settings WHERE key = ?", (type_key,))
-    if result:
-        return result[0]["value"]
-    return "manual"
+    return _get_approval_settings().get(f"{application_type}_approval_mode") or "manual"
 
 
 def _normalize_approval_mode(mode: str) -> str:
-    # Backward compatibility with old values.
-    if mode == "auto":
-        return "instant_auto"
-    if mode == "auto_issue":
-        return "instant_auto"
-    if mode == "instant_approve":
-        return "instant_auto"
-    if mode == "delayed_approve":
-        return "delayed_auto"
-    if mode in ("instant_auto", "delayed_auto", "manual"):
-        return mode
-    return "manual"
+    return _APPROVAL_MODE_ALIASES.get(mode, "manual")
 
 
 def _get_delay_minutes(application_type: str) -> int:
-    key = f"{application_type}_approval_delay_minutes"
-    result = execute_query("SELECT value FROM settings WHERE key = ?", (key,))
-    if not result:
-        return 10
+    return _parse_delay_minutes(_get_approval_settings().get(f"{application_type}_approval_delay_minutes"))
+
 
+def _parse_delay_minutes(value) -> int:
+    if value is None:
+        return 10
     try:
-        value = int(result[0]["value"])
-        return max(1, min(1440, value))
+        return max(1, min(1440, int(value)))
     except Exception:
         return 10
 
 
+@traced()
+def apply_delayed_approvals() -> int:
+    """지연 자동승인 대상 처리 (worker 작업용, 요청 캐시를 거치지 않음). 승인된 건수 반환"""
+    return _run_delayed_approvals()
+
+
+@request_cached
 def _apply_delayed_approvals():
+    # 페이지 한 번 실행에 한 번만 수행한다.
+    _run_delayed_approvals()
+
+
+def _run_delayed_approvals():
     delayed_types = []
     for app_type in ("phone", "tablet", "gate"):
         if _normalize_approval_mode(_get_approval_mode(app_type)) == "delayed_auto":
             delayed_types.append(app_type)
 
     if not delayed_types:
-        return
+        return 0
 
+    # 유형별 대상 조회는 서로 독립적이라 한 번의 왕복으로 보낸다.
+    target_lists = execute_batch(
+        [(DELAYED_TARGETS_QUERY, (app_type, str(_get_delay_minutes(app_type)))) for app_type in delayed_types]
+    )
+
+    approved_count = 0
     gate_changed = False
-    for app_type in delayed_types:
-        delay_minutes = _get_delay_minutes(app_type)
-        targets = execute_query(
-            """
-            SELECT id
-            FROM applications
-            WHERE status = 'pending'
-              AND application_type = ?
-              AND submitted_at <= now() - ((? || ' minutes')::interval)
-            ORDER BY submitted_at ASC
-            """,
-            (app_type, str(delay_minutes)),
-        )
+    for app_type, targets in zip(delayed_types, target_lists):
+        if not targets:
+            continue
 
-        for row in targets:
-            app_id = row["id"]
-            approval_number = generate_approval_number("gate") if app_type == "gate" else None
-            execute_update(
-                """
-                UPDATE applications
-                SET status = 'auto_approved',
-                    approved_at = now(),
-                    approved_by = ?,
-                    approval_number = ?
-                WHERE id = ?
-                  AND status = 'pending'
-                """,
-                ("system_delay", approval_number, app_id),
-            )
-            if app_type == "gate":
-                gate_changed = True
+        approved = transition_applications(
+            [row["id"] for row in targets], "auto_approved", approved_by="system_delay"
+        )
+        approved_count += len(approved)
+        if approved and app_type == "gate":
+            gate_changed = True
 
     if gate_changed:
         sync_gate_roster_to_google_sheet()
+    return approved_count
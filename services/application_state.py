@@ -0,0 +1,168 @@
+"""
+신청서 상태 전이 (compare-and-set)
+
+모든 상태 변경은 `WHERE status = <기대 상태>` (+ 선택적으로 version) 조건의 단일 UPDATE로
+처리하고 RETURNING 으로 변경된 행을 돌려받는다. 동시에 같은 행을 처리하면 한 쪽만 성공하고
+나머지는 None/빈 목록을 받는다. 정문 출입 승인번호는 같은 문장 안에서 approval_counters 로
+발급하므로, 전이에 실패한 쪽은 번호를 소모하지 않는다.
+"""
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from database.db_manager import execute_update
+from database.records import Application
+from database.shared_cache import bump_generation
+from utils.tracing import traced
+from utils.approval_number import get_approval_number_prefix
+
+ALLOWED_TRANSITIONS = {
+    "pending": {"approved", "auto_approved", "rejected"},
+}
+APPROVED_STATUSES = ("approved", "auto_approved")
+NUMBERED_TYPES = ("gate",)
+
+
+def can_transition(from_status: str, to_status: str) -> bool:
+    return to_status in ALLOWED_TRANSITIONS.get(from_status, set())
+
+
+@traced()
+def transition_application(
+    app_id: int,
+    to_status: str,
+    from_status: str = "pending",
+    expected_version: int = None,
+    approved_by: str = None,
+    rejection_reason: str = None,
+) -> Optional[Application]:
+    """단건 전이. 성공 시 변경된 행, 상태/버전이 달라 실패하면 None."""
+    rows = transition_applications(
+        [app_id],
+        to_status,
+        from_status=from_status,
+        expected_version=expected_version,
+        approved_by=approved_by,
+        rejection_reason=rejection_reason,
+    )
+    return rows[0] if rows else None
+
+
+@traced()
+def transition_applications(
+    app_ids: List[int],
+    to_status: str,
+    from_status: str = "pending",
+    expected_version: int = None,
+    approved_by: str = None,
+    rejection_reason: str = None,
+    expected_versions: Dict[int, int] = None,
+) -> List[Application]:
+    """
+    여러 건 전이. 실제로 전이된 행만 돌려준다.
+
+    expected_versions({id: version})를 주면 화면에 표시한 버전 그대로인 행만 전이한다.
+    """
+    statement = build_transition_query(
+        app_ids,
+        to_status,
+        from_status=from_status,
+        expected_version=expected_version,
+        expected_versions=expected_versions,
+        approved_by=approved_by,
+        rejection_reason=rejection_reason,
+    )
+    if statement is None:
+        return []
+
+    query, params = statement
+    rows = execute_update(query, params, returning=True, row_type=Application)
+    if rows:
+        bump_generation("applications")
+    return rows
+
+
+def build_transition_query(
+    app_ids: List[int],
+    to_status: str,
+    from_status: str = "pending",
+    expected_version: int = None,
+    approved_by: str = None,
+    rejection_reason: str = None,
+    expected_versions: Dict[int, int] = None,
+) -> Optional[tuple[str, tuple]]:
+    """전이 UPDATE 문과 파라미터 (동기/비동기 서비스 공용). 대상이 없으면 None."""
+    if not can_transition(from_status, to_status):
+        raise ValueError(f"Invalid application transition: {from_status} -> {to_status}")
+
+    ids = sorted({int(app_id) for app_id in app_ids})
+    if not ids:
+        return None
+
+    version_sql = ""
+    params = [ids, from_status]
+    if expected_version is not None:
+        version_sql = "AND version = ?"
+        params.append(expected_version)
+    elif expected_versions is not None:
+        version_sql = "AND (id, version) IN (SELECT * FROM unnest(?::bigint[], ?::integer[]))"
+        params.extend([ids, [int(expected_versions[app_id]) for app_id in ids]])
+
+    if to_status in APPROVED_STATUSES:
+        year = datetime.now().year
+        query = f"""
+        WITH target AS (
+            SELECT id, application_type, submitted_at
+            FROM applications
+            WHERE id = ANY(?) AND status = ? {version_sql}
+            FOR UPDATE
+        ),
+        numbered AS (
+            SELECT id, row_number() OVER (ORDER BY submitted_at, id) AS rn,
+                   COUNT(*) OVER () AS total
+            FROM target
+            WHERE application_type = ANY(?)
+        ),
+        counter AS (
+            INSERT INTO approval_counters (application_type, year, last_seq)
+            SELECT 'gate', ?, COUNT(*) FROM numbered HAVING COUNT(*) > 0
+            ON CONFLICT (application_type, year)
+            DO UPDATE SET last_seq = approval_counters.last_seq + EXCLUDED.last_seq
+            RETURNING last_seq
+        )
+        UPDATE applications a
+        SET status = ?,
+            version = a.version + 1,
+            approved_at = now(),
+            approved_by = ?,
+            approval_number = CASE WHEN n.id IS NOT NULL THEN
+                ? || lpad(
+                    (c.last_seq - n.total + n.rn)::text,
+                    greatest(4, length((c.last_seq - n.total + n.rn)::text)),
+                    '0'
+                )
+            END
+        FROM target t
+        LEFT JOIN numbered n ON n.id = t.id
+        LEFT JOIN counter c ON true
+        WHERE a.id = t.id
+        RETURNING a.*
+        """
+        params.extend(
+            [
+                list(NUMBERED_TYPES),
+                year,
+                to_status,
+                approved_by,
+                get_approval_number_prefix("gate", year),
+            ]
+        )
+    else:
+        query = f"""
+        UPDATE applications
+        SET status = ?, version = version + 1, rejection_reason = ?
+        WHERE id = ANY(?) AND status = ? {version_sql}
+        RETURNING *
+        """
+        params = [to_status, rejection_reason] + params
+
+    return query, tuple(params)
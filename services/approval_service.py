@@ -1,27 +1,20 @@
-from datetime import datetime
+from typing import Dict, List, Optional
 
-from database.db_manager import execute_query, execute_update
-from utils.approval_number import generate_approval_number
+from database.db_manager import execute_query
+from database.records import Application
+from services.application_state import transition_application, transition_applications
 from utils.google_sync import sync_gate_roster_to_google_sheet
+from utils.tracing import traced
 
 
-def approve_application(app_id: int, approver_name: str) -> tuple[bool, str]:
+@traced()
+def approve_application(app_id: int, approver_name: str, expected_version: int = None) -> tuple[bool, str]:
     try:
-        app = _get_application_by_id(app_id)
+        app = transition_application(
+            app_id, "approved", expected_version=expected_version, approved_by=approver_name
+        )
         if not app:
-            return False, "신청서를 찾을 수 없습니다."
-
-        approval_number = None
-        if app["application_type"] == "gate":
-            approval_number = generate_approval_number("gate")
-
-        query = """
-        UPDATE applications
-        SET status = 'approved', approved_at = ?, approved_by = ?, approval_number = ?
-        WHERE id = ?
-        """
-        now = datetime.now().isoformat()
-        execute_update(query, (now, approver_name, approval_number, app_id))
+            return False, _transition_failure_message(app_id)
 
         if app["application_type"] == "gate":
             ok, sync_msg = sync_gate_roster_to_google_sheet()
@@ -34,31 +27,86 @@ def approve_application(app_id: int, approver_name: str) -> tuple[bool, str]:
         return False, f"승인 실패: {e}"
 
 
-def reject_application(app_id: int, reason: str) -> tuple[bool, str]:
+@traced()
+def reject_application(app_id: int, reason: str, expected_version: int = None) -> tuple[bool, str]:
     try:
-        query = """
-        UPDATE applications
-        SET status = 'rejected', rejection_reason = ?
-        WHERE id = ?
-        """
-        execute_update(query, (reason, app_id))
+        app = transition_application(
+            app_id, "rejected", expected_version=expected_version, rejection_reason=reason
+        )
+        if not app:
+            return False, _transition_failure_message(app_id)
         return True, "신청서가 반려되었습니다."
     except Exception as e:
         return False, f"반려 실패: {e}"
 
 
+@traced()
+def approve_applications(
+    app_ids: List[int], approver_name: str, expected_versions: Dict[int, int] = None
+) -> tuple[bool, str]:
+    """
+    여러 신청서를 한 번의 UPDATE로 승인
+
+    정문 출입 승인번호는 같은 문장 안에서 신청 순서대로 일괄 발급하고,
+    구글시트 동기화는 정문 출입 건이 있을 때 한 번만 수행한다.
+    expected_versions({id: version})를 주면 화면에 표시한 뒤 바뀐 신청서는 건너뛴다.
+    """
+    ids = sorted({int(app_id) for app_id in app_ids})
+    if not ids:
+        return False, "선택된 신청서가 없습니다."
+
+    try:
+        approved = transition_applications(
+            ids, "approved", approved_by=approver_name, expected_versions=expected_versions
+        )
+        if not approved:
+            return False, f"승인할 수 있는 신청서가 없습니다. ({_bulk_skip_note(ids, 0)})"
+
+        message = f"{len(approved)}건이 승인되었습니다."
+        if len(approved) < len(ids):
+            message += f" ({_bulk_skip_note(ids, len(approved))} 제외)"
+
+        if any(row["application_type"] == "gate" for row in approved):
+            ok, sync_msg = sync_gate_roster_to_google_sheet()
+            if ok:
+                return True, f"{message} {sync_msg}"
+            return True, f"{message} ({sync_msg})"
+        return True, message
+    except Exception as e:
+        return False, f"일괄 승인 실패: {e}"
+
+
+@traced()
+def reject_applications(
+    app_ids: List[int], reason: str, expected_versions: Dict[int, int] = None
+) -> tuple[bool, str]:
+    ids = sorted({int(app_id) for app_id in app_ids})
+    if not ids:
+        return False, "선택된 신청서가 없습니다."
+
+    try:
+        rejected = len(
+            transition_applications(ids, "rejected", rejection_reason=reason, expected_versions=expected_versions)
+        )
+        if rejected <= 0:
+            return False, f"반려할 수 있는 신청서가 없습니다. ({_bulk_skip_note(ids, 0)})"
+
+        message = f"{rejected}건이 반려되었습니다."
+        if rejected < len(ids):
+            message += f" ({_bulk_skip_note(ids, rejected)} 제외)"
+        return True, message
+    except Exception as e:
+        return False, f"일괄 반려 실패: {e}"
+
+
+@traced()
 def auto_approve_application(app_id: int) -> tuple[bool, str]:
     try:
-        query = """
-        UPDATE applications
-        SET status = 'auto_approved', approved_at = ?
-        WHERE id = ?
-        """
-        now = datetime.now().isoformat()
-        execute_update(query, (now, app_id))
-
-        app = _get_application_by_id(app_id)
-        if app and app.get("application_type") == "gate":
+        app = transition_application(app_id, "auto_approved", approved_by="system_auto")
+        if not app:
+            return False, _transition_failure_message(app_id)
+
+        if app["application_type"] == "gate":
             ok, sync_msg = sync_gate_roster_to_google_sheet()
             if ok:
                 return True, f"신청서가 자동 발급되었습니다. {sync_msg}"
@@ -69,7 +117,31 @@ def auto_approve_application(app_id: int) -> tuple[bool, str]:
         return False, f"자동 발급 실패: {e}"
 
 
-def _get_application_by_id(app_id: int):
+def _transition_failure_message(app_id: int) -> str:
+    # 실패한 경우에만 조회해 원인을 구분한다.
+    app = _get_application_by_id(app_id)
+    if not app:
+        return "신청서를 찾을 수 없습니다."
+    return "이미 처리되었거나 다른 관리자가 변경한 신청서입니다."
+
+
+def _bulk_skip_note(ids: List[int], processed: int) -> str:
+    # 일부만 전이된 경우에만 조회해 이미 처리된 건과 없는 id 를 나눠 알린다.
+    existing = execute_query("SELECT COUNT(*) AS count FROM applications WHERE id = ANY(?)", (ids,))[0]["count"]
+    return bulk_skip_note(len(ids), existing, processed)
+
+
+def bulk_skip_note(requested: int, existing: int, processed: int) -> str:
+    """일괄 처리에서 제외된 건수 안내 문구 (동기/비동기 서비스 공용)"""
+    parts = []
+    if existing - processed:
+        parts.append(f"이미 처리되었거나 변경된 {existing - processed}건")
+    if requested - existing:
+        parts.append(f"존재하지 않는 {requested - existing}건")
+    return ", ".join(parts)
+
+
+def _get_application_by_id(app_id: int) -> Optional[Application]:
     query = "SELECT * FROM applications WHERE id = ?"
-    result = execute_query(query, (app_id,))
-    return dict(result[0]) if result else None
+    result = execute_query(query, (app_id,), row_type=Application)
+    return result[0] if result else None
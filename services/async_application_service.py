@@ -0,0 +1,177 @@
+"""
+application_service 의 비동기 버전 (api/ 전용)
+
+SQL·메시지는 동기 서비스와 같고, DB 는 database.async_db_manager 를 쓴다.
+구글시트 동기화와 같은 블로킹 작업은 asyncio.to_thread 로 넘긴다.
+"""
+import asyncio
+from typing import Dict, List, Optional
+
+from database.async_db_manager import execute_delete, execute_insert, execute_query, execute_update
+from database.records import Application
+from database.shared_cache import bump_generation
+from services.application_service import (
+    CANCEL_APPLICATION_QUERY,
+    DELAYED_TARGETS_QUERY,
+    SUBMIT_APPLICATION_QUERY,
+    _cancel_message,
+    _normalize_approval_mode,
+    _parse_delay_minutes,
+    _pending_filter_clause,
+    _submit_message,
+    build_submit_params,
+)
+from services.application_state import build_transition_query
+from utils.google_sync import sync_gate_roster_to_google_sheet
+from utils.tracing import traced
+
+
+async def _get_approval_settings() -> Dict[str, str]:
+    # 동기 서비스와 같이 유형별 승인 모드/지연 시간 6개 키를 한 번에 읽는다.
+    keys = [
+        f"{app_type}_{suffix}"
+        for app_type in ("phone", "tablet", "gate")
+        for suffix in ("approval_mode", "approval_delay_minutes")
+    ]
+    rows = await execute_query("SELECT key, value FROM settings WHERE key = ANY(?)", (keys,))
+    return {row["key"]: row["value"] for row in rows}
+
+
+async def _sync_gate_roster() -> tuple[bool, str]:
+    return await asyncio.to_thread(sync_gate_roster_to_google_sheet)
+
+
+@traced()
+async def transition_applications(app_ids: List[int], to_status: str, **kwargs) -> List[Application]:
+    statement = build_transition_query(app_ids, to_status, **kwargs)
+    if statement is None:
+        return []
+    query, params = statement
+    rows = await execute_update(query, params, returning=True, row_type=Application)
+    if rows:
+        bump_generation("applications")
+    return rows
+
+
+async def apply_delayed_approvals():
+    settings = await _get_approval_settings()
+    delayed_types = [
+        app_type
+        for app_type in ("phone", "tablet", "gate")
+        if _normalize_approval_mode(settings.get(f"{app_type}_approval_mode") or "manual") == "delayed_auto"
+    ]
+    if not delayed_types:
+        return
+
+    # 유형별 대상 조회는 서로 독립적이라 동시에 보낸다 (동기 서비스는 pipeline 한 번).
+    target_lists = await asyncio.gather(
+        *[
+            execute_query(
+                DELAYED_TARGETS_QUERY,
+                (app_type, str(_parse_delay_minutes(settings.get(f"{app_type}_approval_delay_minutes")))),
+            )
+            for app_type in delayed_types
+        ]
+    )
+
+    gate_changed = False
+    for app_type, targets in zip(delayed_types, target_lists):
+        if not targets:
+            continue
+        approved = await transition_applications(
+            [row["id"] for row in targets], "auto_approved", approved_by="system_delay"
+        )
+        if approved and app_type == "gate":
+            gate_changed = True
+
+    if gate_changed:
+        await _sync_gate_roster()
+
+
+@traced()
+async def submit_application(
+    student_id: str, application_type: str, reason: str, extra_info: str = None
+) -> tuple[bool, str]:
+    try:
+        await apply_delayed_approvals()
+        params = build_submit_params(student_id, application_type, reason, extra_info)
+        row = (await execute_insert(SUBMIT_APPLICATION_QUERY, params, returning=True))[0]
+        if row["id"] is None:
+            return False, "이미 같은 유형의 신청서가 있습니다."
+        bump_generation("applications")
+
+        sync_result = None
+        if row["status"] == "auto_approved" and application_type == "gate":
+            sync_result = await _sync_gate_roster()
+        return True, _submit_message(row, sync_result)
+
+    except Exception as e:
+        return False, f"오류가 발생했습니다: {e}"
+
+
+@traced()
+async def get_student_applications(student_id: str) -> List[Application]:
+    await apply_delayed_approvals()
+    query = """
+    SELECT * FROM applications
+    WHERE student_id = ?
+    ORDER BY submitted_at DESC
+    """
+    return await execute_query(query, (student_id,), row_type=Application)
+
+
+@traced()
+async def get_application(app_id: int) -> Optional[Application]:
+    result = await execute_query("SELECT * FROM applications WHERE id = ?", (app_id,), row_type=Application)
+    return result[0] if result else None
+
+
+@traced()
+async def cancel_student_application(app_id: int, student_id: str) -> tuple[bool, str]:
+    try:
+        await apply_delayed_approvals()
+        deleted = await execute_delete(CANCEL_APPLICATION_QUERY, (app_id, student_id), returning=True)
+        if not deleted:
+            return False, "취소 가능한 신청서가 없습니다."
+        bump_generation("applications")
+
+        sync_result = None
+        if deleted[0]["application_type"] == "gate":
+            sync_result = await _sync_gate_roster()
+        return True, _cancel_message(sync_result)
+    except Exception as e:
+        return False, f"신청 취소 중 오류가 발생했습니다: {e}"
+
+
+@traced()
+async def get_pending_applications_page(
+    limit: int = 20,
+    after: Optional[tuple] = None,
+    application_type: str = None,
+    grade: int = None,
+    class_num: int = None,
+    name_query: str = None,
+) -> tuple[List[Application], Optional[tuple]]:
+    await apply_delayed_approvals()
+    filter_sql, params = _pending_filter_clause(application_type, grade, class_num, name_query)
+    keyset_sql = ""
+    if after:
+        keyset_sql = "AND (a.submitted_at, a.id) > (?, ?)"
+        params.extend(after)
+    query = f"""
+    SELECT a.*, s.grade, s.class_num, s.name
+    FROM applications a
+    JOIN students s ON a.student_id = s.student_id
+    WHERE a.status = 'pending'
+    {filter_sql}
+    {keyset_sql}
+    ORDER BY a.submitted_at ASC, a.id ASC
+    LIMIT ?
+    """
+    params.append(limit + 1)
+    rows = await execute_query(query, tuple(params), row_type=Application)
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        return rows, (last["submitted_at"], last["id"])
+    return rows, None
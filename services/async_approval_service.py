@@ -0,0 +1,129 @@
+"""approval_service 의 비동기 버전 (api/ 전용)"""
+from typing import Dict, List, Optional
+
+from database.async_db_manager import execute_query
+from services.approval_service import bulk_skip_note
+from services.async_application_service import _sync_gate_roster, transition_applications
+from utils.tracing import traced
+
+
+async def _transition_one(app_id: int, to_status: str, **kwargs) -> Optional[dict]:
+    rows = await transition_applications([app_id], to_status, **kwargs)
+    return rows[0] if rows else None
+
+
+async def _transition_failure_message(app_id: int) -> str:
+    result = await execute_query("SELECT id FROM applications WHERE id = ?", (app_id,))
+    if not result:
+        return "신청서를 찾을 수 없습니다."
+    return "이미 처리되었거나 다른 관리자가 변경한 신청서입니다."
+
+
+async def _bulk_skip_note(ids: List[int], processed: int) -> str:
+    result = await execute_query("SELECT COUNT(*) AS count FROM applications WHERE id = ANY(?)", (ids,))
+    return bulk_skip_note(len(ids), result[0]["count"], processed)
+
+
+@traced()
+async def approve_application(app_id: int, approver_name: str, expected_version: int = None) -> tuple[bool, str]:
+    try:
+        app = await _transition_one(
+            app_id, "approved", expected_version=expected_version, approved_by=approver_name
+        )
+        if not app:
+            return False, await _transition_failure_message(app_id)
+
+        if app["application_type"] == "gate":
+            ok, sync_msg = await _sync_gate_roster()
+            if ok:
+                return True, f"신청서가 승인되었습니다. {sync_msg}"
+            return True, f"신청서가 승인되었습니다. ({sync_msg})"
+
+        return True, "신청서가 승인되었습니다."
+    except Exception as e:
+        return False, f"승인 실패: {e}"
+
+
+@traced()
+async def reject_application(app_id: int, reason: str, expected_version: int = None) -> tuple[bool, str]:
+    try:
+        app = await _transition_one(
+            app_id, "rejected", expected_version=expected_version, rejection_reason=reason
+        )
+        if not app:
+            return False, await _transition_failure_message(app_id)
+        return True, "신청서가 반려되었습니다."
+    except Exception as e:
+        return False, f"반려 실패: {e}"
+
+
+@traced()
+async def approve_applications(
+    app_ids: List[int], approver_name: str, expected_versions: Dict[int, int] = None
+) -> tuple[bool, str]:
+    ids = sorted({int(app_id) for app_id in app_ids})
+    if not ids:
+        return False, "선택된 신청서가 없습니다."
+
+    try:
+        approved = await transition_applications(
+            ids, "approved", approved_by=approver_name, expected_versions=expected_versions
+        )
+        if not approved:
+            return False, f"승인할 수 있는 신청서가 없습니다. ({await _bulk_skip_note(ids, 0)})"
+
+        message = f"{len(approved)}건이 승인되었습니다."
+        if len(approved) < len(ids):
+            message += f" ({await _bulk_skip_note(ids, len(approved))} 제외)"
+
+        if any(row["application_type"] == "gate" for row in approved):
+            ok, sync_msg = await _sync_gate_roster()
+            if ok:
+                return True, f"{message} {sync_msg}"
+            return True, f"{message} ({sync_msg})"
+        return True, message
+    except Exception as e:
+        return False, f"일괄 승인 실패: {e}"
+
+
+@traced()
+async def reject_applications(
+    app_ids: List[int], reason: str, expected_versions: Dict[int, int] = None
+) -> tuple[bool, str]:
+    ids = sorted({int(app_id) for app_id in app_ids})
+    if not ids:
+        return False, "선택된 신청서가 없습니다."
+
+    try:
+        rejected = len(
+            await transition_applications(
+                ids, "rejected", rejection_reason=reason, expected_versions=expected_versions
+            )
+        )
+        if rejected <= 0:
+            return False, f"반려할 수 있는 신청서가 없습니다. ({await _bulk_skip_note(ids, 0)})"
+
+        message = f"{rejected}건이 반려되었습니다."
+        if rejected < len(ids):
+            message += f" ({await _bulk_skip_note(ids, rejected)} 제외)"
+        return True, message
+    except Exception as e:
+        return False, f"일괄 반려 실패: {e}"
+
+
+@traced()
+async def auto_approve_application(app_id: int) -> tuple[bool, str]:
+    try:
+        app = await _transition_one(app_id, "auto_approved", approved_by="system_auto")
+        if not app:
+            return False, await _transition_failure_message(app_id)
+
+        if app["application_type"] == "gate":
+            ok, sync_msg = await _sync_gate_roster()
+            if ok:
+                return True, f"신청서가 자동 발급되었습니다. {sync_msg}"
+            return True, f"신청서가 자동 발급되었습니다. ({sync_msg})"
+
+        return True, "신청서가 자동 발급되었습니다."
+    except Exception as e:
+        return False, f"자동 발급 실패: {e}"
@@ -0,0 +1,31 @@
+"""student_service 의 비동기 버전 (api/ 전용, 조회만)"""
+from typing import Optional
+
+from database.async_db_manager import execute_query
+from database.records import Student
+from utils.tracing import traced
+
+
+@traced()
+async def get_student(student_id: str) -> Optional[Student]:
+    result = await execute_query("SELECT * FROM students WHERE student_id = ?", (student_id,), row_type=Student)
+    return result[0] if result else None
+
+
+@traced()
+async def authenticate_student(student_id: str, name: str) -> Optional[Student]:
+    """학번 + 이름이 일치하는 학생 (학부모 인증용)"""
+    student_id = (student_id or "").strip()
+    name = (name or "").strip()
+    if not student_id or not name:
+        return None
+    result = await execute_query(
+        "SELECT * FROM students WHERE student_id = ? AND name = ?", (student_id, name), row_type=Student
+    )
+    return result[0] if result else None
+
+
+@traced()
+async def get_total_student_count() -> int:
+    result = await execute_query("SELECT COUNT(*) as count FROM students")
+    return result[0]["count"]
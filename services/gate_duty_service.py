@@ -0,0 +1,93 @@
+import csv
+import io
+from typing import Dict, List
+
+from database.db_manager import execute_query
+from database.shared_cache import shared_cached
+from utils.gate_schedule import GATE_DUTY_SLOTS, WEEKDAYS, gate_schedule_slots, gate_schedule_to_grid
+from utils.pdf_generator import generate_gate_duty_sheet_pdf
+from utils.tracing import traced
+
+GATE_DUTY_CSV_HEADER = ["학년", "반", "학번", "성명", "사유", "확인"]
+
+
+@traced()
+@shared_cached("applications", "students")
+def get_gate_duty_table() -> Dict[str, Dict[str, List[Dict]]]:
+    """
+    승인된 정문 출입 명단을 요일/슬롯별로 미리 나눈 표
+
+    Returns:
+        {요일: {슬롯: [학생 dict, ...]}} (슬롯: 'morning', '1', '2', '3')
+    """
+    query = """
+    SELECT a.student_id, s.name, s.grade, s.class_num, a.reason, a.extra_info
+    FROM applications a
+    JOIN students s ON a.student_id = s.student_id
+    WHERE a.application_type = 'gate'
+      AND a.status IN ('approved', 'auto_approved')
+    ORDER BY s.grade, s.class_num, s.name
+    """
+    table = {day: {slot: [] for slot in GATE_DUTY_SLOTS} for day in WEEKDAYS}
+    for row in execute_query(query, read_only=True):
+        item = {
+            "student_id": row["student_id"],
+            "name": row["name"],
+            "grade": row["grade"],
+            "class_num": row["class_num"],
+            "reason": row["reason"],
+        }
+        for day, slot in gate_schedule_slots(row["extra_info"]):
+            table[day][slot].append(item)
+    return table
+
+
+@traced()
+def get_gate_duty_list(weekday: str, slot: str) -> List[Dict]:
+    """특정 요일/슬롯의 정문 당번 명단"""
+    table = get_gate_duty_table()
+    return table.get(weekday, {}).get(slot, [])
+
+
+@traced()
+@shared_cached("applications", "students")
+def get_gate_duty_sheet_pdf(weekday: str, slot: str) -> bytes:
+    """특정 요일/슬롯의 인쇄용 당번 명단 PDF (명단이 바뀔 때까지 캐시)"""
+    return generate_gate_duty_sheet_pdf(weekday, slot, get_gate_duty_list(weekday, slot))
+
+
+@traced()
+@shared_cached("applications", "students")
+def get_gate_roster_rows() -> List[Dict]:
+    """정문 출입 전체 명단 (관리 페이지 표/구글시트 업로드용)"""
+    query = """
+    SELECT a.student_id, s.name, a.reason, a.extra_info
+    FROM applications a
+    JOIN students s ON a.student_id = s.student_id
+    WHERE a.application_type = 'gate'
+      AND a.status IN ('approved', 'auto_approved')
+    ORDER BY s.grade, s.class_num, s.name
+    """
+    result = []
+    for row in execute_query(query, read_only=True):
+        morning_map, dismissal_map = gate_schedule_to_grid(row.get("extra_info"))
+        item = {"학번": row["student_id"], "성명": row["name"]}
+        for day in WEEKDAYS:
+            item[f"등교-{day}"] = morning_map[day]
+        for day in WEEKDAYS:
+            item[f"하교-{day}"] = dismissal_map[day]
+        item["사유"] = row.get("reason", "")
+        result.append(item)
+    return result
+
+
+def gate_duty_to_csv(rows: List[Dict]) -> bytes:
+    """당번 명단 CSV (엑셀 호환 UTF-8 BOM)"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(GATE_DUTY_CSV_HEADER)
+    for row in rows:
+        writer.writerow(
+            [row["grade"], row["class_num"], row["student_id"], row["name"], row.get("reason") or "", ""]
+        )
+    return buffer.getvalue().encode("utf-8-sig")
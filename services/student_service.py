@@ -1,6 +1,16 @@
-from database.db_manager import execute_query, execute_insert, execute_delete, execute_update
+import hashlib
+import os
+
+from database.db_manager import execute_batch, execute_query, execute_insert, execute_delete, execute_update, transaction
+from database.records import Student
+from database.shared_cache import bump_generation, shared_cached
+from utils.tracing import traced
 from typing import List, Dict
 
+# 프로세스마다 다른 키로 (학번, 이름)을 해시해 로그인 조회 인덱스를 만든다.
+_LOGIN_KEY_SECRET = os.urandom(16)
+
+@traced()
 def add_students(students: List[Dict]) -> int:
     """
     학생 여러 명 추가
@@ -8,58 +18,70 @@ def add_students(students: List[Dict]) -> int:
     Returns:
         추가된 학생 수
     """
-    count = 0
-
-    for student in students:
-        try:
-            query = """
-            INSERT INTO students (student_id, name, grade, class_num)
-            VALUES (?, ?, ?, ?)
-            ON CONFLICT (student_id) DO UPDATE SET
-                name = EXCLUDED.name,
-                grade = EXCLUDED.grade,
-                class_num = EXCLUDED.class_num,
-                updated_at = now()
-            """
-            execute_insert(
-                query,
-                (
-                    student['student_id'],
-                    student['name'],
-                    student['grade'],
-                    student['class_num']
-                )
-            )
-            count += 1
-        except Exception as e:
-            print(f"학생 추가 오류: {e}")
-            continue
+    query = """
+    INSERT INTO students (student_id, name, grade, class_num)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT (student_id) DO UPDATE SET
+        name = EXCLUDED.name,
+        grade = EXCLUDED.grade,
+        class_num = EXCLUDED.class_num,
+        updated_at = now()
+    """
+    def params(student):
+        return (student['student_id'], student['name'], student['grade'], student['class_num'])
+
+    # 보통은 한 트랜잭션으로, 500건씩 pipeline 으로 묶어 보내고 한 번에 커밋한다.
+    try:
+        with transaction():
+            for start in range(0, len(students), 500):
+                execute_batch([(query, params(student)) for student in students[start:start + 500]])
+        count = len(students)
+    except Exception:
+        # 오류가 있으면 학생마다 savepoint 를 두고 다시 시도해 문제 있는 행만 건너뛴다.
+        count = 0
+        with transaction():
+            for student in students:
+                try:
+                    with transaction():
+                        execute_insert(query, params(student))
+                    count += 1
+                except Exception as e:
+                    print(f"학생 추가 오류: {e}")
+                    continue
 
+    bump_generation("students")
     return count
 
+@traced()
 def add_student(student_id: str, name: str, grade: int, class_num: int) -> int:
     """학생 개별 추가"""
     query = """
     INSERT INTO students (student_id, name, grade, class_num)
     VALUES (?, ?, ?, ?)
     """
-    return execute_insert(query, (student_id, name, grade, class_num))
+    inserted = execute_insert(query, (student_id, name, grade, class_num))
+    bump_generation("students")
+    return inserted
 
-def get_all_students() -> List[Dict]:
+@traced()
+@shared_cached("students")
+def get_all_students() -> List[Student]:
     """모든 학생 조회"""
     query = "SELECT * FROM students ORDER BY grade, class_num, name"
-    results = execute_query(query)
-    return [dict(row) for row in results]
+    return execute_query(query, row_type=Student)
 
-def get_student(student_id: str) -> Dict:
+@traced()
+@shared_cached("students")
+def get_student(student_id: str) -> Student:
     """학생 조회"""
     query = """
     SELECT * FROM students
     WHERE student_id = ?
     """
-    result = execute_query(query, (student_id,))
-    return dict(result[0]) if result else None
+    result = execute_query(query, (student_id,), row_type=Student)
+    return result[0] if result else None
 
+@traced()
 def update_student(student_id: str, name: str, grade: int, class_num: int) -> int:
     """학생 정보 수정"""
     query = """
@@ -67,47 +89,74 @@ def update_student(student_id: str, name: str, grade: int, class_num: int) -> in
     SET name = ?, grade = ?, class_num = ?
     WHERE student_id = ?
     """
-    return execute_update(query, (name, grade, class_num, student_id))
+    updated = execute_update(query, (name, grade, class_num, student_id))
+    bump_generation("students")
+    return updated
 
+@traced()
 def delete_student(student_id: str) -> int:
     """학생 삭제"""
     query = "DELETE FROM students WHERE student_id = ?"
-    return execute_delete(query, (student_id,))
+    deleted = execute_delete(query, (student_id,))
+    bump_generation("students")
+    return deleted
+
+def login_key(student_id: str, name: str) -> bytes:
+    """(학번, 이름) 로그인 조회 키"""
+    raw = f"{student_id}\0{name}".encode("utf-8")
+    return hashlib.blake2b(raw, key=_LOGIN_KEY_SECRET, digest_size=16).digest()
+
+@traced()
+@shared_cached("students", ttl=60)
+def get_student_login_index() -> Dict[bytes, Student]:
+    """로그인 조회용 {login_key: 학생} 인덱스 (학생 명단이 바뀌면 다시 만든다)"""
+    query = "SELECT id, student_id, name, grade, class_num FROM students"
+    return {login_key(row['student_id'], row['name']): row for row in execute_query(query, row_type=Student)}
 
-def get_students_by_grade(grade: int) -> List[Dict]:
+@traced()
+@shared_cached("students")
+def get_students_by_grade(grade: int) -> List[Student]:
     """학년별 학생 조회"""
     query = """
     SELECT * FROM students
     WHERE grade = ?
     ORDER BY class_num, name
     """
-    results = execute_query(query, (grade,))
-    return [dict(row) for row in results]
+    return execute_query(query, (grade,), row_type=Student)
 
-def get_students_by_class(grade: int, class_num: int) -> List[Dict]:
+@traced()
+@shared_cached("students")
+def get_students_by_class(grade: int, class_num: int) -> List[Student]:
     """반별 학생 조회"""
     query = """
     SELECT * FROM students
     WHERE grade = ? AND class_num = ?
     ORDER BY name
     """
-    results = execute_query(query, (grade, class_num))
-    return [dict(row) for row in results]
+    return execute_query(query, (grade, class_num), row_type=Student)
 
+@traced()
+@shared_cached("students")
 def get_total_student_count() -> int:
     """전체 학생 수"""
     query = "SELECT COUNT(*) as count FROM students"
     result = execute_query(query)
     return result[0]['count'] if result else 0
 
+@traced()
 def clear_all_students() -> int:
     """모든 학생 삭제"""
     query = "DELETE FROM students"
-    return execute_delete(query, ())
+    deleted = execute_delete(query, ())
+    bump_generation("students")
+    return deleted
 
 
+@traced()
 def clear_all_students_and_applications() -> tuple[int, int]:
-    """모든 학생 및 신청서 삭제"""
-    deleted_applications = execute_delete("DELETE FROM applications", ())
-    deleted_students = execute_delete("DELETE FROM students", ())
+    """모든 학생 및 신청서 삭제 (한 트랜잭션)"""
+    with transaction():
+        deleted_applications = execute_delete("DELETE FROM applications", ())
+        deleted_students = execute_delete("DELETE FROM students", ())
+        bump_generation("students", "applications")
     return deleted_students, deleted_applications
@@ -0,0 +1,25 @@
+"""
+DB 가 필요한 테스트는 벤치마크와 같은 스크래치 DB 를 쓴다.
+
+    BENCH_DATABASE_URL=postgresql://postgres@localhost/phone2026_bench python -m pytest tests
+    DB_BACKEND=local python -m pytest tests
+
+둘 다 없으면 건너뛴다.
+"""
+import os
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def bench_db():
+    if not os.getenv("BENCH_DATABASE_URL") and os.getenv("DB_BACKEND", "").lower() != "local":
+        pytest.skip("BENCH_DATABASE_URL (or DB_BACKEND=local) is not set")
+    from benchmarks.common import use_bench_database
+
+    db_url = use_bench_database()
+    yield db_url
+
+    from database.db_manager import close_all_connections
+
+    close_all_connections()
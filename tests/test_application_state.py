@@ -0,0 +1,40 @@
+"""신청서 상태 전이(compare-and-set)가 동시 처리에서도 행마다 한 번만 성공하는지 확인한다."""
+
+
+def test_concurrent_approvals_have_exactly_one_winner(bench_db):
+    from benchmarks.concurrent_transitions import check_transitions
+
+    assert check_transitions(workers=4, rows=50) == []
+
+
+def test_stale_version_loses(bench_db):
+    from benchmarks.common import reset_pending, seed_school
+    from services.application_state import transition_application
+
+    seed_school(student_count=10, application_count=10)
+    app_id = reset_pending(1)[0]
+
+    first = transition_application(app_id, "approved", expected_version=1, approved_by="first")
+    second = transition_application(app_id, "rejected", expected_version=1, rejection_reason="stale")
+
+    assert first is not None and first.status == "approved"
+    assert second is None
+
+
+def test_bulk_approval_skips_changed_and_reports_missing_ids(bench_db):
+    from benchmarks.common import reset_pending, seed_school
+    from services.application_state import transition_application
+    from services.approval_service import approve_applications
+
+    seed_school(student_count=10, application_count=10)
+    ids = reset_pending(3)
+    rendered = {app_id: 1 for app_id in ids}
+    # 화면에 표시한 뒤 다른 관리자가 한 건을 반려했다.
+    transition_application(ids[0], "rejected", rejection_reason="other admin")
+
+    ok, message = approve_applications(ids + [999999], "관리자", expected_versions={**rendered, 999999: 1})
+
+    assert ok
+    assert message.startswith("2건이 승인되었습니다.")
+    assert "이미 처리되었거나 변경된 1건" in message
+    assert "존재하지 않는 1건" in message
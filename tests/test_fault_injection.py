@@ -0,0 +1,153 @@
+"""
+DB 장애 상황에서 재시도/타임아웃 정책 점검 (tools/fault_proxy.py 경유).
+
+벤치마크 DB 앞에 장애 주입 프록시를 띄우고 db_manager 가 프록시로 연결하게 한 뒤
+연결 끊김, DB 다운, 쓰기 도중 끊김, 느린 쿼리 같은 상황에서 결과와 소요 시간,
+retry_policy 카운터를 확인한다. DB_BACKEND=local 의 Unix 소켓 서버 앞에도 둘 수 있다.
+"""
+import time
+
+import pytest
+
+
+@pytest.fixture
+def fault_proxy(bench_db, monkeypatch):
+    from benchmarks.common import through_proxy
+    from database import db_manager, retry_policy
+    from tools.fault_proxy import FaultProxy
+
+    db_manager.init_database()
+    proxy = FaultProxy.for_database_url(bench_db).start()
+
+    # 풀을 새로 만들 때 읽는 값이라 close_all_connections() 전에 바꾼다.
+    monkeypatch.setattr(db_manager, "_DB_BACKEND", "postgres")
+    monkeypatch.setenv("SUPABASE_DB_URL", through_proxy(bench_db, proxy.address))
+    monkeypatch.setenv("DB_PREPARE", "off")
+    monkeypatch.setattr(retry_policy, "STATEMENT_TIMEOUT_MS", 1000)
+    monkeypatch.setattr(retry_policy, "QUERY_TIMEOUT_SECONDS", 6.0)
+    monkeypatch.setattr(retry_policy, "POOL_TIMEOUT_SECONDS", 1.0)
+    monkeypatch.setattr(retry_policy, "RETRY_BUDGET", 10.0)
+    monkeypatch.setattr(retry_policy, "RETRY_BUDGET_PER_SECOND", 0.1)
+    db_manager.close_all_connections()
+
+    db_manager.execute_query("SELECT 1")
+    db_manager.execute_update("CREATE TABLE IF NOT EXISTS fault_probe (id int)", ())
+    yield proxy
+
+    proxy.configure()
+    db_manager.close_all_connections()
+    proxy.stop()
+    monkeypatch.undo()
+    retry_policy.reset_retry_stats()
+    db_manager.execute_update("DROP TABLE IF EXISTS fault_probe", ())
+
+
+def _run(func):
+    from database import retry_policy
+
+    retry_policy.reset_retry_stats()
+    started = time.perf_counter()
+    try:
+        func()
+        outcome = "ok"
+    except Exception as e:
+        outcome = type(e).__name__
+    return outcome, (time.perf_counter() - started) * 1000, retry_policy.get_retry_stats()
+
+
+def test_read_survives_server_restart(fault_proxy):
+    from database.db_manager import execute_query
+
+    accepted_before = fault_proxy.connections_accepted
+    fault_proxy.reset_connections()
+    outcome, _, _ = _run(lambda: execute_query("SELECT 1"))
+
+    assert outcome == "ok"
+    # 끊긴 유휴 커넥션은 풀이 꺼내 줄 때 걸러내고 새로 연결한다.
+    assert fault_proxy.connections_accepted > accepted_before
+
+
+def test_database_down_fails_within_pool_timeout_then_recovers(fault_proxy):
+    from database import retry_policy
+    from database.db_manager import execute_query
+
+    fault_proxy.configure(refuse=True)
+    fault_proxy.reset_connections()
+    outcome, elapsed_ms, stats = _run(lambda: execute_query("SELECT 1"))
+
+    assert outcome == "PoolTimeout"
+    assert stats["timeouts"] == 1 and stats["retries"] == 0
+    assert elapsed_ms < retry_policy.POOL_TIMEOUT_SECONDS * 1000 + 500
+    assert elapsed_ms < 2000 * retry_policy.MAX_RETRIES + 500
+
+    fault_proxy.configure()
+    deadline = time.monotonic() + 10
+    while True:
+        outcome, _, _ = _run(lambda: execute_query("SELECT 1"))
+        # 풀이 백그라운드에서 재연결하는 동안에는 PoolTimeout 이 날 수 있다.
+        if outcome == "ok" or time.monotonic() > deadline:
+            break
+    assert outcome == "ok"
+
+
+def test_write_lost_in_flight_is_not_retried(fault_proxy):
+    from database.db_manager import execute_insert
+
+    dropped_before = fault_proxy.connections_dropped
+    fault_proxy.configure(drop_on=b"fault_probe")
+    outcome, _, stats = _run(lambda: execute_insert("INSERT INTO fault_probe (id) VALUES (?)", (1,)))
+
+    assert outcome != "ok"
+    assert stats["ambiguous_writes"] == 1
+    assert fault_proxy.connections_dropped - dropped_before == 1
+
+
+def test_read_lost_in_flight_is_retried(fault_proxy):
+    from database import retry_policy
+    from database.db_manager import execute_query
+
+    dropped_before = fault_proxy.connections_dropped
+    fault_proxy.configure(drop_on=b"fault_probe")
+    outcome, _, stats = _run(lambda: execute_query("SELECT * FROM fault_probe"))
+
+    assert outcome != "ok"
+    assert stats["retries_exhausted"] == 1
+    assert fault_proxy.connections_dropped - dropped_before == retry_policy.MAX_RETRIES + 1
+
+
+def test_client_deadline_cancels_statement(fault_proxy):
+    from database.db_manager import execute_query
+
+    outcome, elapsed_ms, stats = _run(lambda: execute_query("SELECT pg_sleep(5)", timeout=0.3))
+
+    assert outcome == "QueryCanceled"
+    assert stats["cancels_sent"] == 1
+    assert elapsed_ms < 1500
+
+
+def test_server_statement_timeout(fault_proxy):
+    from database.db_manager import execute_query
+
+    outcome, elapsed_ms, stats = _run(lambda: execute_query("SELECT pg_sleep(5)"))
+
+    assert outcome == "QueryCanceled"
+    assert stats["timeouts"] == 1
+    assert elapsed_ms < 2500
+
+
+def test_retry_budget_caps_an_outage_storm(fault_proxy):
+    from database import retry_policy
+    from database.db_manager import execute_query
+
+    def _storm():
+        fault_proxy.configure(drop_on=b"fault_probe")
+        for _ in range(10):
+            try:
+                execute_query("SELECT * FROM fault_probe")
+            except Exception:
+                pass
+
+    _, _, stats = _run(_storm)
+
+    assert stats["budget_exhausted"] > 0
+    assert stats["retries"] <= retry_policy.RETRY_BUDGET + 1
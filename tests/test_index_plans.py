@@ -0,0 +1,100 @@
+"""
+핫 쿼리가 인덱스를 타는지 EXPLAIN 으로 확인한다.
+
+10만 건 신청서를 시드한 뒤 각 쿼리 플랜에 students/applications/approval_counters 의
+Seq Scan 이 없어야 한다.
+"""
+import json
+from datetime import date
+
+import pytest
+
+CHECKED_TABLES = {"applications", "students", "approval_counters"}
+
+HOT_QUERIES = {
+    "_apply_delayed_approvals": (
+        """
+        SELECT id
+        FROM applications
+        WHERE status = 'pending'
+          AND application_type = ?
+          AND submitted_at <= now() - ((? || ' minutes')::interval)
+        ORDER BY submitted_at ASC
+        """,
+        ("gate", "10"),
+    ),
+    "get_student_applications": (
+        """
+        SELECT * FROM applications
+        WHERE student_id = ?
+        ORDER BY submitted_at DESC
+        """,
+        ("001234",),
+    ),
+    "get_pending_applications_page": (
+        """
+        SELECT a.*, s.grade, s.class_num, s.name
+        FROM applications a
+        JOIN students s ON a.student_id = s.student_id
+        WHERE a.status = 'pending'
+        AND (a.submitted_at, a.id) > (?, ?)
+        ORDER BY a.submitted_at ASC, a.id ASC
+        LIMIT ?
+        """,
+        (date(2024, 1, 1), 0, 21),
+    ),
+    "allocate_sequence": (
+        """
+        INSERT INTO approval_counters (application_type, year, last_seq)
+        VALUES (?, ?, 1)
+        ON CONFLICT (application_type, year)
+        DO UPDATE SET last_seq = approval_counters.last_seq + 1
+        RETURNING last_seq
+        """,
+        ("gate", 2026),
+    ),
+    "authenticate_parent": (
+        """
+        SELECT id, student_id, name, grade, class_num
+        FROM students
+        WHERE student_id = ? AND name = ?
+        """,
+        ("001234", "학생1234"),
+    ),
+}
+
+
+
+def _seq_scans(plan, found=None):
+    found = [] if found is None else found
+    if plan.get("Node Type") == "Seq Scan" and plan.get("Relation Name") in CHECKED_TABLES:
+        found.append(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        _seq_scans(child, found)
+    return found
+
+
+@pytest.fixture(scope="module")
+def seeded_school(bench_db):
+    from benchmarks.common import seed_school
+
+    seed_school(student_count=34000, application_count=100000)
+
+
+def _transition_query():
+    from services.application_state import build_transition_query
+
+    # 승인 전이는 같은 문장에서 approval_counters 를 올린다.
+    return build_transition_query([1, 2, 3], "approved", approved_by="bench")
+
+
+@pytest.mark.parametrize("name", [*HOT_QUERIES, "transition_applications(approved)"])
+def test_hot_query_uses_indexes(seeded_school, name):
+    from database.db_manager import execute_query
+
+    query, params = HOT_QUERIES[name] if name in HOT_QUERIES else _transition_query()
+    plan_doc = execute_query("EXPLAIN (FORMAT JSON) " + query, params)[0]["QUERY PLAN"]
+    if isinstance(plan_doc, str):
+        plan_doc = json.loads(plan_doc)
+
+    assert _seq_scans(plan_doc[0]["Plan"]) == []
@@ -0,0 +1,78 @@
+"""학교(테넌트)마다 다른 스키마를 쓰는 문장이 여러 스레드에서 섞이지 않는지, 마이그레이션이 학교 설정을 쓰는지 확인한다."""
+import json
+import threading
+
+import pytest
+
+ROUNDS = 300
+TENANTS = {
+    "alpha": {"schema": "test_tenant_alpha", "school_name": "알파초등학교", "approval_prefix": "AL"},
+    "beta": {"schema": "test_tenant_beta", "school_name": "베타초등학교", "approval_prefix": "BE", "school_year": 2031},
+}
+
+
+@pytest.fixture
+def two_tenants(bench_db, monkeypatch):
+    from config import tenants
+    from database.db_manager import execute_insert, execute_update
+    from database.migrator import run_migrations
+
+    monkeypatch.setenv("TENANTS", json.dumps(TENANTS))
+    monkeypatch.setenv("DEFAULT_TENANT", "alpha")
+    tenants._load_tenants.cache_clear()
+
+    schools = [tenants.get_tenant(slug) for slug in TENANTS]
+    for tenant in schools:
+        run_migrations(tenant.schema)
+        with tenants.tenant_scope(tenant):
+            execute_update("TRUNCATE students CASCADE", ())
+            execute_insert(
+                "INSERT INTO students (student_id, name, grade, class_num) VALUES (?, ?, 1, 1)",
+                (tenant.slug, tenant.school_name),
+            )
+    yield schools
+
+    for tenant in schools:
+        execute_update(f"DROP SCHEMA {tenant.schema} CASCADE", ())
+    tenants._load_tenants.cache_clear()
+
+
+def test_concurrent_statements_stay_in_their_schema(two_tenants):
+    from config.tenants import tenant_scope
+    from database.db_manager import execute_query
+
+    query = "SELECT current_schema() AS schema, (SELECT string_agg(student_id, ',') FROM students) AS students"
+    barrier = threading.Barrier(len(two_tenants))
+    leaks = []
+    errors = []
+
+    def run(tenant):
+        try:
+            with tenant_scope(tenant):
+                barrier.wait()
+                for _ in range(ROUNDS):
+                    row = execute_query(query)[0]
+                    if (row["schema"], row["students"]) != (tenant.schema, tenant.slug):
+                        leaks.append((tenant.slug, row["schema"], row["students"]))
+        except Exception as e:  # pragma: no cover - reported below
+            errors.append(e)
+
+    threads = [threading.Thread(target=run, args=(tenant,)) for tenant in two_tenants]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert not leaks, f"{len(leaks)} statements ran in another school's schema, e.g. {leaks[:3]}"
+
+
+def test_migrations_seed_each_school_year(two_tenants):
+    from config.settings import SCHOOL_YEAR
+    from database.db_manager import execute_query
+
+    years = {
+        tenant.slug: execute_query(f"SELECT value FROM {tenant.schema}.settings WHERE key = 'academic_year'")[0]["value"]
+        for tenant in two_tenants
+    }
+    assert years == {"alpha": str(SCHOOL_YEAR), "beta": "2031"}
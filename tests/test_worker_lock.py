@@ -0,0 +1,26 @@
+"""worker 작업 락이 트랜잭션 락으로 잡히고 작업이 끝나면 풀리는지 확인한다."""
+
+
+def test_job_lock_is_exclusive_and_released_on_commit(bench_db):
+    from database.db_manager import init_database
+    from worker.scheduler import Scheduler, interval_job
+
+    init_database()
+    other = Scheduler([])
+    seen = {}
+
+    def _job():
+        # 같은 작업을 다른 worker 가 실행하려 하면 건너뛰어야 한다.
+        seen["other_ran"] = other.run_job(job)
+        return "ok"
+
+    job = interval_job("lock_probe", 60, _job)
+    worker = Scheduler([job])
+    try:
+        assert worker.run_job(job) is True
+        assert seen["other_ran"] is False
+        # COMMIT 으로 풀렸으므로 다른 worker 가 바로 잡을 수 있다.
+        assert other.run_job(interval_job("lock_probe", 60, lambda: "ok")) is True
+    finally:
+        worker._close_lock_connection()
+        other._close_lock_connection()
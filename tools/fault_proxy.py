@@ -0,0 +1,161 @@
+"""
+장애 주입용 로컬 TCP 프록시 (DB 재시도/타임아웃 점검용)
+
+    python tools/fault_proxy.py --target localhost:5432 --listen 127.0.0.1:6544 --latency-ms 200
+    python tools/fault_proxy.py --target /root/package/.local_pg:5432   # Unix 소켓 서버 (DB_BACKEND=local)
+
+앱/벤치마크의 DB URL 포트를 프록시 포트로 바꿔 연결하면 아래 장애를 흉내 낼 수 있다.
+대상 호스트가 경로(/...)이면 그 디렉터리의 Postgres Unix 소켓(.s.PGSQL.<port>)으로 이어 주므로
+TCP 포트가 없는 로컬 내장 Postgres 앞에도 둘 수 있다.
+tests/test_fault_injection.py 는 FaultProxy.for_database_url() 로 띄워 설정을 바꿔 가며 쓴다.
+
+- latency_ms: 오가는 데이터마다 지연
+- refuse: 새 연결을 받자마자 끊음 (DB 다운)
+- drop_on: 클라이언트가 보낸 데이터에 이 바이트열이 있으면 서버로 보내지 않고 연결을 끊음
+  (예: b"INSERT" 로 쓰기 도중 연결 끊김). 평문 연결에서만 동작한다 (sslmode=disable).
+- reset_connections(): 열려 있는 연결을 모두 끊음 (재시작/페일오버)
+"""
+import argparse
+import socket
+import threading
+import time
+from urllib.parse import parse_qs, urlparse
+
+
+class FaultProxy:
+    def __init__(self, target_host: str, target_port: int, listen_host: str = "127.0.0.1", listen_port: int = 0):
+        self.target = (target_host, target_port)
+        self.latency_ms = 0.0
+        self.refuse = False
+        self.drop_on = None
+        self._listener = socket.create_server((listen_host, listen_port))
+        self._pairs = set()
+        self._lock = threading.Lock()
+        self._closed = False
+        self.connections_accepted = 0
+        self.connections_dropped = 0
+
+    @classmethod
+    def for_database_url(cls, db_url: str) -> "FaultProxy":
+        """db_url 의 서버(TCP 호스트 또는 ?host=/소켓/디렉터리) 앞에 둘 프록시"""
+        parsed = urlparse(db_url)
+        host = parsed.hostname or parse_qs(parsed.query).get("host", ["localhost"])[0]
+        return cls(host, parsed.port or 5432)
+
+    @property
+    def address(self) -> tuple:
+        return self._listener.getsockname()[:2]
+
+    def start(self) -> "FaultProxy":
+        threading.Thread(target=self._accept_loop, name="fault-proxy", daemon=True).start()
+        return self
+
+    def stop(self):
+        self._closed = True
+        self._listener.close()
+        self.reset_connections()
+
+    def configure(self, latency_ms: float = 0.0, refuse: bool = False, drop_on: bytes = None):
+        self.latency_ms = latency_ms
+        self.refuse = refuse
+        self.drop_on = drop_on
+
+    def reset_connections(self) -> int:
+        with self._lock:
+            pairs = list(self._pairs)
+            self._pairs.clear()
+        for pair in pairs:
+            self._close_pair(pair)
+        return len(pairs)
+
+    def _accept_loop(self):
+        while not self._closed:
+            try:
+                client, _ = self._listener.accept()
+            except OSError:
+                return
+            self.connections_accepted += 1
+            if self.refuse:
+                client.close()
+                continue
+            try:
+                server = self._connect_target()
+                server.settimeout(None)
+            except OSError:
+                client.close()
+                continue
+            pair = (client, server)
+            with self._lock:
+                self._pairs.add(pair)
+            threading.Thread(target=self._pump, args=(pair, client, server, True), daemon=True).start()
+            threading.Thread(target=self._pump, args=(pair, server, client, False), daemon=True).start()
+
+    def _connect_target(self) -> socket.socket:
+        host, port = self.target
+        if not host.startswith("/"):
+            return socket.create_connection(self.target, timeout=10)
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.settimeout(10)
+        try:
+            server.connect(f"{host}/.s.PGSQL.{port}")
+        except OSError:
+            server.close()
+            raise
+        return server
+
+    def _pump(self, pair, source, sink, from_client: bool):
+        try:
+            while True:
+                data = source.recv(65536)
+                if not data:
+                    break
+                if from_client and self.drop_on and self.drop_on in data:
+                    self.connections_dropped += 1
+                    break
+                if self.latency_ms:
+                    time.sleep(self.latency_ms / 1000)
+                sink.sendall(data)
+        except OSError:
+            pass
+        with self._lock:
+            self._pairs.discard(pair)
+        self._close_pair(pair)
+
+    @staticmethod
+    def _close_pair(pair):
+        for sock in pair:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            sock.close()
+
+
+def _host_port(text: str) -> tuple:
+    host, _, port = text.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="장애 주입용 로컬 TCP 프록시")
+    parser.add_argument("--target", required=True, help="host:port (예: localhost:5432, /소켓/디렉터리:5432)")
+    parser.add_argument("--listen", default="127.0.0.1:6544", help="host:port")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--refuse", action="store_true")
+    parser.add_argument("--drop-on", help="이 문자열을 보내는 연결을 끊음 (예: INSERT)")
+    args = parser.parse_args()
+
+    proxy = FaultProxy(*_host_port(args.target), *_host_port(args.listen))
+    proxy.configure(args.latency_ms, args.refuse, args.drop_on.encode("utf-8") if args.drop_on else None)
+    proxy.start()
+    host, port = proxy.address
+    print(f"fault proxy {host}:{port} -> {args.target} (Ctrl+C 로 종료)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        proxy.stop()
+
+
+if __name__ == "__main__":
+    main()
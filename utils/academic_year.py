@@ -1,7 +1,8 @@
 from datetime import date, datetime
 
-from config.settings import SCHOOL_YEAR
+from config.tenants import current_tenant
 from database.db_manager import execute_query
+from database.request_cache import request_cached
 
 
 def _safe_parse_date(value: str):
@@ -18,16 +19,18 @@ def _safe_parse_date(value: str):
         return None
 
 
+@request_cached
 def get_academic_year() -> int:
     result = execute_query("SELECT value FROM settings WHERE key = ?", ("academic_year",))
     if not result:
-        return SCHOOL_YEAR
+        return current_tenant().school_year
     try:
         return int(result[0]["value"])
     except Exception:
-        return SCHOOL_YEAR
+        return current_tenant().school_year
 
 
+@request_cached
 def get_academic_year_start() -> date:
     default_value = date(get_academic_year(), 3, 1)
     result = execute_query("SELECT value FROM settings WHERE key = ?", ("academic_year_start",))
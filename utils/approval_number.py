@@ -1,32 +1,56 @@
 from datetime import datetime
-from database.db_manager import execute_query
+
+from config.tenants import current_tenant
+from database.db_manager import execute_insert, execute_query
 
 def get_next_sequence(application_type: str) -> int:
-    """해당 타입의 다음 시퀀스 번호 조회"""
+    """해당 타입의 다음 시퀀스 번호 조회 (발급하지 않고 미리보기만)"""
     year = datetime.now().year
 
     query = """
-    SELECT COUNT(*) as count
-    FROM applications
-    WHERE application_type = ? AND status IN ('approved', 'auto_approved')
-    AND EXTRACT(YEAR FROM approved_at) = ?
+    SELECT last_seq
+    FROM approval_counters
+    WHERE application_type = ? AND year = ?
     """
 
     result = execute_query(query, (application_type, year))
 
     if result:
-        return result[0]['count'] + 1
+        return result[0]['last_seq'] + 1
 
     return 1
 
+ALLOCATE_SEQUENCE_QUERY = """
+INSERT INTO approval_counters (application_type, year, last_seq)
+VALUES (?, ?, 1)
+ON CONFLICT (application_type, year)
+DO UPDATE SET last_seq = approval_counters.last_seq + 1
+RETURNING last_seq
+"""
+
+def allocate_sequence(application_type: str) -> int:
+    """해당 타입의 다음 시퀀스 번호를 원자적으로 발급"""
+    year = datetime.now().year
+
+    result = execute_insert(ALLOCATE_SEQUENCE_QUERY, (application_type, year), returning=True)
+    return result[0]['last_seq']
+
 def generate_approval_number(application_type: str) -> str:
     """
     승인번호 생성
-    형식: DS-{TYPE}-{YEAR}-{SEQUENCE}
+    형식: {학교 접두어}-{TYPE}-{YEAR}-{SEQUENCE}
     예: DS-GATE-2025-0001
     """
     year = datetime.now().year
+    sequence = allocate_sequence(application_type)
+
+    return format_approval_number(application_type, year, sequence)
 
+def format_approval_number(application_type: str, year: int, sequence: int) -> str:
+    return f"{get_approval_number_prefix(application_type, year)}{sequence:04d}"
+
+def get_approval_number_prefix(application_type: str, year: int) -> str:
+    """승인번호에서 시퀀스 앞부분 (예: DS-GATE-2025-)"""
     type_code = {
         'gate': 'GATE',
         'phone': 'PHONE',
@@ -34,6 +58,4 @@ def generate_approval_number(application_type: str) -> str:
     }
 
     code = type_code.get(application_type, 'UNKNOWN')
-    sequence = get_next_sequence(application_type)
-
-    return f"DS-{code}-{year}-{sequence:04d}"
+    return f"{current_tenant().approval_prefix}-{code}-{year}-"
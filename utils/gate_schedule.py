@@ -80,3 +80,42 @@ def gate_schedule_to_grid(extra_info):
             dismissal_map[day] = f"{opt['label']}({opt['time']})"
 
     return morning_map, dismissal_map
+
+
+MORNING_SLOT = "morning"
+GATE_DUTY_SLOTS = [MORNING_SLOT] + list(DISMISSAL_OPTIONS.keys())
+
+
+def get_gate_duty_slot_label(slot):
+    if slot == MORNING_SLOT:
+        return "등교"
+    opt = DISMISSAL_OPTIONS.get(slot)
+    if not opt:
+        return str(slot)
+    return f"{opt['label']}({opt['time']})"
+
+
+def weekday_of(value):
+    """date/datetime -> '월'~'금' (주말은 None)."""
+    idx = value.weekday()
+    if idx < len(WEEKDAYS):
+        return WEEKDAYS[idx]
+    return None
+
+
+def gate_schedule_slots(extra_info):
+    """신청 일정을 (요일, 슬롯) 목록으로 펼친다. 슬롯은 'morning' 또는 하교 코드."""
+    data = parse_gate_schedule(extra_info)
+    if not data:
+        return []
+
+    slots = []
+    morning_days = data.get("morning_days") or []
+    dismissal = data.get("dismissal_by_day") or {}
+    for day in WEEKDAYS:
+        if day in morning_days:
+            slots.append((day, MORNING_SLOT))
+        code = dismissal.get(day)
+        if code in DISMISSAL_OPTIONS:
+            slots.append((day, code))
+    return slots
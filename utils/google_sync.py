@@ -1,9 +1,39 @@
+import os
+
 import requests
 
-from database.db_manager import execute_query
-from utils.gate_schedule import gate_schedule_to_grid
+from config.tenants import current_tenant, get_default_tenant
+from database.db_manager import execute_query, execute_update
+from services.gate_duty_service import get_gate_roster_rows
+from utils.gate_schedule import WEEKDAYS
+from utils.tracing import traced
+
+GOOGLE_SHEET_WEBAPP_URL = os.getenv(
+    "GOOGLE_SHEET_WEBAPP_URL",
+    "https://script.google.com/macros/s/AKfycbxdylk68Qe1G-3_Jo5HBaPBiOIrSuGcT_C3DKkgfXZudQ-8mpCX5bcDPVBNW-OsnTcI/exec",
+)
+GATE_SHEET_URL = "https://docs.google.com/spreadsheets/d/16QWXBF_HSl0T55JmEJLp46ulJsGuPt7zVp3LAGBZHZM/edit?gid=0#gid=0"
+# 동기화 실패 시 '1' 로 남겨 두고 worker 의 재시도 작업이 다시 보낸다.
+SYNC_PENDING_KEY = "google_sync_pending"
+
+
+def _is_default_tenant() -> bool:
+    return current_tenant().slug == get_default_tenant().slug
+
 
-GOOGLE_SHEET_WEBAPP_URL = "https://script.google.com/macros/s/AKfycbxdylk68Qe1G-3_Jo5HBaPBiOIrSuGcT_C3DKkgfXZudQ-8mpCX5bcDPVBNW-OsnTcI/exec"
+def get_google_sheet_webapp_url():
+    """현재 학교의 구글시트 웹앱 주소. 다른 학교 명단이 기본 학교 시트로 가지 않도록 기본 학교만 기본값을 쓴다."""
+    url = current_tenant().google_sheet_webapp_url
+    if url:
+        return url
+    return GOOGLE_SHEET_WEBAPP_URL if _is_default_tenant() else None
+
+
+def get_gate_sheet_url():
+    url = current_tenant().gate_sheet_url
+    if url:
+        return url
+    return GATE_SHEET_URL if _is_default_tenant() else None
 
 
 def _normalize_dismissal(value: str) -> str:
@@ -20,41 +50,62 @@ def _to_google_check(value: str):
 
 
 def _get_gate_roster_rows_for_google():
-    query = """
-    SELECT a.student_id, s.name, a.reason, a.extra_info
-    FROM applications a
-    JOIN students s ON a.student_id = s.student_id
-    WHERE a.application_type = 'gate'
-      AND a.status IN ('approved', 'auto_approved')
-    ORDER BY s.grade, s.class_num, s.name
-    """
-    rows = execute_query(query)
-    result = []
-    for row in rows:
-        row = dict(row)
-        morning_map, dismissal_map = gate_schedule_to_grid(row.get("extra_info"))
-
-        result.append(
-            [
-                row.get("student_id", ""),
-                row.get("name", ""),
-                _to_google_check(morning_map.get("월", "")),
-                _to_google_check(morning_map.get("화", "")),
-                _to_google_check(morning_map.get("수", "")),
-                _to_google_check(morning_map.get("목", "")),
-                _to_google_check(morning_map.get("금", "")),
-                _normalize_dismissal(dismissal_map.get("월", "")),
-                _normalize_dismissal(dismissal_map.get("화", "")),
-                _normalize_dismissal(dismissal_map.get("수", "")),
-                _normalize_dismissal(dismissal_map.get("목", "")),
-                _normalize_dismissal(dismissal_map.get("금", "")),
-                row.get("reason", ""),
-            ]
-        )
-    return result
+    """관리 페이지와 같은 정문 출입 명단(get_gate_roster_rows)을 구글시트 열 형식으로"""
+    return [
+        [
+            row["학번"],
+            row["성명"],
+            *[_to_google_check(row[f"등교-{day}"]) for day in WEEKDAYS],
+            *[_normalize_dismissal(row[f"하교-{day}"]) for day in WEEKDAYS],
+            row["사유"],
+        ]
+        for row in get_gate_roster_rows()
+    ]
 
 
+@traced()
 def sync_gate_roster_to_google_sheet() -> tuple[bool, str]:
+    ok, message = _push_gate_roster()
+    try:
+        _set_sync_pending(not ok)
+    except Exception:
+        pass
+    return ok, message
+
+
+def is_google_sync_pending() -> bool:
+    result = execute_query("SELECT value FROM settings WHERE key = ?", (SYNC_PENDING_KEY,))
+    return bool(result) and result[0]["value"] == "1"
+
+
+def retry_pending_google_sync() -> tuple[bool, str]:
+    """이전 동기화가 실패했을 때만 다시 보낸다."""
+    if not is_google_sync_pending():
+        return True, "재시도할 동기화 없음"
+    return sync_gate_roster_to_google_sheet()
+
+
+def _set_sync_pending(pending: bool):
+    if pending:
+        execute_update(
+            """
+            INSERT INTO settings (key, value, updated_at) VALUES (?, '1', now())
+            ON CONFLICT (key) DO UPDATE SET value = '1', updated_at = now()
+            """,
+            (SYNC_PENDING_KEY,),
+        )
+    else:
+        # 실패 기록이 있을 때만 쓰므로 평소에는 행이 바뀌지 않는다.
+        execute_update(
+            "UPDATE settings SET value = '0', updated_at = now() WHERE key = ? AND value = '1'",
+            (SYNC_PENDING_KEY,),
+        )
+
+
+def _push_gate_roster() -> tuple[bool, str]:
+    webapp_url = get_google_sheet_webapp_url()
+    if not webapp_url:
+        return True, "구글시트 주소가 없어 동기화하지 않음"
     try:
         rows = _get_gate_roster_rows_for_google()
         payload = {
@@ -63,7 +114,7 @@ def sync_gate_roster_to_google_sheet() -> tuple[bool, str]:
             "startCol": 1,
             "rows": rows,
         }
-        res = requests.post(GOOGLE_SHEET_WEBAPP_URL, json=payload, timeout=20)
+        res = requests.post(webapp_url, json=payload, timeout=20)
         res.raise_for_status()
 
         content_type = (res.headers.get("content-type") or "").lower()
@@ -13,16 +13,19 @@ from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.pdfgen import canvas
 
-from config.settings import SCHOOL_NAME
+from config.tenants import current_tenant
 from database.db_manager import execute_query
+from database.request_cache import request_cached
 from utils.academic_year import get_gate_period_text
-from utils.gate_schedule import format_gate_schedule
+from utils.gate_schedule import format_gate_schedule, get_gate_duty_slot_label
+from utils.tracing import traced
 
 ROOT_PATH = Path(__file__).resolve().parent.parent
 FORM_FIELDS_PHONE_TABLET = {"grade", "class", "name", "year", "month", "date"}
 FORM_FIELDS_GATE = {"fill_1", "fill_2", "fill_3", "텍스트2", "텍스트3", "텍스트4"}
 
 
+@traced()
 def generate_phone_permit_pdf(application_data):
     """휴대전화 허가서 PDF 생성 (양식 기반)."""
     try:
@@ -31,6 +34,7 @@ def generate_phone_permit_pdf(application_data):
         return _create_permit_with_image("phone", "School Phone Permit", application_data)
 
 
+@traced()
 def generate_tablet_permit_pdf(application_data):
     """태블릿 허가서 PDF 생성 (양식 기반)."""
     try:
@@ -39,6 +43,7 @@ def generate_tablet_permit_pdf(application_data):
         return _create_permit_with_image("tablet", "School Tablet Permit", application_data)
 
 
+@traced()
 def generate_gate_permit_pdf(application_data):
     """정문 출입 허가서 PDF 생성 (양식 기반)."""
     try:
@@ -47,6 +52,69 @@ def generate_gate_permit_pdf(application_data):
         return _create_gate_permit(application_data)
 
 
+@traced()
+def generate_gate_duty_sheet_pdf(weekday, slot, rows):
+    """정문 당번용 요일/슬롯별 명단 PDF (A4, 페이지 자동 분할)."""
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=A4)
+    width, height = A4
+    font_name = _register_korean_font()
+
+    title = f"{current_tenant().school_name} 정문 출입 명단 - {weekday}요일 {get_gate_duty_slot_label(slot)}"
+    columns = [
+        ("No", 12 * mm),
+        ("학년", 14 * mm),
+        ("반", 12 * mm),
+        ("학번", 28 * mm),
+        ("성명", 30 * mm),
+        ("사유", 64 * mm),
+        ("확인", 20 * mm),
+    ]
+    left = (width - sum(w for _, w in columns)) / 2
+    row_height = 8 * mm
+    top = height - 35 * mm
+    bottom = 20 * mm
+
+    def draw_header():
+        c.setFont(font_name, 14)
+        c.drawCentredString(width / 2, height - 20 * mm, title)
+        c.setFont(font_name, 9)
+        c.drawRightString(width - left, height - 27 * mm, f"총 {len(rows)}명")
+        x = left
+        c.setFont(font_name, 10)
+        for label, col_width in columns:
+            c.rect(x, top - row_height, col_width, row_height)
+            c.drawCentredString(x + col_width / 2, top - row_height + 2.5 * mm, label)
+            x += col_width
+        return top - row_height
+
+    y = draw_header()
+    for idx, row in enumerate(rows, start=1):
+        if y - row_height < bottom:
+            c.showPage()
+            y = draw_header()
+        values = [
+            str(idx),
+            str(row.get("grade", "")),
+            str(row.get("class_num", "")),
+            str(row.get("student_id", "")),
+            str(row.get("name", "")),
+            str(row.get("reason") or "")[:24],
+            "",
+        ]
+        x = left
+        c.setFont(font_name, 10)
+        for (_, col_width), value in zip(columns, values):
+            c.rect(x, y - row_height, col_width, row_height)
+            c.drawString(x + 1.5 * mm, y - row_height + 2.5 * mm, value)
+            x += col_width
+        y -= row_height
+
+    c.save()
+    buffer.seek(0)
+    return buffer.getvalue()
+
+
 def _fill_template_pdf(template_kind, application_data):
     template_path = _find_template_path(template_kind)
     if not template_path:
@@ -294,6 +362,7 @@ def _draw_principal_stamp(pdf_canvas, rect_map):
     )
 
 
+@request_cached
 def _get_principal_stamp_path():
     result = execute_query(
         "SELECT value FROM settings WHERE key = ?",
@@ -350,7 +419,7 @@ def _create_gate_permit(application_data):
     width, height = A4
 
     c.setFont("Helvetica-Bold", 18)
-    c.drawCentredString(width / 2, height - 30 * mm, SCHOOL_NAME)
+    c.drawCentredString(width / 2, height - 30 * mm, current_tenant().school_name)
     c.setFont("Helvetica-Bold", 16)
     c.drawCentredString(width / 2, height - 45 * mm, "Gate Exit Permit")
 
@@ -0,0 +1,60 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class TokenBucket:
+    """capacity 만큼 연속 허용, 이후 초당 refill_per_second 개씩 회복"""
+
+    __slots__ = ("capacity", "refill_per_second", "tokens", "updated_at")
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.refill_per_second)
+        self.updated_at = now
+
+    def available(self, amount: float = 1.0) -> bool:
+        """소모하지 않고 amount 만큼 남았는지 확인"""
+        self._refill()
+        return self.tokens >= amount
+
+    def consume(self, amount: float = 1.0) -> bool:
+        self._refill()
+        if self.tokens >= amount:
+            self.tokens -= amount
+            return True
+        return False
+
+
+class KeyedRateLimiter:
+    """키(IP 등)별 토큰 버킷. 오래 안 쓰인 키는 max_keys 를 넘으면 버린다."""
+
+    def __init__(self, capacity: float, refill_per_second: float, max_keys: int = 10000):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def allow(self, key: str) -> bool:
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = TokenBucket(self.capacity, self.refill_per_second)
+                self._buckets[key] = bucket
+                if len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+            return bucket.consume()
+
+    def available(self, key: str) -> bool:
+        with self._lock:
+            bucket = self._buckets.get(key)
+            return bucket is None or bucket.available()
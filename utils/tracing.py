@@ -0,0 +1,233 @@
+"""
+경량 트레이싱 (외부 서비스 불필요)
+
+    with span("pdf.render", kind="gate"):
+        ...
+
+    @traced()
+    def submit_application(...):
+        ...
+
+중첩된 span 은 같은 trace 로 묶인다. 루트 span 이 끝나면 trace 를 메모리의
+최근 목록(관리 페이지 '느린 요청')에 넣고, TRACE_EXPORT_PATH 가 설정되어 있으면
+OpenTelemetry(OTLP/JSON) 형식으로 한 줄씩 파일에 추가한다.
+
+Streamlit 페이지는 본문을 main() 으로 두고 `with page_trace("page.x"): main()` 으로 실행한다.
+st.rerun()/st.stop() 은 예외로 스크립트를 끝내므로 with 블록이 닫아야 trace 가 남는다
+(Streamlit 은 재실행마다 새 스레드를 쓰므로 다음 실행에서 대신 닫을 수 없다).
+그래도 같은 스레드에 남은 trace 는 다음 begin_page_trace() 가 닫는다.
+"""
+import contextvars
+import functools
+import inspect
+import json
+import os
+import secrets
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+TRACE_ENABLED = os.getenv("TRACE_ENABLED", "1").lower() not in {"0", "false", "no", "off"}
+TRACE_EXPORT_PATH = os.getenv("TRACE_EXPORT_PATH", "")
+RECENT_TRACE_LIMIT = 200
+SERVICE_NAME = "phone2026"
+
+_current_span = contextvars.ContextVar("phone2026_current_span", default=None)
+_page_state = threading.local()
+_recent_traces = deque(maxlen=RECENT_TRACE_LIMIT)
+_recent_lock = threading.Lock()
+_export_lock = threading.Lock()
+
+
+class Span:
+    __slots__ = ("name", "trace_id", "span_id", "parent", "start_ns", "end_ns", "attributes", "error", "spans")
+
+    def __init__(self, name, parent=None, attributes=None):
+        self.name = name
+        self.parent = parent
+        self.trace_id = parent.trace_id if parent else secrets.token_hex(16)
+        self.span_id = secrets.token_hex(8)
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.attributes = attributes or {}
+        self.error = None
+        # 루트 span 만 trace 전체의 종료된 span 목록을 가진다.
+        self.spans = parent.spans if parent else []
+
+    @property
+    def duration_ms(self) -> float:
+        end_ns = self.end_ns or time.time_ns()
+        return (end_ns - self.start_ns) / 1_000_000
+
+    def finish(self, end_ns=None):
+        self.end_ns = end_ns or time.time_ns()
+        self.spans.append(self)
+        if self.parent is None:
+            _finish_trace(self)
+
+
+@contextmanager
+def span(name: str, **attributes):
+    if not TRACE_ENABLED:
+        yield None
+        return
+
+    current = Span(name, parent=_current_span.get(), attributes=attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _current_span.reset(token)
+        current.finish()
+
+
+def has_active_trace() -> bool:
+    return _current_span.get() is not None
+
+
+def child_span(name: str, **attributes):
+    """진행 중인 trace 가 있을 때만 span 을 만든다 (DB 쿼리 등 빈번한 호출용)."""
+    if _current_span.get() is None:
+        return nullcontext()
+    return span(name, **attributes)
+
+
+def traced(name: str = None):
+    def decorator(func):
+        span_name = name or f"{func.__module__.rsplit('.', 1)[-1]}.{func.__qualname__}"
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(span_name):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def begin_page_trace(name: str, **attributes):
+    if not TRACE_ENABLED:
+        return
+    _close_dangling_page_trace()
+    root = Span(name, parent=None, attributes=attributes)
+    _page_state.root = root
+    _page_state.token = _current_span.set(root)
+
+
+def end_page_trace():
+    root = getattr(_page_state, "root", None)
+    if root is None:
+        return
+    _current_span.reset(_page_state.token)
+    _page_state.root = None
+    root.finish()
+
+
+@contextmanager
+def page_trace(name: str, **attributes):
+    """Streamlit 페이지 한 번 실행의 루트 span. st.rerun()/st.stop() 으로 끝나도 닫는다."""
+    begin_page_trace(name, **attributes)
+    try:
+        yield
+    finally:
+        end_page_trace()
+
+
+def _close_dangling_page_trace():
+    root = getattr(_page_state, "root", None)
+    if root is None:
+        return
+    _page_state.root = None
+    _current_span.set(None)
+    root.attributes["interrupted"] = True
+    last_end = max((s.end_ns for s in root.spans if s.end_ns), default=None)
+    root.finish(end_ns=last_end or root.start_ns)
+
+
+def _finish_trace(root: Span):
+    with _recent_lock:
+        _recent_traces.append(root)
+    if TRACE_EXPORT_PATH:
+        try:
+            line = json.dumps(to_otlp_json(root), ensure_ascii=False)
+            with _export_lock, open(TRACE_EXPORT_PATH, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+        except Exception:
+            pass
+
+
+def _otlp_value(value):
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def to_otlp_json(root: Span) -> dict:
+    spans = []
+    for item in root.spans:
+        otlp_span = {
+            "traceId": item.trace_id,
+            "spanId": item.span_id,
+            "name": item.name,
+            "kind": 1,
+            "startTimeUnixNano": str(item.start_ns),
+            "endTimeUnixNano": str(item.end_ns),
+            "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in item.attributes.items()],
+            "status": {"code": 2, "message": item.error} if item.error else {"code": 1},
+        }
+        if item.parent is not None:
+            otlp_span["parentSpanId"] = item.parent.span_id
+        spans.append(otlp_span)
+    return {
+        "resourceSpans": [
+            {
+                "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+                "scopeSpans": [{"scope": {"name": "phone2026.tracing"}, "spans": spans}],
+            }
+        ]
+    }
+
+
+def get_slow_traces(limit: int = 20) -> list[dict]:
+    """최근 trace 중 오래 걸린 순서로 요약 (하위 span 은 이름별 누적 시간)"""
+    with _recent_lock:
+        traces = list(_recent_traces)
+    traces.sort(key=lambda root: root.duration_ms, reverse=True)
+
+    result = []
+    for root in traces[:limit]:
+        breakdown = {}
+        for item in root.spans:
+            if item is root:
+                continue
+            breakdown[item.name] = breakdown.get(item.name, 0.0) + item.duration_ms
+        top = sorted(breakdown.items(), key=lambda kv: kv[1], reverse=True)[:5]
+        result.append(
+            {
+                "name": root.name,
+                "started_at": root.start_ns / 1_000_000_000,
+                "duration_ms": round(root.duration_ms, 1),
+                "spans": len(root.spans),
+                "error": root.error or "",
+                "top_spans": ", ".join(f"{name} {ms:.1f}ms" for name, ms in top),
+            }
+        )
+    return result
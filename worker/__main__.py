@@ -0,0 +1,53 @@
+"""
+백그라운드 작업 실행
+
+    python -m worker                  # 계속 실행 (SIGTERM/SIGINT 시 진행 중인 작업을 마치고 종료)
+    python -m worker --once           # 모든 작업을 한 번씩 실행하고 종료 (cron 등 외부 스케줄러용)
+    python -m worker --once delayed_approvals
+    python -m worker --list
+"""
+import argparse
+import logging
+import signal
+import sys
+
+from worker.jobs import default_jobs
+from worker.scheduler import Scheduler
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="phone2026 background worker")
+    parser.add_argument("--once", action="store_true", help="run jobs once and exit")
+    parser.add_argument("--list", action="store_true", help="list jobs and exit")
+    parser.add_argument("jobs", nargs="*", help="job names for --once (default: all)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    jobs = default_jobs()
+
+    if args.list:
+        for job in jobs:
+            print(f"{job.name:24s} {job.describe()}")
+        return 0
+
+    unknown = set(args.jobs) - {job.name for job in jobs}
+    if unknown:
+        parser.error(f"unknown job(s): {', '.join(sorted(unknown))}")
+
+    scheduler = Scheduler(jobs)
+    if args.once:
+        scheduler.run_once(args.jobs)
+        return 0
+
+    def _handle_signal(signum, frame):
+        logging.getLogger(__name__).info("[worker] signal %s received, stopping after current job", signum)
+        scheduler.stop()
+
+    signal.signal(signal.SIGTERM, _handle_signal)
+    signal.signal(signal.SIGINT, _handle_signal)
+    scheduler.run_forever()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
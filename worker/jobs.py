@@ -0,0 +1,46 @@
+"""
+worker 가 실행하는 작업 목록
+
+페이지 접속 시 부수적으로 처리되던 일을 정해진 주기로 미리 해 둔다.
+주기는 환경변수로 바꿀 수 있다 (초 단위 / cron 식).
+"""
+import os
+
+from worker.scheduler import cron_job, interval_job
+
+DELAYED_APPROVAL_INTERVAL = float(os.getenv("WORKER_DELAYED_APPROVAL_SECONDS", "60"))
+GOOGLE_SYNC_RETRY_INTERVAL = float(os.getenv("WORKER_GOOGLE_SYNC_RETRY_SECONDS", "300"))
+# 평일 등교 전 정문 명단 전체 재동기화 (WORKER_TZ 기준, 기본 한국 시간)
+MORNING_SYNC_CRON = os.getenv("WORKER_MORNING_SYNC_CRON", "30 6 * * 1-5")
+
+
+def run_delayed_approvals():
+    from services.application_service import apply_delayed_approvals
+
+    return f"{apply_delayed_approvals()}건 자동승인"
+
+
+def retry_google_sync():
+    from utils.google_sync import retry_pending_google_sync
+
+    ok, message = retry_pending_google_sync()
+    if not ok:
+        raise RuntimeError(message)
+    return message
+
+
+def morning_google_sync():
+    from utils.google_sync import sync_gate_roster_to_google_sheet
+
+    ok, message = sync_gate_roster_to_google_sheet()
+    if not ok:
+        raise RuntimeError(message)
+    return message
+
+
+def default_jobs() -> list:
+    return [
+        interval_job("delayed_approvals", DELAYED_APPROVAL_INTERVAL, run_delayed_approvals),
+        interval_job("google_sync_retry", GOOGLE_SYNC_RETRY_INTERVAL, retry_google_sync),
+        cron_job("morning_google_sync", MORNING_SYNC_CRON, morning_google_sync),
+    ]
@@ -0,0 +1,241 @@
+"""
+작은 작업 스케줄러 (interval / cron 식)
+
+작업마다 Postgres advisory lock 을 잡고 실행하므로 worker 를 여러 대 띄워도 같은 작업이
+동시에 두 번 돌지 않는다. 락은 worker 전용 커넥션에서 작업 시간 동안 열어 둔 트랜잭션의
+트랜잭션 락(pg_try_advisory_xact_lock)이라 COMMIT 으로 풀린다. 세션 락과 달리 트랜잭션
+모드 풀러(Supabase 6543)를 거쳐도 잡기와 풀기가 다른 백엔드로 갈 수 없고, 프로세스가
+죽거나 연결이 끊기면 트랜잭션과 함께 풀린다.
+
+학교가 여러 곳이면(config/tenants.py) 작업을 학교마다 차례로 실행한다. 락도 학교마다
+따로 잡으므로 한 학교의 작업이 길어져도 다른 worker 가 다른 학교 작업을 할 수 있다.
+
+cron 식과 다음 실행 시각은 서버 로컬 시간이 아니라 WORKER_TZ(기본 Asia/Seoul) 기준이다.
+"""
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+from zoneinfo import ZoneInfo
+
+from psycopg import InterfaceError, OperationalError
+
+from config.tenants import get_default_tenant, get_tenants, tenant_scope
+from database.db_manager import _create_db_connection
+from utils import tracing
+
+logger = logging.getLogger(__name__)
+
+LOCK_NAMESPACE = "phone2026.worker."
+WORKER_TZ = ZoneInfo(os.getenv("WORKER_TZ", "Asia/Seoul"))
+
+
+def _now() -> datetime:
+    return datetime.now(WORKER_TZ)
+
+
+class CronSchedule:
+    """'분 시 일 월 요일' 5필드 cron 식 (*, 숫자, a-b, a,b, */n 지원. 요일 0=일요일, 일·요일은 AND 조건)"""
+
+    _RANGES = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 6))
+
+    def __init__(self, expression: str):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"cron expression needs 5 fields: {expression!r}")
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, self.weekdays = (
+            self._parse(text, lo, hi) for text, (lo, hi) in zip(fields, self._RANGES)
+        )
+
+    @staticmethod
+    def _parse(text: str, lo: int, hi: int) -> set:
+        values = set()
+        for part in text.split(","):
+            step = 1
+            if "/" in part:
+                part, step_text = part.split("/", 1)
+                step = int(step_text)
+            if part == "*":
+                start, end = lo, hi
+            elif "-" in part:
+                start, end = (int(v) for v in part.split("-", 1))
+            else:
+                start = end = int(part)
+            if start < lo or end > hi or start > end or step < 1:
+                raise ValueError(f"cron field out of range: {text!r}")
+            values.update(range(start, end + 1, step))
+        return values
+
+    def matches(self, moment: datetime) -> bool:
+        return (
+            moment.minute in self.minutes
+            and moment.hour in self.hours
+            and moment.day in self.days
+            and moment.month in self.months
+            and (moment.weekday() + 1) % 7 in self.weekdays
+        )
+
+    def next_after(self, moment: datetime) -> datetime:
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        # 1년 안에 한 번도 맞지 않으면 잘못된 식으로 본다.
+        for _ in range(366 * 24 * 60):
+            if self.matches(candidate):
+                return candidate
+            candidate += timedelta(minutes=1)
+        raise ValueError(f"cron expression never fires: {self.expression!r}")
+
+
+@dataclass
+class Job:
+    name: str
+    func: Callable[[], object]
+    interval_seconds: Optional[float] = None
+    cron: Optional[CronSchedule] = None
+    run_at_start: bool = False
+    next_run: Optional[datetime] = field(default=None, compare=False)
+
+    def __post_init__(self):
+        if (self.interval_seconds is None) == (self.cron is None):
+            raise ValueError(f"job {self.name!r} needs exactly one of interval_seconds / cron")
+
+    def schedule_next(self, now: datetime):
+        if self.cron is not None:
+            self.next_run = self.cron.next_after(now)
+        else:
+            self.next_run = now + timedelta(seconds=self.interval_seconds)
+
+    def describe(self) -> str:
+        return f"cron '{self.cron.expression}'" if self.cron else f"every {self.interval_seconds:g}s"
+
+
+def interval_job(name: str, seconds: float, func, run_at_start: bool = True) -> Job:
+    return Job(name=name, func=func, interval_seconds=seconds, run_at_start=run_at_start)
+
+
+def cron_job(name: str, expression: str, func) -> Job:
+    return Job(name=name, func=func, cron=CronSchedule(expression))
+
+
+class Scheduler:
+    def __init__(self, jobs: list, stop_event: threading.Event = None):
+        self.jobs = jobs
+        self.stop_event = stop_event or threading.Event()
+        self._lock_conn = None
+
+    def stop(self):
+        self.stop_event.set()
+
+    def _lock_connection(self):
+        if self._lock_conn is None or self._lock_conn.closed:
+            self._lock_conn = _create_db_connection()
+        return self._lock_conn
+
+    @staticmethod
+    def _lock_key(job: Job, tenant) -> str:
+        # 기본 학교는 예전 키를 그대로 써서 배포 중에 이전 worker 와 겹치지 않게 한다.
+        if tenant.slug == get_default_tenant().slug:
+            return LOCK_NAMESPACE + job.name
+        return f"{LOCK_NAMESPACE}{tenant.slug}.{job.name}"
+
+    @contextmanager
+    def _job_lock(self, lock_key: str):
+        """락을 잡았으면 True 를 넘기고, 블록이 끝날 때 COMMIT 으로 푼다."""
+        for attempt in range(2):
+            conn = self._lock_connection()
+            try:
+                conn.execute("BEGIN")
+                row = conn.execute(
+                    "SELECT pg_try_advisory_xact_lock(hashtext(%s)) AS locked", (lock_key,)
+                ).fetchone()
+                break
+            except Exception as e:
+                # 트랜잭션이 열린 채 실패했을 수 있으니 커넥션을 버린다. 끊긴 커넥션이면 한 번 다시 연결한다.
+                self._close_lock_connection()
+                if attempt or not isinstance(e, (OperationalError, InterfaceError)):
+                    raise
+        try:
+            yield bool(row["locked"])
+        finally:
+            try:
+                conn.execute("COMMIT")
+            except (OperationalError, InterfaceError):
+                # 커넥션이 끊겼으면 트랜잭션과 함께 락도 이미 풀렸다.
+                self._close_lock_connection()
+
+    def _close_lock_connection(self):
+        try:
+            if self._lock_conn is not None:
+                self._lock_conn.close()
+        except Exception:
+            pass
+        self._lock_conn = None
+
+    def run_job(self, job: Job) -> bool:
+        """학교마다 락을 잡았으면 실행한다. 한 학교라도 실행했으면 True"""
+        ran = False
+        for tenant in get_tenants():
+            with tenant_scope(tenant):
+                ran = self._run_for_tenant(job, tenant) or ran
+        return ran
+
+    def _run_for_tenant(self, job: Job, tenant) -> bool:
+        label = job.name if len(get_tenants()) == 1 else f"{tenant.slug}.{job.name}"
+        lock_key = self._lock_key(job, tenant)
+        try:
+            with self._job_lock(lock_key) as locked:
+                if not locked:
+                    logger.info("[worker] %s skipped: running on another worker", label)
+                    return False
+                self._run_locked(job, tenant, label)
+        except Exception:
+            logger.exception("[worker] %s: could not take advisory lock", label)
+            return False
+        return True
+
+    @staticmethod
+    def _run_locked(job: Job, tenant, label: str):
+        started = time.perf_counter()
+        try:
+            with tracing.span(f"worker.{job.name}", tenant=tenant.slug):
+                result = job.func()
+            logger.info("[worker] %s done in %.0fms: %s", label, (time.perf_counter() - started) * 1000, result)
+        except Exception:
+            logger.exception("[worker] %s failed", label)
+
+    def run_forever(self):
+        now = _now()
+        for job in self.jobs:
+            if job.run_at_start:
+                job.next_run = now
+            else:
+                job.schedule_next(now)
+            logger.info("[worker] registered %s (%s), next run %s", job.name, job.describe(), job.next_run)
+
+        try:
+            while not self.stop_event.is_set():
+                now = _now()
+                for job in self.jobs:
+                    if self.stop_event.is_set():
+                        break
+                    if job.next_run <= now:
+                        self.run_job(job)
+                        job.schedule_next(_now())
+                next_due = min(job.next_run for job in self.jobs)
+                self.stop_event.wait(max(0.0, (next_due - _now()).total_seconds()))
+        finally:
+            self._close_lock_connection()
+            logger.info("[worker] stopped")
+
+    def run_once(self, names: list = None):
+        try:
+            for job in self.jobs:
+                if names and job.name not in names:
+                    continue
+                self.run_job(job)
+        finally:
+            self._close_lock_connection()